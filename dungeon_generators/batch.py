@@ -0,0 +1,230 @@
+"""
+Batch Generation
+----------------
+
+Tento modul generuje najednou celou dávku mnoha (typicky malých) map jako jedno
+pole numpy tvaru (N, H, W). U malých map převažuje režie Pythonu na každou buňku
+nad samotným výpočtem, proto se sousedé celulárního automatu i hodnoty šumu
+počítají nad celým svazkem map jedinou operací s poli.
+
+Základní princip:
+1. Každá mapa dávky má vlastní seed a vlastní generátor náhodných čísel
+   (np.random.default_rng), takže je reprodukovatelná bez ohledu na to,
+   s jakými dalšími mapami byla vygenerována
+2. Z generátorů vytvoříme počáteční stav každé mapy (náhodné zdi, resp.
+   permutační tabulku gradientního šumu)
+3. Samotný výpočet (kroky automatu, oktávy šumu, normalizace, práh) probíhá
+   nad celým polem (N, H, W) najednou
+4. Výsledkem jsou ASCII kódy dlaždic ('#' a '.'), stejné jako v MemmapGrid
+
+Mapy z dávky nejsou shodné s mapami z generate_* se stejným seedem - ty používají
+modul random a knihovnu perlin-noise. Algoritmus a význam parametrů jsou ale stejné.
+"""
+
+import random
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+WALL = ord("#")
+FLOOR = ord(".")
+
+
+def batch_seeds(count: int, seeds: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Vrátí seedy jednotlivých map dávky.
+
+    Args:
+        count (int): Počet map v dávce
+        seeds (Optional[Sequence[int]]): Seedy zadané volajícím; bez nich se vylosují
+            z modulu random (dávka je tak reprodukovatelná přes random.seed)
+
+    Returns:
+        List[int]: Seznam count seedů
+    """
+    if seeds is None:
+        return [random.randrange(2 ** 32) for _ in range(count)]
+    if len(seeds) != count:
+        raise ValueError("Počet seedů musí odpovídat počtu map")
+    return list(seeds)
+
+
+def _to_tiles(walls: np.ndarray) -> np.ndarray:
+    """Nastaví okraje všech map na zeď a převede masku zdí na ASCII kódy dlaždic."""
+    walls[:, 0, :] = walls[:, -1, :] = True
+    walls[:, :, 0] = walls[:, :, -1] = True
+    return np.where(walls, WALL, FLOOR).astype(np.uint8)
+
+
+def batch_to_dungeon(tiles: np.ndarray) -> List[List[str]]:
+    """
+    Převede jednu mapu z dávky na běžnou mapu dungeonu.
+
+    Args:
+        tiles (np.ndarray): Pole tvaru (H, W) s ASCII kódy dlaždic, např. batch[i]
+
+    Returns:
+        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    """
+    return [list(row.tobytes().decode("ascii")) for row in tiles]
+
+
+def cellular_automata_step_batch(walls: np.ndarray, birth_limit: int = 4,
+                                 death_limit: int = 3) -> np.ndarray:
+    """
+    Provede jeden krok celulárního automatu nad celou dávkou map najednou.
+
+    Pravidla odpovídají cellular_automata_step - okolí mimo mapu se počítá jako zeď.
+
+    Args:
+        walls (np.ndarray): Booleovské pole tvaru (N, H, W), True = zeď
+        birth_limit (int): Počet sousedů potřebných pro vytvoření zdi
+        death_limit (int): Počet sousedů potřebných pro zachování zdi
+
+    Returns:
+        np.ndarray: Nový stav dávky
+    """
+    padded = np.pad(walls, ((0, 0), (1, 1), (1, 1)), constant_values=True).astype(np.uint8)
+    rows = padded[:, :, :-2] + padded[:, :, 1:-1] + padded[:, :, 2:]
+    neighbors = rows[:, :-2] + rows[:, 1:-1] + rows[:, 2:] - walls
+    return np.where(walls, neighbors >= death_limit, neighbors > birth_limit)
+
+
+def generate_cellular_automata_batch(count: int, width: int, height: int,
+                                     iterations: int = 5, wall_prob: float = 0.45,
+                                     seeds: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Vygeneruje dávku map celulárním automatem.
+
+    Args:
+        count (int): Počet map
+        width (int): Šířka mapy
+        height (int): Výška mapy
+        iterations (int): Počet iterací celulárního automatu
+        wall_prob (float): Počáteční pravděpodobnost zdi (0.0 až 1.0)
+        seeds (Optional[Sequence[int]]): Seed každé mapy (výchozí jsou náhodné)
+
+    Returns:
+        np.ndarray: Pole tvaru (count, height, width) s ASCII kódy dlaždic
+    """
+    walls = np.empty((count, height, width), dtype=bool)
+    for i, seed in enumerate(batch_seeds(count, seeds)):
+        walls[i] = np.random.default_rng(seed).random((height, width)) < wall_prob
+
+    for _ in range(iterations):
+        walls = cellular_automata_step_batch(walls)
+
+    return _to_tiles(walls)
+
+
+def _fade(t: np.ndarray) -> np.ndarray:
+    """Vyhlazovací křivka Perlinova šumu 6t^5 - 15t^4 + 10t^3."""
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def gradient_noise_batch(perm: np.ndarray, angles: np.ndarray,
+                         x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Spočítá 2D gradientní (Perlinův) šum pro všechny mapy dávky najednou.
+
+    Args:
+        perm (np.ndarray): Permutační tabulky tvaru (N, 512) - dvakrát zopakovaná
+            permutace čísel 0..255, aby se indexy nemusely ořezávat
+        angles (np.ndarray): Úhly gradientů tvaru (N, 256)
+        x (np.ndarray): Souřadnice x vzorků tvaru (H, W), společné pro celou dávku
+        y (np.ndarray): Souřadnice y vzorků tvaru (H, W)
+
+    Returns:
+        np.ndarray: Hodnoty šumu tvaru (N, H, W)
+    """
+    count = len(perm)
+    x0 = np.floor(x).astype(np.int64)
+    y0 = np.floor(y).astype(np.int64)
+    fx, fy = x - x0, y - y0
+    x0 &= 255
+    y0 &= 255
+    cos, sin = np.cos(angles), np.sin(angles)
+
+    def corner(dx: int, dy: int) -> np.ndarray:
+        # Hash rohu mřížky vybere gradient; skalární součin se vzdáleností od rohu
+        cell = (perm[:, x0 + dx] + (y0 + dy)).reshape(count, -1)
+        gradient = np.take_along_axis(perm, cell, axis=1)
+        gx = np.take_along_axis(cos, gradient, axis=1).reshape(count, *x.shape)
+        gy = np.take_along_axis(sin, gradient, axis=1).reshape(count, *x.shape)
+        return gx * (fx - dx) + gy * (fy - dy)
+
+    u, v = _fade(fx), _fade(fy)
+    top = corner(0, 0) + u * (corner(1, 0) - corner(0, 0))
+    bottom = corner(0, 1) + u * (corner(1, 1) - corner(0, 1))
+    return top + v * (bottom - top)
+
+
+def layered_noise_batch(count: int, width: int, height: int, scale: float = 15.0,
+                        octaves: int = 4, seeds: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Spočítá vrstvený gradientní šum pro dávku map, normalizovaný pro každou mapu zvlášť.
+
+    Stejně jako generate_perlin_dungeon sčítá oktávy s frekvencí i+1 a amplitudou 0.5^i.
+
+    Args:
+        count (int): Počet map
+        width (int): Šířka mapy
+        height (int): Výška mapy
+        scale (float): Měřítko šumu (vyšší hodnota = více přiblížený)
+        octaves (int): Počet oktáv šumu (více = více detailů)
+        seeds (Optional[Sequence[int]]): Seed každé mapy (výchozí jsou náhodné)
+
+    Returns:
+        np.ndarray: Hodnoty šumu v rozsahu 0.0 až 1.0, tvar (count, height, width)
+    """
+    perm = np.empty((count, 512), dtype=np.int64)
+    angles = np.empty((count, 256))
+    for i, seed in enumerate(batch_seeds(count, seeds)):
+        rng = np.random.default_rng(seed)
+        perm[i, :256] = rng.permutation(256)
+        angles[i] = rng.random(256) * 2 * np.pi
+    perm[:, 256:] = perm[:, :256]
+
+    y, x = np.mgrid[0:height, 0:width] / scale
+    values = np.zeros((count, height, width))
+    for i in range(octaves):
+        values += gradient_noise_batch(perm, angles, x * (i + 1), y * (i + 1)) * 0.5 ** i
+
+    # Normalizace každé mapy zvlášť
+    min_val = values.min(axis=(1, 2), keepdims=True)
+    value_range = values.max(axis=(1, 2), keepdims=True) - min_val
+    value_range[value_range == 0] = 1.0
+    return (values - min_val) / value_range
+
+
+def generate_perlin_batch(count: int, width: int, height: int, scale: float = 15.0,
+                          octaves: int = 4, threshold: float = 0.5,
+                          seeds: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Vygeneruje dávku map z vrstveného gradientního šumu.
+
+    Podlaha leží tam, kde normalizovaná hodnota šumu překročí práh.
+
+    Args:
+        count (int): Počet map
+        width (int): Šířka mapy
+        height (int): Výška mapy
+        scale (float): Měřítko šumu (vyšší hodnota = více přiblížený)
+        octaves (int): Počet oktáv šumu (více = více detailů)
+        threshold (float): Hodnota, nad kterou jsou dlaždice podlahou (0.0 až 1.0)
+        seeds (Optional[Sequence[int]]): Seed každé mapy (výchozí jsou náhodné)
+
+    Returns:
+        np.ndarray: Pole tvaru (count, height, width) s ASCII kódy dlaždic
+    """
+    values = layered_noise_batch(count, width, height, scale, octaves, seeds)
+    return _to_tiles(values <= threshold)
+
+
+if __name__ == "__main__":
+    # Jednoduché testování - několik malých map vedle sebe
+    for generate in (generate_cellular_automata_batch, generate_perlin_batch):
+        batch = generate(4, 20, 12, seeds=[1, 2, 3, 4])
+        for y in range(batch.shape[1]):
+            print("  ".join(tiles[y].tobytes().decode("ascii") for tiles in batch))
+        print()
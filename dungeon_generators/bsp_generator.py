@@ -17,7 +17,7 @@ které jsou vždy plně propojené.
 """
 
 import random
-from typing import List, Tuple, Optional, Union
+from typing import Iterator, List, Tuple, Optional, Union
 
 
 class BSPNode:
@@ -135,21 +135,29 @@ class BSPNode:
             self.corridors.append((r1x, r2y, r2x, r2y))  # Horizontální část
 
 
-def generate_bsp_dungeon(width: int, height: int, max_depth: int = 5) -> List[List[str]]:
+# Změna mapy v jednom kroku: seznam obdélníků (x, y, šířka, výška, dlaždice)
+Delta = List[Tuple[int, int, int, int, str]]
+
+
+def iter_bsp_steps(dungeon: List[List[str]], width: int, height: int, max_depth: int = 5,
+                   leaves: Optional[List[Tuple[int, int, int, int]]] = None, *,
+                   routed: bool = False) -> Iterator[Delta]:
     """
-    Generuje dungeon pomocí algoritmu Binary Space Partitioning.
+    Generuje BSP dungeon krok po kroku nad mapou plnou zdí.
     
     Args:
+        dungeon (List[List[str]]): Mapa plná zdí, která se upravuje na místě
         width (int): Šířka dungeonu
         height (int): Výška dungeonu
         max_depth (int, optional): Maximální hloubka BSP stromu. Výchozí hodnota je 5.
+        leaves (optional): Seznam, do kterého se uloží oblasti listových uzlů
+            (x, y, šířka, výška) - např. pro další zpracování jednotlivých částí mapy
+        routed (bool, optional): Hledat chodby algoritmem A* (modul corridors), které
+            obcházejí ostatní místnosti, místo rovných chodeb tvaru L
     
-    Returns:
-        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    Yields:
+        Delta: Prázdná změna po každé úrovni dělení, poté každá místnost a každá chodba
     """
-    # Inicializace dungeonu se zdmi
-    dungeon = [["#" for _ in range(width)] for _ in range(height)]
-    
     # Vytvoření kořenového uzlu BSP
     root = BSPNode(0, 0, width, height)
     
@@ -166,6 +174,7 @@ def generate_bsp_dungeon(width: int, height: int, max_depth: int = 5) -> List[Li
         
         nodes_to_split = next_nodes
         depth += 1
+        yield []  # Dělení prostoru mapu nemění, jen posouvá animaci
     
     # Vytvoření místností v listových uzlech
     root.create_rooms()
@@ -184,16 +193,21 @@ def generate_bsp_dungeon(width: int, height: int, max_depth: int = 5) -> List[Li
             get_leaf_nodes(node.right)
     
     get_leaf_nodes(root)
+    if leaves is not None:
+        leaves.extend((node.x, node.y, node.width, node.height) for node in leaf_nodes)
     
     # Vyřezání místností do dungeonu
     for node in leaf_nodes:
         if node.room:
             rx, ry, rw, rh = node.room
+            x_start, x_end = max(0, rx), min(width, rx + rw)  # Kontrola hranic
             for y in range(ry, ry + rh):
-                if 0 <= y < height:  # Kontrola hranic
-                    for x in range(rx, rx + rw):
-                        if 0 <= x < width:  # Kontrola hranic
-                            dungeon[y][x] = "."
+                if 0 <= y < height and x_start < x_end:  # Kontrola hranic
+                    # Celý řádek místnosti najednou (rychlé i pro mřížky mimo RAM)
+                    dungeon[y][x_start:x_end] = ["."] * (x_end - x_start)
+            y_start, y_end = max(0, ry), min(height, ry + rh)
+            if x_start < x_end and y_start < y_end:
+                yield [(x_start, y_start, x_end - x_start, y_end - y_start, ".")]
     
     # Vyřezání chodeb do dungeonu
     def get_all_corridors(node: Optional[BSPNode]) -> List[Tuple[int, int, int, int]]:
@@ -229,6 +243,16 @@ def generate_bsp_dungeon(width: int, height: int, max_depth: int = 5) -> List[Li
             all_corridors.append((r1x, r1y, r1x, r2y))  # Vertikální část
             all_corridors.append((r1x, r2y, r2x, r2y))  # Horizontální část
     
+    if routed:
+        # Každé propojení tvoří dvojice úseků L; router spojí jejich krajní body
+        from dungeon_generators.corridors import iter_route_rooms
+        
+        rooms = [node.room for node in leaf_nodes if node.room]
+        pairs = [((first[0], first[1]), (second[2], second[3]))
+                 for first, second in zip(all_corridors[::2], all_corridors[1::2])]
+        yield from iter_route_rooms(dungeon, pairs, rooms)
+        return
+    
     # Vykreslení všech chodeb
     for corridor in all_corridors:
         x1, y1, x2, y2 = corridor
@@ -248,12 +272,42 @@ def generate_bsp_dungeon(width: int, height: int, max_depth: int = 5) -> List[Li
                 for w in range(-corridor_width, corridor_width + 1):
                     if 0 <= y < height and 0 <= x1 + w < width:
                         dungeon[y][x1 + w] = "."
+            x_start = max(0, x1 - corridor_width)
+            x_end = min(width, x1 + corridor_width + 1)
+            yield [(x_start, min(y1, y2), x_end - x_start, abs(y2 - y1) + 1, ".")]
         # Vykreslení vertikální chodby
         elif y1 == y2:
             for x in range(min(x1, x2), max(x1, x2) + 1):
                 for w in range(-corridor_width, corridor_width + 1):
                     if 0 <= y1 + w < height and 0 <= x < width:
                         dungeon[y1 + w][x] = "."
+            y_start = max(0, y1 - corridor_width)
+            y_end = min(height, y1 + corridor_width + 1)
+            yield [(min(x1, x2), y_start, abs(x2 - x1) + 1, y_end - y_start, ".")]
+
+
+def generate_bsp_dungeon(width: int, height: int, max_depth: int = 5,
+                         grid: Optional[List[List[str]]] = None, *,
+                         routed: bool = False) -> List[List[str]]:
+    """
+    Generuje dungeon pomocí algoritmu Binary Space Partitioning.
+    
+    Args:
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        max_depth (int, optional): Maximální hloubka BSP stromu. Výchozí hodnota je 5.
+        grid (optional): Předalokovaná mřížka plná zdí, do které se generuje
+            (např. MemmapGrid nebo SparseGrid). Výchozí je nový seznam seznamů v paměti.
+        routed (bool, optional): Hledat chodby algoritmem A* místo rovných chodeb tvaru L
+    
+    Returns:
+        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    """
+    # Inicializace dungeonu se zdmi (pokud ji nedodal volající)
+    dungeon = grid if grid is not None else [["#" for _ in range(width)] for _ in range(height)]
+    
+    for _ in iter_bsp_steps(dungeon, width, height, max_depth, routed=routed):
+        pass
     
     return dungeon
 
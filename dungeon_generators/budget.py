@@ -0,0 +1,210 @@
+"""
+Generation Budget
+-----------------
+
+Tento modul omezuje dobu běhu generátorů. Některé kombinace parametrů (např.
+floor_ratio blízko 1.0 u Drunkard's Walk, obrovský počet pokusů o místnost u WFC
+nebo velká dig_length) běží velmi dlouho nebo vůbec neskončí.
+
+Základní princip:
+1. Každý generátor v registru má krokovou funkci iter_*_steps, která upravuje
+   mapu na místě - po každém kroku je mapa platný rozpracovaný dungeon
+2. Rozpočet (Budget) se kontroluje mezi kroky: časový limit, maximální počet
+   kroků a příznak zrušení
+3. Po vyčerpání rozpočtu generování skončí a vrátí dosavadní mapu spolu
+   s příznakem, zda generátor doběhl
+4. Zrušení je kooperativní: příznak je libovolný objekt s metodou is_set()
+   (threading.Event ve vlákně, multiprocessing.Manager().Event() v procesu
+   na pozadí), generátor ho sám zkontroluje mezi kroky (nejvýše jednou za 10 ms)
+
+Rozpočet se kontroluje jen mezi kroky, takže generování může limit překročit
+nejvýše o jeden krok. Generátory, jejichž krok by jinak byl celý průchod mřížkou
+(celulární automat, vzorkování Perlinova šumu), proto dělí práci na pásy řádků
+s omezeným počtem buněk.
+
+Časový limit se počítá od zahájení generování (Budget.start). Pro pevný termín
+společný více procesům lze zadat absolutní čas deadline (time.time()).
+"""
+
+import os
+import random
+import sys
+import time
+from typing import Any, Iterator, List, Optional, Sequence
+
+if __name__ == "__main__" and not __package__:
+    # Spuštění jako skript (python dungeon_generators/budget.py) - balíček
+    # dungeon_generators leží o adresář výš, než je tento soubor
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dungeon_generators import registry
+
+# Důvody předčasného ukončení
+REASON_TIME = "time"
+REASON_STEPS = "steps"
+REASON_CANCELLED = "cancelled"
+
+# Nejkratší doba mezi dvěma kontrolami příznaku zrušení v sekundách (příznak
+# z multiprocessing.Manager je dotaz do jiného procesu, takže ho nečteme v každém kroku)
+CANCEL_CHECK_INTERVAL = 0.01
+
+
+class Budget:
+    """
+    Rozpočet generování - časový limit, limit kroků a kooperativní zrušení.
+    """
+
+    def __init__(self, time_limit: Optional[float] = None, max_steps: Optional[int] = None,
+                 cancel: Optional[Any] = None, deadline: Optional[float] = None):
+        """
+        Inicializace rozpočtu.
+
+        Args:
+            time_limit (Optional[float]): Maximální doba generování v sekundách
+            max_steps (Optional[int]): Maximální počet kroků generátoru
+            cancel (optional): Příznak zrušení s metodou is_set()
+            deadline (Optional[float]): Absolutní termín (time.time()), platí spolu
+                s časovým limitem ten dřívější
+        """
+        self.time_limit = time_limit
+        self.max_steps = max_steps
+        self.cancel = cancel
+        self.deadline = deadline
+        self.steps = 0
+        self.reason: Optional[str] = None
+        self._started = 0.0
+        self._stop_at = deadline
+        self._next_cancel_check = 0.0
+
+    def start(self) -> "Budget":
+        """Zahájí měření (vynuluje kroky a spočítá termín z časového limitu)."""
+        self.steps = 0
+        self.reason = None
+        self._started = time.time()
+        self._next_cancel_check = self._started
+        self._stop_at = self.deadline
+        if self.time_limit is not None:
+            limit = self._started + self.time_limit
+            self._stop_at = limit if self._stop_at is None else min(self._stop_at, limit)
+        return self
+
+    @property
+    def elapsed(self) -> float:
+        """Doba od zahájení v sekundách."""
+        return time.time() - self._started
+
+    def spend(self, steps: int = 1) -> bool:
+        """
+        Započítá provedené kroky a zjistí, zda lze pokračovat.
+
+        Args:
+            steps (int): Počet právě provedených kroků
+
+        Returns:
+            bool: True, pokud rozpočet ještě nebyl vyčerpán (jinak je nastaven reason)
+        """
+        self.steps += steps
+        now = time.time()
+        if self.cancel is not None and now >= self._next_cancel_check:
+            self._next_cancel_check = now + CANCEL_CHECK_INTERVAL
+            if self.cancel.is_set():
+                self.reason = REASON_CANCELLED
+                return False
+        if self.max_steps is not None and self.steps >= self.max_steps:
+            self.reason = REASON_STEPS
+        elif self._stop_at is not None and now >= self._stop_at:
+            self.reason = REASON_TIME
+        return self.reason is None
+
+
+class BudgetResult(registry.GenerationResult):
+    """
+    Výsledek generování s rozpočtem: kromě mapy, vstupů, času a metrik
+    (registry.GenerationResult) nese příznak dokončení, počet kroků a důvod přerušení.
+    """
+
+    def __init__(self, dungeon: List[List[str]], entry: registry.GeneratorEntry,
+                 params: Sequence[Any], seed: Optional[int], elapsed: float,
+                 completed: bool, steps: int, reason: Optional[str]):
+        super().__init__(dungeon, entry, params, seed, elapsed)
+        self.completed = completed
+        self.steps = steps
+        self.reason = reason
+
+
+def run_steps(steps: Iterator[Any], budget: Budget) -> bool:
+    """
+    Spouští krokový generátor, dokud neskončí nebo nevyčerpá rozpočet.
+
+    Args:
+        steps (Iterator): Kroky generátoru (iter_*_steps)
+        budget (Budget): Zahájený rozpočet
+
+    Returns:
+        bool: True, pokud generátor doběhl
+    """
+    try:
+        for _ in steps:
+            if not budget.spend():
+                return False
+    finally:
+        close = getattr(steps, "close", None)
+        if close is not None:
+            close()
+    return True
+
+
+def generate_within_budget(choice: str, width: int, height: int, params: Sequence[Any] = (),
+                           seed: Optional[int] = None, budget: Optional[Budget] = None,
+                           grid: Optional[List[List[str]]] = None) -> BudgetResult:
+    """
+    Vygeneruje dungeon algoritmem z registru v mezích rozpočtu.
+
+    Pokud generátor doběhne, je výsledek stejný jako u registry.generate se stejným
+    seedem; jinak je to mapa rozpracovaná do posledního dokončeného kroku.
+
+    Args:
+        choice (str): Číslo volby v menu nebo klíč algoritmu
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        params (Sequence[Any]): Parametry generátoru
+        seed (Optional[int]): Seed generátoru náhodných čísel
+        budget (Optional[Budget]): Rozpočet (výchozí je neomezený)
+        grid (optional): Předalokovaná mřížka plná zdí (jinak nový seznam seznamů)
+
+    Returns:
+        BudgetResult: Mapa, vstupy, čas, metriky, příznak dokončení, počet kroků
+            a důvod přerušení
+    """
+    entry = registry.get_generator(choice)
+    if entry is None:
+        raise ValueError("Neplatná volba algoritmu")
+    budget = (budget or Budget()).start()
+    if seed is not None:
+        random.seed(seed)
+
+    dungeon = grid if grid is not None else [["#" for _ in range(width)] for _ in range(height)]
+    completed = run_steps(entry.load_steps()(dungeon, width, height, **entry.keywords(params)), budget)
+    return BudgetResult(dungeon, entry, params, seed, budget.elapsed,
+                        completed, budget.steps, budget.reason)
+
+
+if __name__ == "__main__":
+    # Jednoduché testování - nekonečný Drunkard's Walk zrušený z jiného procesu
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import Manager
+
+    result = generate_within_budget("drunkard", 60, 20, [1.0], seed=1, budget=Budget(time_limit=0.5))
+    print(f"Časový limit: dokončeno={result.completed}, kroků={result.steps}, důvod={result.reason}")
+    print(f"Metriky: {result.metrics}")
+
+    with Manager() as manager, ProcessPoolExecutor(max_workers=1) as pool:
+        cancel = manager.Event()
+        future = pool.submit(generate_within_budget, "drunkard", 60, 20, [1.0], 1,
+                             Budget(time_limit=30, cancel=cancel))
+        time.sleep(1.0)
+        cancel.set()
+        result = future.result()
+    print(f"Zrušení: dokončeno={result.completed}, kroků={result.steps}, důvod={result.reason}")
+    for row in result.dungeon:
+        print("".join(row))
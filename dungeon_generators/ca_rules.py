@@ -0,0 +1,267 @@
+"""
+Cellular Automata Rules
+-----------------------
+
+Tento modul překládá pravidla celulárních automatů s libovolným počtem stavů
+(zeď, podlaha, voda, láva, suť, ...) do vyhledávací tabulky. Jeden krok automatu
+je pak jediný výběr z tabulky nad celou mřížkou, takže libovolné pravidlo běží
+stejně rychle jako pevně zadané pravidlo se dvěma stavy.
+
+Základní princip:
+1. Mřížku převedeme na pole indexů stavů (0 .. počet stavů - 1)
+2. Každému stavu s < S-1 přiřadíme váhu 9^s (poslední stav má váhu 0); součet vah
+   8 sousedů pak jednoznačně kóduje počty sousedů v jednotlivých stavech (počet
+   je nejvýše 8, takže se číslice v soustavě o základu 9 nikdy nepřelijí)
+3. Pravidlo předem vyhodnotíme pro všechny kombinace (aktuální stav, počty sousedů)
+   a výsledky uložíme do tabulky indexované aktuální_stav * 9^(S-1) + kód_sousedů
+4. Krok automatu = jeden součet vah sousedů a jeden výběr z tabulky
+
+Zápis pravidel:
+- B/S notace pro dvojici stavů, např. "B678/S345678": mrtvá buňka ožije při 6-8
+  živých sousedech, živá přežije při 3-8; živý je první stav, mrtvý druhý,
+  ostatní stavy se nemění a nepočítají se jako živé
+- tabulka přechodů pro každý stav, např.
+      {"states": ["#", ".", "~"], "edge": "#",
+       "rules": {".": [{"if": "~", "count": [3, 4, 5, 6, 7, 8], "to": "~"}],
+                 "~": [{"if": "~", "count": [0, 1, 2], "to": "."}]}}
+  první splněný přechod vyhrává, jinak buňka zůstává ve svém stavu
+
+Pravidlo "B5678/S345678" se stavy ("#", ".") odpovídá cellular_automata_step
+s výchozími hodnotami birth_limit=4 a death_limit=3.
+"""
+
+import itertools
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Nejvyšší podporovaný počet stavů (velikost tabulky je S * 9^(S-1))
+MAX_STATES = 6
+
+RuleSpec = Union[str, Dict[str, Any]]
+
+
+def parse_bs(rule: str) -> Tuple[frozenset, frozenset]:
+    """
+    Rozloží pravidlo v B/S notaci.
+
+    Args:
+        rule (str): Pravidlo, např. "B678/S345678"
+
+    Returns:
+        Tuple[frozenset, frozenset]: Počty sousedů pro zrození a pro přežití
+    """
+    match = re.fullmatch(r"\s*B([0-8]*)\s*/\s*S([0-8]*)\s*", rule, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Neplatné pravidlo v B/S notaci: {rule}")
+    return frozenset(map(int, match.group(1))), frozenset(map(int, match.group(2)))
+
+
+class CompiledRule:
+    """
+    Pravidlo celulárního automatu přeložené do vyhledávací tabulky.
+    """
+
+    def __init__(self, states: Sequence[str], transition: Callable[[int, Tuple[int, ...]], int],
+                 edge: Optional[str] = None):
+        """
+        Přeloží pravidlo do tabulky.
+
+        Args:
+            states (Sequence[str]): Znaky stavů
+            transition (Callable): Funkce (aktuální stav, počty sousedů ve stavech) -> nový stav
+            edge (Optional[str]): Stav buněk mimo mapu (výchozí je první stav)
+        """
+        if not 2 <= len(states) <= MAX_STATES:
+            raise ValueError(f"Počet stavů musí být 2 až {MAX_STATES}")
+        if len(set(states)) != len(states):
+            raise ValueError("Stavy se nesmí opakovat")
+
+        self.states = list(states)
+        self.edge = self.states.index(edge) if edge is not None else 0
+        count = len(self.states)
+        self.radix = 9 ** (count - 1)
+
+        # Nejmenší typ, do kterého se vejde index tabulky (u 2 a 3 stavů jediný bajt)
+        size = count * self.radix
+        self._dtype = np.uint8 if size <= 2 ** 8 else np.uint16 if size <= 2 ** 16 else np.int32
+        self.weights = np.array([9 ** s for s in range(count - 1)] + [0], dtype=self._dtype)
+        self._offsets = (np.arange(count) * self.radix).astype(self._dtype)
+
+        self.table = np.zeros(size, dtype=np.uint8)
+        for counts in itertools.product(range(9), repeat=count - 1):
+            rest = 8 - sum(counts)
+            if rest < 0:
+                continue
+            code = sum(c * 9 ** s for s, c in enumerate(counts))
+            for state in range(count):
+                self.table[state * self.radix + code] = transition(state, counts + (rest,))
+
+    def step(self, grid: np.ndarray) -> np.ndarray:
+        """
+        Provede jeden krok automatu.
+
+        Args:
+            grid (np.ndarray): Pole indexů stavů tvaru (..., výška, šířka); funguje
+                i pro celé dávky map tvaru (N, výška, šířka)
+
+        Returns:
+            np.ndarray: Nový stav mřížky
+        """
+        center = self.weights[grid]
+        pad = [(0, 0)] * (grid.ndim - 2) + [(1, 1), (1, 1)]
+        weighted = np.pad(center, pad, constant_values=self.weights[self.edge])
+
+        # Součet vah 8 sousedů = kód počtů sousedů ve všech stavech
+        rows = weighted[..., :-2] + weighted[..., 1:-1]
+        rows += weighted[..., 2:]
+        code = rows[..., :-2, :] + rows[..., 1:-1, :]
+        code += rows[..., 2:, :]
+        code -= center
+        code += self._offsets[grid]
+        return self.table[code]
+
+    def run(self, grid: np.ndarray, iterations: int = 1) -> np.ndarray:
+        """Provede zadaný počet kroků automatu."""
+        for _ in range(iterations):
+            grid = self.step(grid)
+        return grid
+
+    def encode(self, dungeon: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Převede mapu dungeonu na pole indexů stavů.
+
+        Args:
+            dungeon (Sequence[Sequence[str]]): Mapa dungeonu (všechny znaky musí být stavy)
+
+        Returns:
+            np.ndarray: Pole uint8 tvaru (výška, šířka)
+        """
+        lookup = np.full(256, 255, dtype=np.uint8)
+        for index, tile in enumerate(self.states):
+            lookup[ord(tile)] = index
+        height = len(dungeon)
+        cells = "".join("".join(row) for row in dungeon).encode("latin-1")
+        grid = lookup[np.frombuffer(cells, dtype=np.uint8)].reshape(height, -1)
+        if (grid == 255).any():
+            raise ValueError("Mapa obsahuje znak, který není stavem pravidla")
+        return grid
+
+    def decode(self, grid: np.ndarray) -> List[List[str]]:
+        """Převede pole indexů stavů zpět na mapu dungeonu."""
+        tiles = np.array([ord(tile) for tile in self.states], dtype=np.uint8)[grid]
+        return [list(row.tobytes().decode("latin-1")) for row in tiles]
+
+
+def _bs_transition(birth: frozenset, survive: frozenset) -> Callable[[int, Tuple[int, ...]], int]:
+    """Přechodová funkce pravidla B/S (živý stav 0, mrtvý stav 1)."""
+    def transition(state: int, counts: Tuple[int, ...]) -> int:
+        if state == 0:
+            return 0 if counts[0] in survive else 1
+        if state == 1:
+            return 0 if counts[0] in birth else 1
+        return state
+    return transition
+
+
+def _table_transition(states: List[str],
+                      rules: Dict[str, List[Dict[str, Any]]]) -> Callable[[int, Tuple[int, ...]], int]:
+    """Přechodová funkce zadaná tabulkou přechodů pro jednotlivé stavy."""
+    compiled: Dict[int, List[Tuple[int, frozenset, int]]] = {}
+    for tile, transitions in rules.items():
+        if tile not in states:
+            raise ValueError(f"Neznámý stav v pravidlech: {tile}")
+        compiled[states.index(tile)] = [
+            (states.index(t["if"]), frozenset(t["count"]), states.index(t["to"]))
+            for t in transitions]
+
+    def transition(state: int, counts: Tuple[int, ...]) -> int:
+        for neighbor, allowed, target in compiled.get(state, []):
+            if counts[neighbor] in allowed:
+                return target
+        return state
+    return transition
+
+
+def compile_rule(spec: RuleSpec, states: Sequence[str] = ("#", "."),
+                 edge: Optional[str] = None) -> CompiledRule:
+    """
+    Přeloží pravidlo v B/S notaci nebo ve formě tabulky přechodů.
+
+    Args:
+        spec: Pravidlo "B.../S..." nebo slovník {"states", "edge", "rules"}
+        states (Sequence[str]): Stavy pro B/S notaci (první je živý, druhý mrtvý)
+        edge (Optional[str]): Stav buněk mimo mapu (výchozí je první stav)
+
+    Returns:
+        CompiledRule: Přeložené pravidlo
+    """
+    if isinstance(spec, str):
+        return CompiledRule(states, _bs_transition(*parse_bs(spec)), edge)
+    states = list(spec["states"])
+    try:
+        transition = _table_transition(states, spec.get("rules", {}))
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Neplatná tabulka přechodů: {e}") from e
+    return CompiledRule(states, transition, spec.get("edge", edge))
+
+
+def scatter(grid: np.ndarray, state: int, over: int, probability: float,
+            rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Náhodně přepne buňky jednoho stavu na jiný - počáteční šum pro další vrstvu.
+
+    Args:
+        grid (np.ndarray): Pole indexů stavů
+        state (int): Nový stav
+        over (int): Stav, který se smí přepsat
+        probability (float): Pravděpodobnost přepnutí každé buňky
+        rng (Optional[np.random.Generator]): Generátor náhodných čísel
+
+    Returns:
+        np.ndarray: Nová mřížka
+    """
+    rng = rng or np.random.default_rng()
+    chosen = (grid == over) & (rng.random(grid.shape) < probability)
+    return np.where(chosen, state, grid).astype(grid.dtype)
+
+
+def apply_rule(dungeon: Sequence[Sequence[str]], spec: RuleSpec, iterations: int = 1,
+               states: Sequence[str] = ("#", "."), edge: Optional[str] = None) -> List[List[str]]:
+    """
+    Aplikuje pravidlo na hotovou mapu dungeonu.
+
+    Args:
+        dungeon (Sequence[Sequence[str]]): Mapa dungeonu
+        spec: Pravidlo v B/S notaci nebo tabulka přechodů
+        iterations (int): Počet kroků
+        states (Sequence[str]): Stavy pro B/S notaci
+        edge (Optional[str]): Stav buněk mimo mapu
+
+    Returns:
+        List[List[str]]: Nová mapa dungeonu
+    """
+    rule = compile_rule(spec, states, edge)
+    return rule.decode(rule.run(rule.encode(dungeon), iterations))
+
+
+if __name__ == "__main__":
+    # Jednoduché testování - jeskyně, do které přidáme jezírka vody a lávy
+    rng = np.random.default_rng()
+    cave = compile_rule("B5678/S345678")
+    grid = cave.run((rng.random((30, 60)) < 0.45).astype(np.uint8) ^ 1, 5)
+
+    liquids = compile_rule({
+        "states": ["#", ".", "~", "%"],
+        "edge": "#",
+        "rules": {
+            "~": [{"if": "~", "count": [0, 1, 2], "to": "."}],
+            "%": [{"if": "%", "count": [0, 1, 2], "to": "."}],
+            ".": [{"if": "~", "count": [4, 5, 6, 7, 8], "to": "~"},
+                  {"if": "%", "count": [4, 5, 6, 7, 8], "to": "%"}],
+        },
+    })
+    grid = scatter(scatter(grid, 2, 1, 0.35, rng), 3, 1, 0.2, rng)
+    for row in liquids.decode(liquids.run(grid, 4)):
+        print("".join(row))
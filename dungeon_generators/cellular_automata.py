@@ -16,7 +16,7 @@ Výhodou celulárních automatů je vytváření přirozeně vypadajících jesk
 """
 
 import random
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 
 def initialize_map(width: int, height: int, wall_prob: float = 0.45) -> List[List[str]]:
@@ -86,22 +86,113 @@ def cellular_automata_step(dungeon: List[List[str]], birth_limit: int = 4, death
     return new_map
 
 
-def generate_cellular_automata_dungeon(width: int, height: int, iterations: int = 5, wall_prob: float = 0.45) -> List[List[str]]:
+# Změna mapy v jednom kroku: seznam obdélníků (x, y, šířka, výška, dlaždice)
+Delta = List[Tuple[int, int, int, int, str]]
+
+# Nejvyšší počet buněk zpracovaných v jednom kroku krokové funkce - velké mapy
+# se inicializují a iterují po pásech řádků, aby krok trval krátce (rozpočet
+# generování se kontroluje jen mezi kroky)
+BAND_CELLS = 16384
+
+
+def band_rows(width: int) -> int:
+    """Vrátí počet řádků jednoho pásu pro mapu dané šířky (alespoň jeden)."""
+    return max(1, BAND_CELLS // max(1, width))
+
+
+def _next_rows(above: Optional[List[str]], rows: List[List[str]], below: Optional[List[str]],
+               birth_limit: int = 4, death_limit: int = 3) -> List[List[str]]:
     """
-    Vygeneruje dungeon pomocí celulárního automatu.
+    Spočítá nový stav pásu řádků (stejná pravidla jako cellular_automata_step).
+    
+    Args:
+        above (Optional[List[str]]): Původní řádek nad pásem (None = mimo mapu)
+        rows (List[List[str]]): Původní řádky pásu
+        below (Optional[List[str]]): Původní řádek pod pásem (None = mimo mapu)
+        birth_limit (int): Počet sousedů potřebných pro vytvoření zdi
+        death_limit (int): Počet sousedů potřebných pro zachování zdi
+    
+    Returns:
+        List[List[str]]: Nové řádky pásu
+    """
+    width = len(rows[0])
+    # Počty zdí v řádcích doplněných o zeď vlevo a vpravo (okraje jsou vždy stěny)
+    outside = [1] * (width + 2)
+    walls = [outside if above is None else [1] + [int(c == "#") for c in above] + [1]]
+    walls += [[1] + [int(c == "#") for c in row] + [1] for row in rows]
+    walls.append(outside if below is None else [1] + [int(c == "#") for c in below] + [1])
+    
+    new_rows = []
+    for i, row in enumerate(rows):
+        columns = [a + b + c for a, b, c in zip(walls[i], walls[i + 1], walls[i + 2])]
+        center = walls[i + 1]
+        new_row = []
+        for x in range(width):
+            neighbors = columns[x] + columns[x + 1] + columns[x + 2] - center[x + 1]
+            if center[x + 1]:
+                new_row.append("#" if neighbors >= death_limit else ".")
+            else:
+                new_row.append("#" if neighbors > birth_limit else ".")
+        new_rows.append(new_row)
+    return new_rows
+
+
+def _apply_changes(dungeon: List[List[str]], new_map: List[List[str]], top: int = 0) -> Delta:
+    """
+    Přepíše mapu na místě novým stavem a vrátí seznam změněných buněk.
+    
+    Args:
+        dungeon (List[List[str]]): Mapa dungeonu, která se upraví
+        new_map (List[List[str]]): Nový stav mapy (nebo pásu řádků)
+        top (int): Řádek mapy, kterému odpovídá první řádek new_map
+    
+    Returns:
+        Delta: Změněné buňky
+    """
+    delta = []
+    for y, new_row in enumerate(new_map, top):
+        row = dungeon[y]
+        if row == new_row:
+            continue
+        for x, (old, new) in enumerate(zip(row, new_row)):
+            if old != new:
+                row[x] = new
+                delta.append((x, y, 1, 1, new))
+    return delta
+
+
+def iter_cellular_automata_steps(dungeon: List[List[str]], width: int, height: int,
+                                 iterations: int = 5, wall_prob: float = 0.45) -> Iterator[Delta]:
+    """
+    Provádí celulární automat iteraci po iteraci nad mapou plnou zdí.
     
     Args:
+        dungeon (List[List[str]]): Mapa plná zdí, která se upravuje na místě
         width (int): Šířka dungeonu
         height (int): Výška dungeonu
         iterations (int): Počet iterací celulárního automatu
         wall_prob (float): Počáteční pravděpodobnost zdi (0.0 až 1.0)
     
-    Returns:
-        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    Yields:
+        Delta: Změny po každém pásu řádků (band_rows) počátečního náhodného rozložení
+            a každé iterace, nakonec uzavření okrajů; menší mapy tvoří jediný pás,
+            takže jeden krok odpovídá celé iteraci
     """
-    dungeon = initialize_map(width, height, wall_prob)
+    band = band_rows(width)
+    for top in range(0, height, band):
+        rows = min(band, height - top)
+        yield _apply_changes(dungeon, initialize_map(width, rows, wall_prob), top)
+    
     for _ in range(iterations):
-        dungeon = cellular_automata_step(dungeon)
+        # Řádky se přepisují po pásech - původní stav řádku nad pásem si schováme
+        above = None
+        for top in range(0, height, band):
+            bottom = min(height, top + band)
+            rows = [dungeon[y][:] for y in range(top, bottom)]
+            below = dungeon[bottom][:] if bottom < height else None
+            delta = _apply_changes(dungeon, _next_rows(above, rows, below), top)
+            above = rows[-1]
+            yield delta
     
     # Zajistíme, že okraje jsou zdi
     for i in range(width):
@@ -111,6 +202,27 @@ def generate_cellular_automata_dungeon(width: int, height: int, iterations: int
     for i in range(height):
         dungeon[i][0] = "#"
         dungeon[i][width-1] = "#"
+    
+    yield [(0, 0, width, 1, "#"), (0, height - 1, width, 1, "#"),
+           (0, 0, 1, height, "#"), (width - 1, 0, 1, height, "#")]
+
+
+def generate_cellular_automata_dungeon(width: int, height: int, iterations: int = 5, wall_prob: float = 0.45) -> List[List[str]]:
+    """
+    Vygeneruje dungeon pomocí celulárního automatu.
+    
+    Args:
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        iterations (int): Počet iterací celulárního automatu
+        wall_prob (float): Počáteční pravděpodobnost zdi (0.0 až 1.0)
+    
+    Returns:
+        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    """
+    dungeon = [["#" for _ in range(width)] for _ in range(height)]
+    for _ in iter_cellular_automata_steps(dungeon, width, height, iterations, wall_prob):
+        pass
         
     return dungeon
 
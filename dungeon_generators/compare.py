@@ -0,0 +1,87 @@
+"""
+Algorithm Comparison
+--------------------
+
+Tento modul spouští všechny registrované generátory pro stejnou velikost a seed
+paralelně v samostatných procesech a sbírá jejich výsledky spolu s časem
+generování a základními metrikami.
+
+Základní princip:
+1. Pro každý algoritmus z registru odešleme úlohu do fronty procesů
+2. Každý proces nastaví stejný seed a změří čas generování
+3. Výsledky sesbíráme v pořadí registru; metriky se spočítají až při prvním
+   přístupu (registry.GenerationResult), takže je platí jen volající, který je čte
+
+Celkový čas je tak zhruba roven času nejpomalejšího algoritmu, ne součtu všech.
+"""
+
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence
+
+from dungeon_generators import registry
+
+
+class ComparisonResult(registry.GenerationResult):
+    """Výsledek jednoho algoritmu v porovnání (při chybě bez mapy a metrik)."""
+
+    def __init__(self, dungeon: List[List[str]], entry: registry.GeneratorEntry,
+                 params: Sequence[Any], seed: Optional[int], elapsed: float,
+                 error: Optional[str] = None):
+        super().__init__(dungeon, entry, params, seed, elapsed)
+        self.key = entry.key
+        self.name = entry.name
+        self.error = error
+
+    @property
+    def metrics(self):
+        """Metriky kvality mapy (DungeonMetrics), spočítané při prvním přístupu; při chybě None."""
+        return None if self.error else super().metrics
+
+
+def run_generator(key: str, width: int, height: int, seed: int) -> ComparisonResult:
+    """
+    Vygeneruje a vyhodnotí jeden dungeon (spouští se v procesu na pozadí).
+
+    Args:
+        key (str): Klíč algoritmu v registru
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        seed (int): Seed generátoru náhodných čísel
+
+    Returns:
+        ComparisonResult: Mapa a čas generování (metriky se spočítají až při přístupu)
+    """
+    entry = registry.get_generator(key)
+    start = time.perf_counter()
+    try:
+        result = registry.generate_result(key, width, height, seed=seed)
+    except Exception as e:
+        return ComparisonResult([], entry, [], seed, time.perf_counter() - start, str(e))
+    return ComparisonResult(result.dungeon, entry, result.params, seed, result.elapsed)
+
+
+def compare_generators(width: int, height: int, seed: Optional[int] = None,
+                       keys: Optional[Sequence[str]] = None,
+                       max_workers: Optional[int] = None) -> List[ComparisonResult]:
+    """
+    Spustí vybrané (výchozí všechny) generátory paralelně se stejnými vstupy.
+
+    Args:
+        width (int): Šířka dungeonů
+        height (int): Výška dungeonů
+        seed (Optional[int]): Společný seed (výchozí je náhodný)
+        keys (Optional[Sequence[str]]): Klíče algoritmů (výchozí je celý registr)
+        max_workers (Optional[int]): Počet procesů (výchozí je jeden na algoritmus)
+
+    Returns:
+        List[ComparisonResult]: Výsledky v pořadí zadaných algoritmů
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+    keys = list(keys) if keys is not None else [entry.key for entry in registry.GENERATORS]
+
+    with ProcessPoolExecutor(max_workers=max_workers or len(keys)) as pool:
+        futures = [pool.submit(run_generator, key, width, height, seed) for key in keys]
+        return [future.result() for future in futures]
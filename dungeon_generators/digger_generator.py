@@ -17,25 +17,35 @@ důlní komplexy nebo jeskynní systémy.
 """
 
 import random
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 
-def generate_digger_dungeon(width: int, height: int, num_diggers: int = 3, dig_length: int = 100) -> List[List[str]]:
+# Změna mapy v jednom kroku: seznam obdélníků (x, y, šířka, výška, dlaždice)
+Delta = List[Tuple[int, int, int, int, str]]
+
+
+def _clipped_rect(x0: int, y0: int, x1: int, y1: int, tile: str) -> Delta:
+    """Vrátí obdélník [x0, x1] x [y0, y1] jako změnu, pokud není prázdný."""
+    if x0 > x1 or y0 > y1:
+        return []
+    return [(x0, y0, x1 - x0 + 1, y1 - y0 + 1, tile)]
+
+
+def iter_digger_steps(dungeon: List[List[str]], width: int, height: int,
+                      num_diggers: int = 3, dig_length: int = 100) -> Iterator[Delta]:
     """
-    Generuje dungeon pomocí algoritmu digger, který simuluje "kopáče" vyrývající chodby.
+    Provádí kopání tunelů krok po kroku nad mapou plnou zdí.
     
     Args:
+        dungeon (List[List[str]]): Mapa plná zdí, do které se kope
         width (int): Šířka dungeonu
         height (int): Výška dungeonu
         num_diggers (int): Počet kopáčů, kteří budou vytvářet tunely
         dig_length (int): Délka tunelů, které každý kopáč vytvoří
     
-    Returns:
-        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    Yields:
+        Delta: Změny provedené v jednom kroku (centrální místnost, pak jednotlivé tahy kopáčů)
     """
-    # Nejprve vytvoříme mapu plnou zdí
-    dungeon = [["#" for _ in range(width)] for _ in range(height)]
-    
     # Vytvoříme počáteční místnost uprostřed
     center_x, center_y = width // 2, height // 2
     room_size = 5
@@ -43,6 +53,9 @@ def generate_digger_dungeon(width: int, height: int, num_diggers: int = 3, dig_l
         for x in range(center_x - room_size // 2, center_x + room_size // 2 + 1):
             if 0 <= y < height and 0 <= x < width:
                 dungeon[y][x] = "."
+    yield _clipped_rect(max(0, center_x - room_size // 2), max(0, center_y - room_size // 2),
+                        min(width - 1, center_x + room_size // 2),
+                        min(height - 1, center_y + room_size // 2), ".")
     
     # Seznam počátečních pozic diggerů
     diggers_positions = [
@@ -83,6 +96,7 @@ def generate_digger_dungeon(width: int, height: int, num_diggers: int = 3, dig_l
             
             # Vykopáme průchod
             dungeon[y][x] = "."
+            delta = [(x, y, 1, 1, ".")]
             
             # Občas vytvoříme malou místnost
             if random.random() < 0.1:
@@ -92,6 +106,33 @@ def generate_digger_dungeon(width: int, height: int, num_diggers: int = 3, dig_l
                         if (1 <= room_y < height - 1 and 
                             1 <= room_x < width - 1):
                             dungeon[room_y][room_x] = "."
+                delta += _clipped_rect(max(1, x - room_size // 2), max(1, y - room_size // 2),
+                                       min(width - 2, x + room_size // 2),
+                                       min(height - 2, y + room_size // 2), ".")
+            yield delta
+
+
+def generate_digger_dungeon(width: int, height: int, num_diggers: int = 3, dig_length: int = 100,
+                            grid: Optional[List[List[str]]] = None) -> List[List[str]]:
+    """
+    Generuje dungeon pomocí algoritmu digger, který simuluje "kopáče" vyrývající chodby.
+    
+    Args:
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        num_diggers (int): Počet kopáčů, kteří budou vytvářet tunely
+        dig_length (int): Délka tunelů, které každý kopáč vytvoří
+        grid (optional): Předalokovaná mřížka plná zdí, do které se generuje
+            (např. MemmapGrid nebo SparseGrid). Výchozí je nový seznam seznamů v paměti.
+    
+    Returns:
+        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    """
+    # Nejprve vytvoříme mapu plnou zdí (pokud ji nedodal volající)
+    dungeon = grid if grid is not None else [["#" for _ in range(width)] for _ in range(height)]
+    
+    for _ in iter_digger_steps(dungeon, width, height, num_diggers, dig_length):
+        pass
     
     return dungeon
 
@@ -0,0 +1,237 @@
+"""
+Distance Fields
+---------------
+
+Tento modul počítá mapy vzdáleností (distance fields) nad mřížkou libovolného
+generátoru a nad nimi nabízí pomocné funkce pro umísťování vchodů, východů,
+pokladů a nepřátel.
+
+Základní princip:
+1. Průchozí buňky (podlahu) převedeme na plochý booleovský vektor s okrajem zdí,
+   takže sousedé buňky i jsou prostě i-1, i+1, i-šířka a i+šířka bez kontrol hranic
+2. Prohledávání do šířky z více zdrojů najednou postupuje po vlnách: celá fronta
+   (frontier) je pole indexů a sousedé všech jejích buněk se počítají jednou
+   operací s poli
+3. Vážená varianta (Dijkstra) opakovaně relaxuje sousedy buněk, jejichž vzdálenost
+   se v minulé vlně zlepšila, dokud se nic nemění - výsledek je stejný jako
+   u Dijkstrova algoritmu, ale bez haldy a smyček přes jednotlivé buňky
+4. Umísťovací funkce potřebují jen jeden nebo dva průchody, ne jedno prohledávání
+   pro každého kandidáta
+
+Vzdálenosti jsou v krocích ve 4-okolí (stejně jako oblasti v modulu metrics);
+nedosažitelné buňky mají vzdálenost -1 (resp. nekonečno u vážené varianty).
+"""
+
+import os
+import random
+import sys
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if __name__ == "__main__" and not __package__:
+    # Spuštění jako skript (python dungeon_generators/distance.py) - balíček
+    # dungeon_generators leží o adresář výš, než je tento soubor
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dungeon_generators.metrics import floor_mask, label_regions
+
+Point = Tuple[int, int]
+Grid = Union[Sequence[Sequence[str]], np.ndarray]
+
+
+def _padded(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vrátí plochou masku s okrajem zdí a posuny indexů ke 4 sousedům."""
+    padded = np.pad(mask, 1)
+    width = padded.shape[1]
+    return padded.ravel(), np.array([-1, 1, -width, width])
+
+
+def _source_indices(sources: Sequence[Point], shape: Tuple[int, int]) -> np.ndarray:
+    """Převede zdroje (x, y) na indexy v ploché mřížce s okrajem."""
+    height, width = shape
+    indices = []
+    for x, y in sources:
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"Zdroj ({x}, {y}) leží mimo mapu")
+        indices.append((y + 1) * (width + 2) + x + 1)
+    return np.unique(np.array(indices, dtype=np.int64))
+
+
+def _unpad(values: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Odřízne okraj z ploché mřížky a vrátí pole tvaru mapy."""
+    height, width = shape
+    return values.reshape(height + 2, width + 2)[1:-1, 1:-1].copy()
+
+
+def distance_field(dungeon: Grid, sources: Sequence[Point],
+                   max_distance: Optional[int] = None) -> np.ndarray:
+    """
+    Spočítá vzdálenost každé buňky od nejbližšího zdroje (BFS z více zdrojů najednou).
+
+    Args:
+        dungeon: Mapa dungeonu (List[List[str]]) nebo booleovská maska průchozích buněk
+        sources (Sequence[Point]): Zdroje (x, y); zdroje ve zdi se ignorují
+        max_distance (Optional[int]): Prohledávání skončí po této vzdálenosti
+
+    Returns:
+        np.ndarray: Pole int32 tvaru (height, width), -1 = nedosažitelné
+    """
+    mask = floor_mask(dungeon)
+    passable, offsets = _padded(mask)
+    distance = np.full(passable.shape, -1, dtype=np.int32)
+
+    frontier = _source_indices(sources, mask.shape)
+    frontier = frontier[passable[frontier]]
+    distance[frontier] = 0
+
+    step = 0
+    while len(frontier) and (max_distance is None or step < max_distance):
+        step += 1
+        neighbors = (frontier[:, np.newaxis] + offsets).ravel()
+        neighbors = neighbors[passable[neighbors] & (distance[neighbors] < 0)]
+        frontier = np.unique(neighbors)
+        distance[frontier] = step
+
+    return _unpad(distance, mask.shape)
+
+
+def weighted_distance_field(cost: np.ndarray, sources: Sequence[Point]) -> np.ndarray:
+    """
+    Spočítá nejkratší vážené vzdálenosti od nejbližšího zdroje (Dijkstra).
+
+    Cena vstupu do buňky je dána polem cost; neprůchozí buňky mají cenu
+    nekonečno (nebo zápornou). Hodí se např. pro chodby, které se vyhýbají vodě.
+
+    Args:
+        cost (np.ndarray): Cena vstupu do každé buňky, tvar (height, width)
+        sources (Sequence[Point]): Zdroje (x, y)
+
+    Returns:
+        np.ndarray: Pole float64 tvaru (height, width), inf = nedosažitelné
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    passable, offsets = _padded(np.isfinite(cost) & (cost >= 0))
+    step_cost = np.pad(cost, 1, constant_values=np.inf).ravel()
+    distance = np.full(passable.shape, np.inf)
+
+    frontier = _source_indices(sources, cost.shape)
+    frontier = frontier[passable[frontier]]
+    distance[frontier] = 0.0
+
+    while len(frontier):
+        # Relaxace všech sousedů buněk, které se v minulé vlně zlepšily
+        neighbors = (frontier[:, np.newaxis] + offsets).ravel()
+        candidates = np.repeat(distance[frontier], len(offsets)) + step_cost[neighbors]
+        better = passable[neighbors] & (candidates < distance[neighbors])
+        neighbors, candidates = neighbors[better], candidates[better]
+        np.minimum.at(distance, neighbors, candidates)
+        frontier = np.unique(neighbors)
+
+    return _unpad(distance, cost.shape)
+
+
+def farthest_cell(distance: np.ndarray) -> Tuple[Point, int]:
+    """
+    Najde buňku s největší konečnou vzdáleností.
+
+    Args:
+        distance (np.ndarray): Mapa vzdáleností (distance_field)
+
+    Returns:
+        Tuple[Point, int]: Pozice (x, y) a její vzdálenost
+    """
+    y, x = np.unravel_index(np.argmax(distance), distance.shape)
+    return (int(x), int(y)), int(distance[y, x])
+
+
+def farthest_pair(dungeon: Grid, start: Optional[Point] = None) -> Tuple[Point, Point, int]:
+    """
+    Najde dvojici vzdálených buněk, např. pro vchod a východ (dva průchody BFS).
+
+    Z výchozí buňky najdeme nejvzdálenější buňku A a z ní nejvzdálenější buňku B.
+    Na stromových mapách (bludiště, chodby) je to přesně nejvzdálenější dvojice,
+    na jeskyních s cykly velmi dobrý odhad.
+
+    Args:
+        dungeon: Mapa dungeonu nebo booleovská maska průchozích buněk
+        start (Optional[Point]): Výchozí buňka (výchozí je buňka největší oblasti)
+
+    Returns:
+        Tuple[Point, Point, int]: Buňky A, B a vzdálenost mezi nimi
+    """
+    mask = floor_mask(dungeon)
+    if not mask.any():
+        raise ValueError("Mapa neobsahuje žádnou podlahu")
+    if start is None:
+        start = _largest_region_cell(mask)
+
+    first, _ = farthest_cell(distance_field(mask, [start]))
+    second, length = farthest_cell(distance_field(mask, [first]))
+    return first, second, length
+
+
+def _largest_region_cell(mask: np.ndarray) -> Point:
+    """Vrátí jednu buňku největší souvislé oblasti podlahy."""
+    labels, _ = label_regions(mask)
+    largest = np.argmax(np.bincount(labels.ravel())[1:]) + 1
+    y, x = np.argwhere(labels == largest)[0]
+    return int(x), int(y)
+
+
+def cells_at_least(distance: np.ndarray, min_distance: int,
+                   max_distance: Optional[int] = None) -> List[Point]:
+    """
+    Vrátí dosažitelné buňky ve vzdálenosti alespoň min_distance (a nejvýše max_distance).
+
+    Args:
+        distance (np.ndarray): Mapa vzdáleností (distance_field)
+        min_distance (int): Minimální vzdálenost
+        max_distance (Optional[int]): Maximální vzdálenost
+
+    Returns:
+        List[Point]: Pozice (x, y) vyhovujících buněk
+    """
+    selected = distance >= min_distance
+    if max_distance is not None:
+        selected &= distance <= max_distance
+    return [(int(x), int(y)) for y, x in np.argwhere(selected)]
+
+
+def place_far_from(dungeon: Grid, sources: Sequence[Point], min_distance: int,
+                   count: int = 1, max_distance: Optional[int] = None) -> List[Point]:
+    """
+    Náhodně vybere buňky vzdálené alespoň min_distance kroků od zdrojů (např. od spawnu).
+
+    Stačí jediný průchod BFS nezávisle na počtu umísťovaných objektů.
+
+    Args:
+        dungeon: Mapa dungeonu nebo booleovská maska průchozích buněk
+        sources (Sequence[Point]): Zdroje (x, y), např. pozice spawnu
+        min_distance (int): Minimální vzdálenost od nejbližšího zdroje
+        count (int): Počet vybíraných buněk
+        max_distance (Optional[int]): Maximální vzdálenost od nejbližšího zdroje
+
+    Returns:
+        List[Point]: Až count různých pozic (méně, pokud jich tolik nevyhovuje)
+    """
+    candidates = cells_at_least(distance_field(dungeon, sources, max_distance),
+                                min_distance, max_distance)
+    return random.sample(candidates, min(count, len(candidates)))
+
+
+if __name__ == "__main__":
+    # Jednoduché testování - vchod a východ v jeskyni a poklady daleko od vchodu
+    from dungeon_generators.cellular_automata import generate_cellular_automata_dungeon
+
+    dungeon = generate_cellular_automata_dungeon(60, 30)
+    entry, exit_, length = farthest_pair(dungeon)
+    treasures = place_far_from(dungeon, [entry], length // 2, count=3)
+
+    dungeon[entry[1]][entry[0]] = "<"
+    dungeon[exit_[1]][exit_[0]] = ">"
+    for x, y in treasures:
+        dungeon[y][x] = "$"
+    for row in dungeon:
+        print("".join(row))
+    print(f"Vzdálenost vchod - východ: {length}")
@@ -16,24 +16,30 @@ které mohou sloužit jako jeskyně nebo bludiště.
 """
 
 import random
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 
-def generate_drunkards_dungeon(width: int, height: int, floor_ratio: float = 0.35) -> List[List[str]]:
+# Změna mapy v jednom kroku: seznam obdélníků (x, y, šířka, výška, dlaždice)
+Delta = List[Tuple[int, int, int, int, str]]
+
+
+def iter_drunkards_steps(dungeon: List[List[str]], width: int, height: int,
+                         floor_ratio: float = 0.35) -> Iterator[Delta]:
     """
-    Generuje dungeon pomocí algoritmu Drunkard's Walk (Náhodná procházka).
+    Provádí Drunkard's Walk krok po kroku nad mapou plnou zdí.
+    
+    Každý krok opilce upraví mapu na místě a vrátí jen změněné buňky, takže
+    animace celé procházky stojí O(počet změn), ne O(počet snímků * plocha).
     
     Args:
+        dungeon (List[List[str]]): Mapa plná zdí, do které se kope
         width (int): Šířka dungeonu
         height (int): Výška dungeonu
         floor_ratio (float): Poměr podlahy k celkové ploše dungeonu (0.0 až 1.0)
-        
-    Returns:
-        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
-    """
-    # Inicializace dungeonu se zdmi
-    dungeon = [["#" for _ in range(width)] for _ in range(height)]
     
+    Yields:
+        Delta: Změny provedené v jednom kroku (prázdný seznam, pokud opilec nic nevykopal)
+    """
     # Počáteční pozice (vyhýbáme se okrajům)
     x = random.randint(1, width - 2) 
     y = random.randint(1, height - 2)
@@ -41,6 +47,7 @@ def generate_drunkards_dungeon(width: int, height: int, floor_ratio: float = 0.3
     # Nastavení počáteční pozice jako podlahy
     dungeon[y][x] = '.'
     floor_tiles = 1
+    yield [(x, y, 1, 1, '.')]
     
     # Výpočet cílového počtu podlahových dlaždic
     target_floor = int(width * height * floor_ratio)
@@ -61,6 +68,9 @@ def generate_drunkards_dungeon(width: int, height: int, floor_ratio: float = 0.3
         if dungeon[y][x] == '#':
             dungeon[y][x] = '.'
             floor_tiles += 1
+            yield [(x, y, 1, 1, '.')]
+        else:
+            yield []
 
     # Zajistíme, že okraje jsou zdi
     for i in range(width):
@@ -71,6 +81,31 @@ def generate_drunkards_dungeon(width: int, height: int, floor_ratio: float = 0.3
         dungeon[i][0] = '#'
         dungeon[i][width-1] = '#'
 
+    yield [(0, 0, width, 1, '#'), (0, height - 1, width, 1, '#'),
+           (0, 0, 1, height, '#'), (width - 1, 0, 1, height, '#')]
+
+
+def generate_drunkards_dungeon(width: int, height: int, floor_ratio: float = 0.35,
+                               grid: Optional[List[List[str]]] = None) -> List[List[str]]:
+    """
+    Generuje dungeon pomocí algoritmu Drunkard's Walk (Náhodná procházka).
+    
+    Args:
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        floor_ratio (float): Poměr podlahy k celkové ploše dungeonu (0.0 až 1.0)
+        grid (optional): Předalokovaná mřížka plná zdí, do které se generuje
+            (např. MemmapGrid nebo SparseGrid). Výchozí je nový seznam seznamů v paměti.
+        
+    Returns:
+        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    """
+    # Inicializace dungeonu se zdmi (pokud ji nedodal volající)
+    dungeon = grid if grid is not None else [["#" for _ in range(width)] for _ in range(height)]
+    
+    for _ in iter_drunkards_steps(dungeon, width, height, floor_ratio):
+        pass
+
     return dungeon
 
 
@@ -0,0 +1,260 @@
+"""
+Dungeon Cache
+-------------
+
+Tento modul implementuje cache vygenerovaných dungeonů adresovanou obsahem vstupů.
+Stejná kombinace (algoritmus, šířka, výška, parametry, seed) vždy vede ke stejnému
+dungeonu, takže ho není nutné generovat znovu.
+
+Základní princip:
+1. Ze vstupů spočítáme stabilní hash (SHA-256 z kanonického JSON zápisu)
+2. Nejprve hledáme v paměťové LRU cache s omezeným počtem položek
+3. Poté hledáme v perzistentním úložišti na disku (komprimovaný formát)
+4. Teprve při neúspěchu dungeon vygenerujeme a uložíme ho do obou vrstev
+5. Disková vrstva má limit počtu souborů i celkové velikosti; po překročení se
+   mažou soubory s nejstarším časem posledního použití (zásah čas obnoví)
+
+Adresář diskové vrstvy se vytvoří až při prvním uložení.
+
+Dungeony bez seedu nejsou deterministické, proto se do cache neukládají.
+"""
+
+import hashlib
+import json
+import os
+import random
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Sequence
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "termdungeon")
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_DISK_ENTRIES = 1000
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+CACHE_SUFFIX = ".tdc"
+
+
+def dungeon_key(algorithm: str, width: int, height: int,
+                params: Sequence[Any] = (), seed: Optional[int] = None) -> str:
+    """
+    Spočítá stabilní klíč dungeonu ze vstupů generátoru.
+
+    Args:
+        algorithm (str): Název algoritmu
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        params (Sequence[Any]): Parametry předané generátoru
+        seed (Optional[int]): Seed generátoru náhodných čísel
+
+    Returns:
+        str: Hexadecimální SHA-256 hash vstupů
+    """
+    payload = json.dumps([algorithm, width, height, list(params), seed],
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def encode_dungeon(dungeon: List[List[str]]) -> bytes:
+    """
+    Zakóduje dungeon do kompaktní binární podoby (hlavička s rozměry + zlib).
+
+    Args:
+        dungeon (List[List[str]]): Mapa dungeonu
+
+    Returns:
+        bytes: Zakódovaný dungeon
+    """
+    height = len(dungeon)
+    width = len(dungeon[0]) if height else 0
+    header = f"{width} {height}\n".encode("ascii")
+    body = "".join("".join(row) for row in dungeon).encode("utf-8")
+    return header + zlib.compress(body, 6)
+
+
+def decode_dungeon(data: bytes) -> List[List[str]]:
+    """
+    Dekóduje dungeon zakódovaný funkcí encode_dungeon.
+
+    Args:
+        data (bytes): Zakódovaný dungeon
+
+    Returns:
+        List[List[str]]: 2D mapa dungeonu
+    """
+    header, body = data.split(b"\n", 1)
+    width, height = (int(value) for value in header.split())
+    cells = zlib.decompress(body).decode("utf-8")
+    return [list(cells[y * width:(y + 1) * width]) for y in range(height)]
+
+
+class CacheStats:
+    """Statistiky úspěšnosti cache."""
+
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def hits(self) -> int:
+        """Celkový počet zásahů v obou vrstvách."""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Podíl zásahů ze všech dotazů (0.0 až 1.0)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self) -> str:
+        return (f"CacheStats(memory_hits={self.memory_hits}, disk_hits={self.disk_hits}, "
+                f"misses={self.misses}, hit_rate={self.hit_rate:.2f})")
+
+
+class DungeonCache:
+    """
+    Dvouvrstvá cache dungeonů: LRU v paměti a perzistentní úložiště na disku.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 max_disk_entries: Optional[int] = DEFAULT_MAX_DISK_ENTRIES,
+                 max_disk_bytes: Optional[int] = DEFAULT_MAX_DISK_BYTES):
+        """
+        Inicializace cache.
+
+        Args:
+            max_entries (int): Maximální počet dungeonů v paměťové vrstvě
+            cache_dir (Optional[str]): Adresář diskové vrstvy, None ji vypne
+            max_disk_entries (Optional[int]): Maximální počet souborů na disku (None = bez limitu)
+            max_disk_bytes (Optional[int]): Maximální celková velikost souborů na disku
+                v bajtech (None = bez limitu)
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, List[List[str]]]" = OrderedDict()
+
+    def _path(self, key: str) -> str:
+        """Vrátí cestu k souboru dungeonu na disku."""
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def get(self, key: str) -> Optional[List[List[str]]]:
+        """
+        Vyhledá dungeon v cache.
+
+        Args:
+            key (str): Klíč spočítaný funkcí dungeon_key
+
+        Returns:
+            Optional[List[List[str]]]: Kopie dungeonu, nebo None pokud v cache není
+        """
+        dungeon = self._memory.get(key)
+        if dungeon is not None:
+            self._memory.move_to_end(key)
+            self.stats.memory_hits += 1
+            return [row[:] for row in dungeon]
+
+        if self.cache_dir:
+            try:
+                with open(self._path(key), "rb") as file:
+                    dungeon = decode_dungeon(file.read())
+                os.utime(self._path(key))  # Čas posledního použití pro vyhazování
+            except (OSError, ValueError, zlib.error):
+                dungeon = None
+            if dungeon is not None:
+                self.stats.disk_hits += 1
+                self._remember(key, dungeon)
+                return [row[:] for row in dungeon]
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, dungeon: List[List[str]]) -> None:
+        """
+        Uloží dungeon do obou vrstev cache.
+
+        Args:
+            key (str): Klíč spočítaný funkcí dungeon_key
+            dungeon (List[List[str]]): Mapa dungeonu
+        """
+        self._remember(key, [row[:] for row in dungeon])
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Zápis přes dočasný soubor, aby jiný proces nikdy nečetl rozepsaný soubor
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(encode_dungeon(dungeon))
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Smaže nejdéle nepoužité soubory, dokud disková vrstva nesplní limity."""
+        if self.max_disk_entries is None and self.max_disk_bytes is None:
+            return
+        files = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(CACHE_SUFFIX):
+                    try:
+                        info = entry.stat()
+                    except OSError:
+                        continue  # Soubor mezitím smazal jiný proces
+                    files.append((info.st_mtime, info.st_size, entry.path))
+        files.sort()
+
+        count = len(files)
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if ((self.max_disk_entries is None or count <= self.max_disk_entries)
+                    and (self.max_disk_bytes is None or total <= self.max_disk_bytes)):
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            count -= 1
+            total -= size
+
+    def _remember(self, key: str, dungeon: List[List[str]]) -> None:
+        """Vloží dungeon do paměťové vrstvy a vyhodí nejdéle nepoužité položky."""
+        self._memory[key] = dungeon
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_or_generate(self, algorithm: str, generator: Callable[..., List[List[str]]],
+                        width: int, height: int, params: Sequence[Any] = (),
+                        seed: Optional[int] = None) -> List[List[str]]:
+        """
+        Vrátí dungeon z cache, případně ho vygeneruje a uloží.
+
+        Args:
+            algorithm (str): Název algoritmu (součást klíče)
+            generator (Callable): Funkce generátoru volaná jako generator(width, height, *params)
+            width (int): Šířka dungeonu
+            height (int): Výška dungeonu
+            params (Sequence[Any]): Parametry generátoru
+            seed (Optional[int]): Seed; bez něj se cache obchází
+
+        Returns:
+            List[List[str]]: 2D mapa dungeonu
+        """
+        if seed is None:
+            return generator(width, height, *params)
+
+        key = dungeon_key(algorithm, width, height, params, seed)
+        dungeon = self.get(key)
+        if dungeon is None:
+            random.seed(seed)
+            dungeon = generator(width, height, *params)
+            self.put(key, dungeon)
+        return dungeon
+
+    def clear(self) -> None:
+        """Vyprázdní paměťovou vrstvu (disková vrstva zůstává zachována)."""
+        self._memory.clear()
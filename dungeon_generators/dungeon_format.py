@@ -0,0 +1,371 @@
+"""
+Binary Dungeon Format
+---------------------
+
+Tento modul implementuje kompaktní binární souborový formát pro mapy dungeonů
+a čtečku, která soubor mapuje do paměti (mmap) a dekóduje jen potřebné řádky.
+
+Struktura souboru:
+1. Hlavička: magické číslo, verze, počet bitů na buňku, šířka, výška, délka metadat
+2. Metadata v JSON: algoritmus, parametry, seed a paleta dlaždic
+3. Tabulka offsetů řádků (height + 1 hodnot uint64), díky které lze skočit
+   na libovolný řádek v konstantním čase
+4. Data řádků; každý řádek je uložen buď bitově zhuštěný, nebo pomocí RLE
+   (run-length encoding), podle toho, co je kratší
+
+Dungeony obsahují dlouhé souvislé úseky zdí a podlahy, takže RLE obvykle
+zmenší mapu o jeden až dva řády oproti textovému výstupu.
+"""
+
+import json
+import mmap
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"TDNG"
+VERSION = 1
+HEADER = struct.Struct("<4sBBIII")  # magic, verze, bity na buňku, šířka, výška, délka metadat
+ROW_BITPACKED = 0
+ROW_RLE = 1
+
+
+def _bits_for_palette(size: int) -> int:
+    """Vrátí počet bitů na buňku potřebný pro paletu dané velikosti."""
+    for bits in (1, 2, 4):
+        if size <= (1 << bits):
+            return bits
+    return 8
+
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    """Zapíše nezáporné celé číslo ve formátu varint (7 bitů na bajt)."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _pack_codes(codes: np.ndarray, bits: int) -> bytes:
+    """Bitově zhustí pole kódů dlaždic (MSB první)."""
+    if bits == 8:
+        return codes.astype(np.uint8).tobytes()
+    shifts = np.arange(bits - 1, -1, -1, dtype=np.uint8)
+    cell_bits = (codes[:, None] >> shifts) & 1
+    return np.packbits(cell_bits.ravel()).tobytes()
+
+
+def _unpack_codes(data: bytes, bits: int, count: int, skip: int = 0) -> np.ndarray:
+    """Rozbalí bitově zhuštěné kódy; skip je počet buněk přeskočených na začátku."""
+    if bits == 8:
+        return np.frombuffer(data, dtype=np.uint8, count=count, offset=skip).copy()
+    raw = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    cell_bits = raw[skip * bits:(skip + count) * bits].reshape(count, bits)
+    weights = (1 << np.arange(bits - 1, -1, -1)).astype(np.uint8)
+    return (cell_bits * weights).sum(axis=1).astype(np.uint8)
+
+
+def _encode_row(codes: np.ndarray, bits: int) -> bytes:
+    """Zakóduje jeden řádek kratší z variant bitového zhuštění a RLE."""
+    packed = bytes([ROW_BITPACKED]) + _pack_codes(codes, bits)
+
+    # Začátky běhů stejných dlaždic
+    starts = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], starts))
+    lengths = np.diff(np.concatenate((starts, [len(codes)])))
+
+    # RLE nemá smysl počítat, pokud nemůže být kratší než bitové zhuštění
+    if len(starts) * 2 + 1 >= len(packed):
+        return packed
+
+    rle = bytearray([ROW_RLE])
+    for code, length in zip(codes[starts].tolist(), lengths.tolist()):
+        rle.append(code)
+        _encode_varint(length, rle)
+    return bytes(rle) if len(rle) < len(packed) else packed
+
+
+def _decode_rle(data: bytes, x0: int, x1: int) -> np.ndarray:
+    """Dekóduje úsek [x0, x1) řádku uloženého pomocí RLE."""
+    out = np.empty(x1 - x0, dtype=np.uint8)
+    pos = 0  # pozice v datech
+    x = 0    # aktuální sloupec
+    while x < x1 and pos < len(data):
+        code = data[pos]
+        pos += 1
+        length = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            length |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        start, end = max(x, x0), min(x + length, x1)
+        if start < end:
+            out[start - x0:end - x0] = code
+        x += length
+    return out
+
+
+def dungeon_palette(dungeon: Sequence[Sequence[str]]) -> str:
+    """
+    Zjistí paletu dlaždic použitých v dungeonu ('#' a '.' jsou vždy první).
+
+    Args:
+        dungeon (Sequence[Sequence[str]]): Mapa dungeonu
+
+    Returns:
+        str: Řetězec všech použitých dlaždic
+    """
+    palette = "#."
+    for row in dungeon:
+        for tile in set(row):
+            if tile not in palette:
+                palette += tile
+    return palette
+
+
+def dungeon_to_codes(dungeon: Sequence[Sequence[str]], palette: str) -> np.ndarray:
+    """
+    Převede mapu dungeonu na 2D pole indexů do palety.
+
+    Args:
+        dungeon (Sequence[Sequence[str]]): Mapa dungeonu
+        palette (str): Paleta dlaždic (jednobajtové ASCII znaky)
+
+    Returns:
+        np.ndarray: Pole tvaru (height, width) typu uint8
+    """
+    lookup = _palette_lookup(palette)
+    height = len(dungeon)
+    width = len(dungeon[0]) if height else 0
+    codes = np.empty((height, width), dtype=np.uint8)
+    for y, row in enumerate(dungeon):
+        codes[y] = lookup[np.frombuffer("".join(row).encode("ascii"), dtype=np.uint8)]
+    return codes
+
+
+def _palette_lookup(palette: str) -> np.ndarray:
+    """Vytvoří převodní tabulku z ASCII kódu znaku na index do palety."""
+    lookup = np.zeros(256, dtype=np.uint8)
+    for index, tile in enumerate(palette):
+        lookup[ord(tile)] = index
+    return lookup
+
+
+def encode_dungeon_file(codes_rows: Iterable[np.ndarray], width: int, height: int,
+                        palette: str, metadata: Dict[str, Any]) -> bytes:
+    """
+    Sestaví kompletní obsah souboru z řádků kódů dlaždic.
+
+    Args:
+        codes_rows (Iterable[np.ndarray]): Řádky indexů do palety
+        width (int): Šířka mapy
+        height (int): Výška mapy
+        palette (str): Paleta dlaždic
+        metadata (Dict[str, Any]): Metadata (algoritmus, parametry, seed)
+
+    Returns:
+        bytes: Obsah souboru
+    """
+    bits = _bits_for_palette(len(palette))
+    meta = json.dumps(dict(metadata, palette=palette), ensure_ascii=False).encode("utf-8")
+
+    offsets = [0]
+    chunks = []
+    for codes in codes_rows:
+        encoded = _encode_row(codes, bits)
+        chunks.append(encoded)
+        offsets.append(offsets[-1] + len(encoded))
+
+    header = HEADER.pack(MAGIC, VERSION, bits, width, height, len(meta))
+    table = np.asarray(offsets, dtype="<u8").tobytes()
+    return b"".join([header, meta, table] + chunks)
+
+
+def dumps(dungeon: Sequence[Sequence[str]], algorithm: str = "",
+          params: Sequence[Any] = (), seed: Optional[int] = None) -> bytes:
+    """
+    Zakóduje dungeon do binárního formátu.
+
+    Args:
+        dungeon (Sequence[Sequence[str]]): Mapa dungeonu
+        algorithm (str): Název algoritmu, kterým byl dungeon vygenerován
+        params (Sequence[Any]): Parametry generátoru
+        seed (Optional[int]): Seed generátoru
+
+    Returns:
+        bytes: Zakódovaný dungeon
+    """
+    palette = dungeon_palette(dungeon)
+    lookup = _palette_lookup(palette)
+    height = len(dungeon)
+    width = len(dungeon[0]) if height else 0
+    rows = (lookup[np.frombuffer("".join(row).encode("ascii"), dtype=np.uint8)]
+            for row in dungeon)
+    metadata = {"algorithm": algorithm, "params": list(params), "seed": seed}
+    return encode_dungeon_file(rows, width, height, palette, metadata)
+
+
+def write_dungeon(path: str, dungeon: Sequence[Sequence[str]], algorithm: str = "",
+                  params: Sequence[Any] = (), seed: Optional[int] = None) -> int:
+    """
+    Uloží dungeon do souboru v binárním formátu.
+
+    Args:
+        path (str): Cesta k souboru
+        dungeon (Sequence[Sequence[str]]): Mapa dungeonu
+        algorithm (str): Název algoritmu
+        params (Sequence[Any]): Parametry generátoru
+        seed (Optional[int]): Seed generátoru
+
+    Returns:
+        int: Velikost zapsaného souboru v bajtech
+    """
+    data = dumps(dungeon, algorithm, params, seed)
+    with open(path, "wb") as file:
+        file.write(data)
+    return len(data)
+
+
+class DungeonFile:
+    """
+    Čtečka binárního formátu s náhodným přístupem k řádkům a výřezům mapy.
+
+    Soubor je namapován do paměti, takže čtení výřezu načte z disku jen
+    stránky s příslušnými řádky.
+    """
+
+    def __init__(self, path: Optional[str] = None, data: Optional[bytes] = None):
+        """
+        Otevře dungeon ze souboru (přes mmap) nebo z bajtů v paměti.
+
+        Args:
+            path (Optional[str]): Cesta k souboru
+            data (Optional[bytes]): Zakódovaný dungeon (alternativa k path)
+        """
+        self._file = None
+        if path is not None:
+            self._file = open(path, "rb")
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        elif data is not None:
+            self._buffer = data
+        else:
+            raise ValueError("Je nutné zadat cestu k souboru nebo data")
+
+        magic, version, bits, width, height, meta_len = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Soubor není ve formátu TermDungeon")
+        if version != VERSION:
+            raise ValueError(f"Nepodporovaná verze formátu: {version}")
+
+        self.bits = bits
+        self.width = width
+        self.height = height
+        meta_start = HEADER.size
+        metadata = json.loads(bytes(self._buffer[meta_start:meta_start + meta_len]).decode("utf-8"))
+        self.algorithm: str = metadata.get("algorithm", "")
+        self.params: List[Any] = metadata.get("params", [])
+        self.seed: Optional[int] = metadata.get("seed")
+        self.palette: str = metadata["palette"]
+        self._tiles = np.array(list(self.palette))
+
+        table_start = meta_start + meta_len
+        self._offsets = np.frombuffer(self._buffer, dtype="<u8", count=height + 1,
+                                      offset=table_start)
+        self._data_start = table_start + (height + 1) * 8
+
+    def row_codes(self, y: int, x0: int = 0, x1: Optional[int] = None) -> np.ndarray:
+        """
+        Dekóduje indexy do palety pro úsek [x0, x1) řádku y.
+
+        Args:
+            y (int): Index řádku
+            x0 (int): Počáteční sloupec
+            x1 (Optional[int]): Koncový sloupec (výchozí je šířka mapy)
+
+        Returns:
+            np.ndarray: Pole indexů typu uint8
+        """
+        if not 0 <= y < self.height:
+            raise IndexError(f"Řádek {y} je mimo mapu")
+        x1 = self.width if x1 is None else min(x1, self.width)
+        x0 = max(0, x0)
+        if x1 <= x0:
+            # Úsek celý mimo mapu (nebo prázdný) - prázdný řádek výřezu
+            return np.empty(0, dtype=np.uint8)
+        start = self._data_start + int(self._offsets[y])
+        end = self._data_start + int(self._offsets[y + 1])
+        kind = self._buffer[start]
+
+        if kind == ROW_RLE:
+            return _decode_rle(self._buffer[start + 1:end], x0, x1)
+
+        # Bitově zhuštěný řádek - načteme jen bajty pokrývající požadovaný úsek
+        first_byte = (x0 * self.bits) // 8
+        last_byte = ((x1 * self.bits) + 7) // 8
+        chunk = self._buffer[start + 1 + first_byte:start + 1 + last_byte]
+        skip = x0 - (first_byte * 8) // self.bits
+        return _unpack_codes(chunk, self.bits, x1 - x0, skip)
+
+    def read_row(self, y: int) -> List[str]:
+        """Vrátí řádek y jako seznam dlaždic."""
+        return self._tiles[self.row_codes(y)].tolist()
+
+    def read_window(self, x: int, y: int, width: int, height: int) -> List[List[str]]:
+        """
+        Dekóduje obdélníkový výřez mapy bez načítání zbytku souboru.
+
+        Args:
+            x (int): X-ová souřadnice levého horního rohu výřezu
+            y (int): Y-ová souřadnice levého horního rohu výřezu
+            width (int): Šířka výřezu
+            height (int): Výška výřezu
+
+        Returns:
+            List[List[str]]: Výřez mapy (oříznutý hranicemi mapy)
+        """
+        rows = range(max(0, y), min(y + height, self.height))
+        return [self._tiles[self.row_codes(row, x, x + width)].tolist() for row in rows]
+
+    def read_all(self) -> List[List[str]]:
+        """Dekóduje celou mapu."""
+        return self.read_window(0, 0, self.width, self.height)
+
+    def close(self) -> None:
+        """Uzavře namapovaný soubor."""
+        if self._file is not None:
+            self._offsets = None
+            self._buffer.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "DungeonFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def loads(data: bytes) -> List[List[str]]:
+    """Dekóduje dungeon z bajtů vytvořených funkcí dumps."""
+    return DungeonFile(data=data).read_all()
+
+
+def read_dungeon(path: str) -> Tuple[List[List[str]], Dict[str, Any]]:
+    """
+    Načte celý dungeon ze souboru.
+
+    Args:
+        path (str): Cesta k souboru
+
+    Returns:
+        Tuple[List[List[str]], Dict[str, Any]]: Mapa dungeonu a její metadata
+    """
+    with DungeonFile(path) as dungeon_file:
+        metadata = {"algorithm": dungeon_file.algorithm, "params": dungeon_file.params,
+                    "seed": dungeon_file.seed}
+        return dungeon_file.read_all(), metadata
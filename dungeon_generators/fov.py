@@ -0,0 +1,360 @@
+"""
+Visibility Index
+----------------
+
+Tento modul předpočítá viditelnost (FOV) pro hotovou mapu. Mapa se po vygenerování
+už nemění, takže místo stínového vrhání (shadowcasting) v každém tahu stačí za běhu
+jen přečíst uložený bit.
+
+Viditelnost odpovídá stínovému vrhání: každá buňka zakrývá úhlový výsek mezi
+svými rohy a neprůhledná buňka vrhá stín na všechny buňky ve vzdálenějších
+prstencích (čtvercích kolem pozorovatele, stejně jako řádky oktantu u rekurzivního
+stínového vrhání). Buňka je vidět, pokud alespoň část jejího výseku není ve stínu.
+
+Základní princip:
+1. Úhly všech rohů buněk v kruhu o zadaném poloměru rozdělí kruh na elementární
+   úhlové úseky (pro poloměr 8 jich je 188); výsek každého posunu (dx, dy)
+   je množina těchto úseků, uložená jako bitová maska v několika slovech uint64
+2. Pro všechny pozorovatele pásu mapy najednou držíme masku zastíněných úseků;
+   buňka je vidět, pokud její maska není celá zastíněná, a neprůhledné buňky
+   prstence pak své úseky přidají do stínu - každý posun stojí jen několik
+   operací s poli nad celým pásem
+3. Výsledky pro každou podlahovou buňku zhustíme do bitové masky (po 8 posunech
+   do bajtu, ve stejném pořadí jako np.packbits) - při poloměru 8 je to 25 bajtů
+   na buňku
+4. Dotaz na viditelnost je pak jen výběr řádku bitové masky a test jednoho bitu
+
+Zdi jsou vidět (pozorovatel vidí stěnu), ale za ně už ne. Index se ukládá vedle
+mapy do souboru <mapa>.fov a při načtení lze ověřit, že patří ke stejné mapě.
+"""
+
+import hashlib
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if __name__ == "__main__" and not __package__:
+    # Spuštění jako skript (python dungeon_generators/fov.py) - balíček
+    # dungeon_generators leží o adresář výš, než je tento soubor
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dungeon_generators.metrics import floor_mask
+
+Point = Tuple[int, int]
+Grid = Union[Sequence[Sequence[str]], np.ndarray]
+
+# Výchozí poloměr viditelnosti
+DEFAULT_RADIUS = 8
+
+# Počet řádků mapy zpracovaných najednou (omezuje paměť pro velké mapy)
+BAND_ROWS = 16
+
+# Přípona souboru s indexem ukládaného vedle mapy
+INDEX_SUFFIX = ".fov"
+
+
+def transparency_mask(dungeon: Grid, wall: str = "#") -> np.ndarray:
+    """
+    Vrátí masku průhledných buněk (všechno kromě zdí, tedy i schody, voda, ...).
+
+    Args:
+        dungeon: Mapa dungeonu (List[List[str]]) nebo již hotová booleovská maska
+        wall (str): Znak neprůhledné dlaždice
+
+    Returns:
+        np.ndarray: Pole tvaru (height, width), True tam, kde buňka nepřekáží výhledu
+    """
+    if isinstance(dungeon, np.ndarray):
+        return dungeon.astype(bool, copy=False)
+    return ~floor_mask(dungeon, wall)
+
+
+def ray_offsets(radius: int) -> np.ndarray:
+    """
+    Vrátí posuny v kruhu seřazené podle prstenců (Čebyševovy vzdálenosti).
+
+    Args:
+        radius (int): Poloměr viditelnosti
+
+    Returns:
+        np.ndarray: Posuny (dx, dy) tvaru (K, 2), první je (0, 0)
+    """
+    offsets = [(dx, dy) for dy in range(-radius, radius + 1) for dx in range(-radius, radius + 1)
+               if dx * dx + dy * dy <= radius * radius]
+    offsets.sort(key=lambda o: (max(abs(o[0]), abs(o[1])), abs(o[0]) + abs(o[1]), o[1], o[0]))
+    return np.array(offsets, dtype=np.int32)
+
+
+def angular_masks(offsets: np.ndarray) -> Tuple[int, List[List[Tuple[int, np.uint64]]]]:
+    """
+    Rozdělí kruh na elementární úhlové úseky a pro každý posun vrátí jeho výsek.
+
+    Args:
+        offsets (np.ndarray): Posuny (dx, dy) z ray_offsets
+
+    Returns:
+        Tuple[int, List[List[Tuple[int, np.uint64]]]]: Počet slov masky a pro každý
+            posun dvojice (slovo, bity) úseků, které buňka zakrývá (pozorovatel žádné)
+    """
+    if len(offsets) < 2:
+        return 0, [[]]  # Poloměr 0 - jen pozorovatel
+    cells = offsets[1:].astype(np.float64)
+    corners = np.array([(-0.5, -0.5), (-0.5, 0.5), (0.5, -0.5), (0.5, 0.5)])
+    points = cells[:, None, :] + corners[None, :, :]
+    angles = np.arctan2(points[..., 1], points[..., 0])
+
+    # Hranice úseků = různé úhly rohů; úsek reprezentuje jeho střed
+    bounds = np.unique(np.round(angles, 12))
+    ends = np.append(bounds[1:], bounds[0] + 2 * np.pi)
+    middles = (bounds + ends) / 2
+
+    # Výsek buňky měříme od úhlu jejího středu, aby se nepřelomil přes -pi/pi
+    center = np.arctan2(cells[:, 1], cells[:, 0])[:, None]
+    wrap = lambda a: (a + np.pi) % (2 * np.pi) - np.pi
+    spread = wrap(angles - center)
+    relative = wrap(middles[None, :] - center)
+    covered = (relative > spread.min(axis=1)[:, None]) & (relative < spread.max(axis=1)[:, None])
+
+    words = (len(bounds) + 63) // 64
+    masks: List[List[Tuple[int, np.uint64]]] = [[]]
+    for row in covered:
+        bits: Dict[int, int] = {}
+        for i in np.flatnonzero(row):
+            bits[i // 64] = bits.get(i // 64, 0) | (1 << (i % 64))
+        masks.append([(word, np.uint64(value)) for word, value in sorted(bits.items())])
+    return words, masks
+
+
+class VisibilityIndex:
+    """
+    Předpočítaná viditelnost z každé podlahové buňky mapy v daném poloměru.
+    """
+
+    def __init__(self, radius: int, cells: np.ndarray, bits: np.ndarray,
+                 map_hash: str = ""):
+        """
+        Inicializace indexu (obvykle přes build_visibility_index nebo load).
+
+        Args:
+            radius (int): Poloměr viditelnosti
+            cells (np.ndarray): Číslo řádku bitové masky pro každou buňku mapy
+                (pole int32 tvaru (height, width), -1 = buňka nemá záznam)
+            bits (np.ndarray): Bitové masky viditelných posunů, tvar (N, ceil(K / 8))
+            map_hash (str): Otisk masky průhlednosti mapy
+        """
+        self.radius = radius
+        self.cells = cells
+        self.bits = bits
+        self.map_hash = map_hash
+        self.offsets = ray_offsets(radius)
+
+        # Tabulka posun -> pořadí bitu (-1 mimo kruh)
+        size = 2 * radius + 1
+        self._bit_of = np.full((size, size), -1, dtype=np.int32)
+        self._bit_of[self.offsets[:, 1] + radius, self.offsets[:, 0] + radius] = np.arange(len(self.offsets))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Rozměry mapy (height, width)."""
+        return self.cells.shape
+
+    def _row(self, x: int, y: int) -> np.ndarray:
+        """Vrátí rozbalené bity viditelnosti pozorovatele (x, y)."""
+        height, width = self.shape
+        row = self.cells[y, x] if 0 <= x < width and 0 <= y < height else -1
+        if row < 0:
+            raise ValueError(f"Buňka ({x}, {y}) nemá záznam v indexu viditelnosti")
+        return np.unpackbits(self.bits[row], count=len(self.offsets)).astype(bool)
+
+    def is_visible(self, x: int, y: int, target_x: int, target_y: int) -> bool:
+        """
+        Zjistí, zda pozorovatel na (x, y) vidí buňku (target_x, target_y).
+
+        Args:
+            x (int): X souřadnice pozorovatele
+            y (int): Y souřadnice pozorovatele
+            target_x (int): X souřadnice cíle
+            target_y (int): Y souřadnice cíle
+
+        Returns:
+            bool: True, pokud je cíl v poloměru a nic ho nezakrývá
+        """
+        dx, dy = target_x - x, target_y - y
+        if abs(dx) > self.radius or abs(dy) > self.radius:
+            return False
+        bit = int(self._bit_of[dy + self.radius, dx + self.radius])
+        if bit < 0:
+            return False
+        height, width = self.shape
+        if not (0 <= x < width and 0 <= y < height) or self.cells[y, x] < 0:
+            raise ValueError(f"Buňka ({x}, {y}) nemá záznam v indexu viditelnosti")
+        return bool(self.bits[self.cells[y, x], bit >> 3] & (0x80 >> (bit & 7)))
+
+    def visible_window(self, x: int, y: int) -> np.ndarray:
+        """
+        Vrátí viditelnost kolem pozorovatele jako booleovské okno.
+
+        Args:
+            x (int): X souřadnice pozorovatele
+            y (int): Y souřadnice pozorovatele
+
+        Returns:
+            np.ndarray: Pole tvaru (2r+1, 2r+1) se středem na pozorovateli
+        """
+        size = 2 * self.radius + 1
+        window = np.zeros((size, size), dtype=bool)
+        window[self.offsets[:, 1] + self.radius, self.offsets[:, 0] + self.radius] = self._row(x, y)
+        return window
+
+    def visible_cells(self, x: int, y: int) -> List[Point]:
+        """
+        Vrátí seznam buněk viditelných z (x, y).
+
+        Args:
+            x (int): X souřadnice pozorovatele
+            y (int): Y souřadnice pozorovatele
+
+        Returns:
+            List[Point]: Viditelné buňky (x, y) uvnitř mapy
+        """
+        seen = self.offsets[self._row(x, y)] + (x, y)
+        height, width = self.shape
+        inside = (seen[:, 0] >= 0) & (seen[:, 0] < width) & (seen[:, 1] >= 0) & (seen[:, 1] < height)
+        return [(int(cx), int(cy)) for cx, cy in seen[inside]]
+
+    def matches(self, dungeon: Grid) -> bool:
+        """Ověří, že index patří k mapě (stejná maska průhlednosti)."""
+        return self.map_hash == map_hash(transparency_mask(dungeon))
+
+    def save(self, path: str) -> None:
+        """
+        Uloží index do souboru (komprimovaný formát numpy).
+
+        Args:
+            path (str): Cesta k souboru, obvykle index_path(cesta_k_mapě)
+        """
+        with open(path, "wb") as file:
+            np.savez_compressed(file, radius=self.radius, cells=self.cells, bits=self.bits,
+                                map_hash=self.map_hash)
+
+    @classmethod
+    def load(cls, path: str, dungeon: Optional[Grid] = None) -> "VisibilityIndex":
+        """
+        Načte index ze souboru.
+
+        Args:
+            path (str): Cesta k souboru s indexem
+            dungeon (optional): Mapa, ke které musí index patřit
+
+        Returns:
+            VisibilityIndex: Načtený index
+        """
+        with np.load(path) as data:
+            index = cls(int(data["radius"]), data["cells"], data["bits"], str(data["map_hash"]))
+        if dungeon is not None and not index.matches(dungeon):
+            raise ValueError(f"Index viditelnosti {path} patří k jiné mapě")
+        return index
+
+
+def map_hash(transparent: np.ndarray) -> str:
+    """Spočítá otisk masky průhlednosti (rozměry a obsah)."""
+    digest = hashlib.sha1(np.asarray(transparent.shape, dtype=np.int64).tobytes())
+    digest.update(np.packbits(transparent).tobytes())
+    return digest.hexdigest()
+
+
+def index_path(map_path: str) -> str:
+    """Vrátí cestu k indexu viditelnosti uloženému vedle mapy."""
+    return map_path + INDEX_SUFFIX
+
+
+def build_visibility_index(dungeon: Grid, radius: int = DEFAULT_RADIUS,
+                           viewers: Optional[Grid] = None) -> VisibilityIndex:
+    """
+    Předpočítá viditelnost z každé podlahové buňky mapy.
+
+    Args:
+        dungeon: Mapa dungeonu nebo booleovská maska průhledných buněk
+        radius (int): Poloměr viditelnosti
+        viewers (optional): Maska buněk, pro které se viditelnost počítá
+            (výchozí jsou všechny průhledné buňky)
+
+    Returns:
+        VisibilityIndex: Index viditelnosti
+    """
+    transparent = transparency_mask(dungeon)
+    height, width = transparent.shape
+    viewer_mask = transparent if viewers is None else floor_mask(viewers)
+    offsets = ray_offsets(radius)
+    words, masks = angular_masks(offsets)
+    rings = np.abs(offsets).max(axis=1)
+    ring_cells = [np.flatnonzero(rings == ring) for ring in range(radius + 1)]
+
+    cells = np.full((height, width), -1, dtype=np.int32)
+    cells[viewer_mask] = np.arange(int(viewer_mask.sum()), dtype=np.int32)
+    bits = np.zeros((int(viewer_mask.sum()), (len(offsets) + 7) // 8), dtype=np.uint8)
+
+    padded = np.pad(transparent, radius)
+    row = 0
+    for y0 in range(0, height, BAND_ROWS):
+        band = min(BAND_ROWS, height - y0)
+        band_viewers = viewer_mask[y0:y0 + band]
+        count = int(band_viewers.sum())
+        if not count:
+            continue
+
+        # Průhlednost buňky s posunem (dx, dy) pro všechny pozorovatele pásu
+        def clear(dx: int, dy: int) -> np.ndarray:
+            top, left = y0 + radius + dy, radius + dx
+            return padded[top:top + band, left:left + width]
+
+        shadow = np.zeros((words, band, width), dtype=np.uint64)
+        packed = np.zeros((band, width), dtype=np.uint8)
+        for k in range(len(offsets)):
+            if k == 0:
+                seen = np.ones((band, width), dtype=bool)  # Pozorovatel vidí sám sebe
+            else:
+                # Buňka je vidět, pokud její výsek není celý ve stínu
+                (word, mask), *rest = masks[k]
+                seen = (shadow[word] & mask) != mask
+                for word, mask in rest:
+                    seen |= (shadow[word] & mask) != mask
+
+            # Bity skládáme přímo do bajtů celého pásu (stejné pořadí jako np.packbits)
+            packed |= seen.view(np.uint8) << (7 - k % 8)
+            if k % 8 == 7 or k == len(offsets) - 1:
+                bits[row:row + count, k // 8] = packed[band_viewers]
+                packed[:] = 0
+
+            # Po dokončení prstence vrhnou jeho neprůhledné buňky stín na další prstence
+            if k + 1 < len(offsets) and rings[k + 1] != rings[k]:
+                for i in ring_cells[rings[k]]:
+                    blocked = (~clear(*offsets[i])).astype(np.uint64)
+                    for word, mask in masks[i]:
+                        shadow[word] |= blocked * mask
+        row += count
+
+    return VisibilityIndex(radius, cells, bits, map_hash(transparent))
+
+
+if __name__ == "__main__":
+    # Jednoduché testování - viditelnost z náhodné buňky jeskyně
+    import random
+    import time
+
+    from dungeon_generators.cellular_automata import generate_cellular_automata_dungeon
+
+    dungeon = generate_cellular_automata_dungeon(60, 30)
+    start = time.perf_counter()
+    index = build_visibility_index(dungeon, radius=8)
+    elapsed = time.perf_counter() - start
+
+    x, y = random.choice([(x, y) for y, row in enumerate(dungeon) for x, tile in enumerate(row)
+                          if tile == "."])
+    visible = set(index.visible_cells(x, y))
+    for cy, row in enumerate(dungeon):
+        print("".join("@" if (cx, cy) == (x, y) else tile if (cx, cy) in visible else " "
+                      for cx, tile in enumerate(row)))
+    print(f"Index: {elapsed * 1000:.0f} ms, {index.bits.nbytes} B")
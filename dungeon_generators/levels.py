@@ -0,0 +1,215 @@
+"""
+Multi-Level Dungeons
+--------------------
+
+Tento modul generuje vícepatrový dungeon - svazek pater nad sebou, propojených
+schodišti, jejichž pozice na sousedních patrech sedí přesně nad sebou.
+
+Základní princip:
+1. Vytvoříme jedno 3D pole (patra, výška, šířka) ve sdílené paměti
+   (multiprocessing.shared_memory) - jeden bajt = jedna dlaždice
+2. Patra rozdělíme mezi procesy; každý proces vygeneruje své patro běžnou funkcí
+   generate_*_dungeon a zapíše ho přímo do svého řezu sdíleného pole, takže se
+   hotové mapy nemusí posílat zpět přes roury
+3. Nad celým svazkem najednou spočítáme kandidáty na schodiště - buňky, kde je
+   podlaha na obou sousedních patrech - a pro každou dvojici pater jednoho vybereme
+4. Pokud dvě sousední patra žádnou společnou podlahu nemají, prokopeme na spodním
+   patře chodbu od pozice schodiště k nejbližší podlaze
+
+Každé patro má vlastní seed odvozený ze seedu dungeonu, takže celý svazek je
+reprodukovatelný bez ohledu na počet procesů a pořadí, v jakém patra doběhnou.
+S časovým limitem mají všechna patra společný termín; patro, které se nestihne,
+zůstane rozpracované a je označené v LevelStack.completed.
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dungeon_generators import registry
+from dungeon_generators.budget import Budget, generate_within_budget
+
+FLOOR = ord(".")
+STAIRS_DOWN = ord(">")
+STAIRS_UP = ord("<")
+
+
+class LevelStack(NamedTuple):
+    """Vygenerovaný vícepatrový dungeon."""
+    tiles: np.ndarray
+    stairs: List[Tuple[int, int]]
+    seeds: List[int]
+    elapsed: float
+    completed: List[bool]
+
+    def level(self, index: int) -> List[List[str]]:
+        """Vrátí jedno patro jako běžnou mapu dungeonu (List[List[str]])."""
+        return [list(row.tobytes().decode("ascii")) for row in self.tiles[index]]
+
+
+def level_seeds(levels: int, seed: Optional[int] = None) -> List[int]:
+    """
+    Odvodí seedy jednotlivých pater ze seedu dungeonu.
+
+    Args:
+        levels (int): Počet pater
+        seed (Optional[int]): Seed celého dungeonu (výchozí je náhodný)
+
+    Returns:
+        List[int]: Seed každého patra
+    """
+    rng = random.Random(seed)
+    return [rng.randrange(2 ** 32) for _ in range(levels)]
+
+
+def _generate_level(shm_name: str, shape: Tuple[int, int, int], level: int, key: str,
+                    params: Sequence[Any], seed: int, deadline: Optional[float] = None) -> bool:
+    """Vygeneruje jedno patro a zapíše ho do sdíleného pole (spouští se v procesu na pozadí)."""
+    _, height, width = shape
+    result = generate_within_budget(key, width, height, params, seed, Budget(deadline=deadline))
+    dungeon = result.dungeon
+    cells = "".join("".join(row) for row in dungeon).encode("ascii")
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        stack = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        stack[level] = np.frombuffer(cells, dtype=np.uint8).reshape(height, width)
+        del stack  # Pohled musí zaniknout dřív, než se sdílená paměť zavře
+    finally:
+        shm.close()
+    return result.completed
+
+
+def _carve_to_floor(level: np.ndarray, x: int, y: int) -> None:
+    """Prokope na patře chodbu tvaru L z bodu (x, y) k nejbližší podlaze."""
+    floor = np.argwhere(level == FLOOR)
+    if not len(floor):
+        level[y, x] = FLOOR
+        return
+    ty, tx = floor[np.argmin(((floor - (y, x)) ** 2).sum(axis=1))]
+    level[y, min(x, tx):max(x, tx) + 1] = FLOOR
+    level[min(y, ty):max(y, ty) + 1, tx] = FLOOR
+
+
+def place_stairs(tiles: np.ndarray, seed: Optional[int] = None,
+                 mark: bool = True) -> List[Tuple[int, int]]:
+    """
+    Vybere pozice schodišť mezi všemi dvojicemi sousedních pater.
+
+    Kandidáti (podlaha na obou patrech) se hledají nad celým svazkem najednou.
+    Každá kandidátní buňka dostane náhodné skóre a pro každou dvojici pater se
+    vyberou dvě nejlepší, aby schodiště dolů nemuselo ležet na stejné buňce jako
+    schodiště nahoru z předchozího patra.
+
+    Args:
+        tiles (np.ndarray): Svazek pater tvaru (patra, výška, šířka) s ASCII kódy dlaždic;
+            upravuje se na místě
+        seed (Optional[int]): Seed výběru pozic
+        mark (bool): Zapsat schodiště do mapy ('>' dolů, '<' nahoru)
+
+    Returns:
+        List[Tuple[int, int]]: Pozice (x, y) schodiště z patra i do patra i+1
+    """
+    levels, height, width = tiles.shape
+    if levels < 2 or height * width < 2:
+        return []
+
+    rng = np.random.default_rng(seed)
+    floor = tiles == FLOOR
+    scores = np.where(floor[:-1] & floor[1:], rng.random((levels - 1, height, width)), -1.0)
+    scores = scores.reshape(levels - 1, -1)
+    top_two = np.argpartition(scores, -2, axis=1)[:, -2:]
+    best = np.take_along_axis(scores, top_two, axis=1)
+    order = np.argsort(-best, axis=1)
+    top_two = np.take_along_axis(top_two, order, axis=1)
+    best = np.take_along_axis(best, order, axis=1)
+
+    stairs: List[Tuple[int, int]] = []
+    previous = None
+    for level in range(levels - 1):
+        # Schodiště dolů nesmí ležet na schodišti nahoru z předchozího patra
+        first, second = (int(cell) for cell in top_two[level])
+        if best[level, 0] >= 0 and first != previous:
+            cell = first
+        elif best[level, 1] >= 0:
+            cell = second
+        else:
+            # Patra nemají jinou společnou podlahu - schodiště umístíme na podlahu
+            # horního patra a spodní patro k němu prokopeme
+            candidates = np.flatnonzero(floor[level].ravel())
+            candidates = candidates[candidates != previous]
+            if len(candidates):
+                cell = int(rng.choice(candidates))
+            else:
+                cell = (height // 2) * width + width // 2
+                if cell == previous:
+                    cell = (cell + 1) % (height * width)
+                y, x = divmod(cell, width)
+                _carve_to_floor(tiles[level], x, y)
+                floor[level] = tiles[level] == FLOOR
+            y, x = divmod(cell, width)
+            _carve_to_floor(tiles[level + 1], x, y)
+            floor[level + 1] = tiles[level + 1] == FLOOR
+        stairs.append(divmod(cell, width)[::-1])
+        previous = cell
+
+    if mark:
+        for level, (x, y) in enumerate(stairs):
+            tiles[level, y, x] = STAIRS_DOWN
+            tiles[level + 1, y, x] = STAIRS_UP
+    return stairs
+
+
+def generate_level_stack(choice: str, levels: int, width: int, height: int,
+                         params: Sequence[Any] = (), seed: Optional[int] = None,
+                         max_workers: Optional[int] = None, mark_stairs: bool = True,
+                         time_limit: Optional[float] = None) -> LevelStack:
+    """
+    Paralelně vygeneruje vícepatrový dungeon se zarovnanými schodišti.
+
+    Args:
+        choice (str): Číslo volby v menu nebo klíč algoritmu
+        levels (int): Počet pater
+        width (int): Šířka pater
+        height (int): Výška pater
+        params (Sequence[Any]): Parametry generátoru (stejné pro všechna patra)
+        seed (Optional[int]): Seed celého dungeonu
+        max_workers (Optional[int]): Počet procesů (výchozí je počet jader)
+        mark_stairs (bool): Zapsat schodiště do mapy ('>' dolů, '<' nahoru)
+        time_limit (Optional[float]): Časový limit generování celého svazku v sekundách
+            (nedokončená patra zůstanou rozpracovaná)
+
+    Returns:
+        LevelStack: Svazek pater, pozice schodišť, seedy pater, čas generování
+            a příznaky dokončení pater
+    """
+    entry = registry.get_generator(choice)
+    if entry is None:
+        raise ValueError("Neplatná volba algoritmu")
+
+    start = time.perf_counter()
+    deadline = time.time() + time_limit if time_limit is not None else None
+    seeds = level_seeds(levels, seed)
+    shape = (levels, height, width)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, levels * height * width))
+    try:
+        workers = max(1, min(levels, max_workers or os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_generate_level, shm.name, shape, level, entry.key,
+                                   list(params), level_seed, deadline)
+                       for level, level_seed in enumerate(seeds)]
+            completed = [future.result() for future in futures]
+
+        # Výsledek zkopírujeme ze sdílené paměti, aby ji šlo hned uvolnit
+        tiles = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    stairs = place_stairs(tiles, seeds[0] if seeds else None, mark_stairs)
+    return LevelStack(tiles, stairs, seeds, time.perf_counter() - start, completed)
@@ -0,0 +1,109 @@
+"""
+Memory-Mapped Dungeon Grid
+--------------------------
+
+Tento modul implementuje mřížku dungeonu uloženou v souboru a namapovanou do paměti.
+Generátory, které pracují jen s malou částí mapy najednou (digger, drunkard's walk,
+BSP), do ní mohou zapisovat přímo a v RAM pak drží jen stránky, se kterými
+právě pracují. Díky tomu lze generovat mapy mnohem větší než dostupná paměť.
+
+Základní princip:
+1. Vytvoříme soubor o velikosti width * height bajtů (jeden bajt = jedna dlaždice)
+2. Soubor namapujeme do paměti pomocí numpy.memmap a vyplníme ho zdmi
+3. Mřížka se navenek chová jako List[List[str]] - dungeon[y][x] vrací i nastavuje znak
+4. Operační systém sám načítá a odkládá stránky podle toho, kam generátor sahá
+"""
+
+from typing import Iterator, List, Union
+
+import numpy as np
+
+# Velikost bloku vyplňovaného najednou při inicializaci (omezuje velikost pracovní sady)
+FILL_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+class MemmapRow:
+    """Jeden řádek namapované mřížky s rozhraním seznamu znaků."""
+
+    def __init__(self, row: np.ndarray):
+        self._row = row
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __getitem__(self, x: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(x, slice):
+            return [chr(code) for code in self._row[x].tolist()]
+        return chr(self._row[x])
+
+    def __setitem__(self, x: Union[int, slice], tile: Union[str, List[str]]) -> None:
+        if isinstance(x, slice):
+            self._row[x] = np.frombuffer("".join(tile).encode("ascii"), dtype=np.uint8)
+        else:
+            self._row[x] = ord(tile)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._row.tobytes().decode("ascii"))
+
+
+class MemmapGrid:
+    """
+    Mřížka dungeonu uložená v souboru a namapovaná do paměti.
+    """
+
+    def __init__(self, path: str, width: int, height: int, fill: str = "#", mode: str = "w+"):
+        """
+        Vytvoří (nebo otevře) mřížku v souboru.
+
+        Args:
+            path (str): Cesta k souboru s mřížkou
+            width (int): Šířka mřížky
+            height (int): Výška mřížky
+            fill (str): Dlaždice, kterou se nová mřížka vyplní
+            mode (str): Režim numpy.memmap ("w+" vytvoří nový soubor, "r+" otevře existující)
+        """
+        self.path = path
+        self.width = width
+        self.height = height
+        self._array = np.memmap(path, dtype=np.uint8, mode=mode, shape=(height, width))
+
+        if mode == "w+":
+            # Vyplňujeme po blocích řádků, aby nebyla celá mapa najednou v paměti
+            chunk_rows = max(1, FILL_CHUNK_BYTES // max(1, width))
+            for y in range(0, height, chunk_rows):
+                self._array[y:y + chunk_rows] = ord(fill)
+                self._array.flush()
+
+    @classmethod
+    def open(cls, path: str, width: int, height: int) -> "MemmapGrid":
+        """Otevře existující mřížku pro čtení i zápis."""
+        return cls(path, width, height, mode="r+")
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> MemmapRow:
+        return MemmapRow(self._array[y])
+
+    def __iter__(self) -> Iterator[MemmapRow]:
+        for y in range(self.height):
+            yield MemmapRow(self._array[y])
+
+    @property
+    def array(self) -> np.ndarray:
+        """Přímý přístup k namapovanému poli ASCII kódů dlaždic."""
+        return self._array
+
+    def to_list(self) -> List[List[str]]:
+        """Načte celou mřížku do paměti jako List[List[str]]."""
+        return [list(row) for row in self]
+
+    def flush(self) -> None:
+        """Zapíše změněné stránky na disk."""
+        self._array.flush()
+
+    def close(self) -> None:
+        """Zapíše změny a uvolní mapování souboru."""
+        if self._array is not None:
+            self._array.flush()
+            self._array = None
@@ -0,0 +1,233 @@
+"""
+Dungeon Metrics
+---------------
+
+Tento modul počítá metriky kvality vygenerované mapy, podle kterých lze porovnávat
+algoritmy nebo rozhodnout, zda je mapa použitelná. Všechny metriky se počítají
+nad celou mřížkou najednou pomocí operací s poli numpy, bez smyček přes buňky.
+
+Metriky:
+- floor_ratio: podíl podlahy na celkové ploše mapy
+- regions: počet souvislých oblastí podlahy (4-okolí)
+- dead_ends: počet slepých konců (podlaha s jediným podlahovým sousedem)
+- corridor_room_ratio: poměr buněk chodeb k buňkám místností; buňka patří
+  místnosti, pokud leží v nějakém čtverci 3x3 složeném jen z podlahy
+- largest_open_area: velikost největší souvislé oblasti místností
+- rooms: počet místností (souvislých oblastí buněk místností)
+- connected_ratio: podíl podlahy, který leží v největší souvislé oblasti
+
+Oblasti se značkují po úsecích řádků: souvislé úseky podlahy v řádku jsou uzly,
+svisle sousedící úseky hrany, a komponenty hledáme opakovaným připojováním
+k nejmenšímu sousednímu označení a zkracováním ukazatelů (pointer jumping).
+
+Cena: compute_metrics na mapě 1000x1000 trvá zhruba 50-150 ms (nejvíc stojí
+dvojí značkování oblastí, nejhorší je náhodný šum). Výsledky generování proto
+metriky počítají až při prvním přístupu (registry.GenerationResult.metrics).
+"""
+
+from typing import NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+FLOOR = "."
+
+
+class DungeonMetrics(NamedTuple):
+    """Souhrn metrik jedné mapy."""
+    floor_ratio: float
+    regions: int
+    dead_ends: int
+    corridor_room_ratio: float
+    largest_open_area: int
+    rooms: int
+    connected_ratio: float
+
+
+def floor_mask(dungeon: Union[Sequence[Sequence[str]], np.ndarray], floor: str = FLOOR) -> np.ndarray:
+    """
+    Převede mapu na booleovskou masku podlahy.
+
+    Args:
+        dungeon: Mapa dungeonu (List[List[str]]) nebo již hotová booleovská maska
+        floor (str): Znak podlahy
+
+    Returns:
+        np.ndarray: Pole tvaru (height, width), True tam, kde je podlaha
+    """
+    if isinstance(dungeon, np.ndarray):
+        return dungeon.astype(bool, copy=False)
+    height = len(dungeon)
+    width = len(dungeon[0]) if height else 0
+    cells = "".join(map("".join, dungeon)).encode("ascii")
+    return (np.frombuffer(cells, dtype=np.uint8) == ord(floor)).reshape(height, width)
+
+
+def neighbor_count(mask: np.ndarray) -> np.ndarray:
+    """Spočítá pro každou buňku počet podlahových sousedů ve 4-okolí."""
+    padded = np.pad(mask, 1).astype(np.uint8)
+    return (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:])
+
+
+def _label_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Spojí úseky podlahy v řádcích do souvislých oblastí.
+
+    Args:
+        mask (np.ndarray): Booleovská maska podlahy (alespoň jedna buňka podlahy)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Index úseku pro každou buňku,
+            kořen oblasti pro každý úsek a délky úseků
+    """
+    height, width = mask.shape
+
+    # Úseky podlahy v řádcích - úsek začíná tam, kde vlevo není podlaha,
+    # a končí tam, kde vpravo není podlaha
+    starts = mask.copy()
+    starts[:, 1:] &= ~mask[:, :-1]
+    ends = mask.copy()
+    ends[:, :-1] &= ~mask[:, 1:]
+    run_lengths = np.flatnonzero(ends) - np.flatnonzero(starts) + 1
+    run_id = (np.cumsum(starts.ravel(), dtype=np.int32) - 1).reshape(height, width)
+
+    # Hrany mezi úseky sousedících řádků: v souvislém úseku, kde je podlaha
+    # v obou řádcích, se úsek nahoře ani dole nemění, takže stačí jeho první buňka
+    both = mask[:-1] & mask[1:]
+    first = both.copy()
+    first[:, 1:] &= ~both[:, :-1]
+    cells = np.flatnonzero(first)
+    upper = run_id.ravel()[cells]
+    lower = run_id.ravel()[cells + width]
+
+    parent = np.arange(len(run_lengths))
+    while True:
+        # Hrany, jejichž konce už mají stejný kořen, zůstanou spojené - vynecháme je
+        root_upper, root_lower = parent[upper], parent[lower]
+        pending = root_upper != root_lower
+        if not pending.any():
+            break
+        upper, lower = upper[pending], lower[pending]
+        root_upper, root_lower = root_upper[pending], root_lower[pending]
+
+        # Připojení kořenů k menšímu z obou označení
+        smaller = np.minimum(root_upper, root_lower)
+        np.minimum.at(parent, root_upper, smaller)
+        np.minimum.at(parent, root_lower, smaller)
+
+        # Zkracování ukazatelů, dokud každý úsek neukazuje přímo na kořen
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    return run_id, parent, run_lengths
+
+
+def region_sizes(mask: np.ndarray) -> np.ndarray:
+    """
+    Spočítá velikosti souvislých oblastí podlahy (4-okolí).
+
+    Args:
+        mask (np.ndarray): Booleovská maska podlahy
+
+    Returns:
+        np.ndarray: Počet buněk každé oblasti (pořadí podle první buňky oblasti)
+    """
+    if not mask.any():
+        return np.zeros(0, dtype=np.int64)
+    _, parent, run_lengths = _label_runs(mask)
+    sizes = np.bincount(parent, weights=run_lengths, minlength=len(parent))
+    return sizes[parent == np.arange(len(parent))].astype(np.int64)
+
+
+def label_regions(mask: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Označí souvislé oblasti podlahy (4-okolí).
+
+    Args:
+        mask (np.ndarray): Booleovská maska podlahy
+
+    Returns:
+        Tuple[np.ndarray, int]: Pole označení (0 = zeď, 1..n = oblasti) a počet oblastí n
+    """
+    if not mask.any():
+        return np.zeros(mask.shape, dtype=np.int32), 0
+
+    run_id, parent, _ = _label_runs(mask)
+    roots, compact = np.unique(parent, return_inverse=True)
+    labels = np.zeros(mask.shape, dtype=np.int32)
+    labels[mask] = compact.astype(np.int32)[run_id[mask]] + 1
+    return labels, len(roots)
+
+
+def _erode(mask: np.ndarray) -> np.ndarray:
+    """Eroze čtvercem 3x3 (buňka zůstane, jen pokud je celé okolí podlaha)."""
+    padded = np.pad(mask, 1)
+    rows = padded[:, :-2] & padded[:, 1:-1] & padded[:, 2:]
+    return rows[:-2] & rows[1:-1] & rows[2:]
+
+
+def _dilate(mask: np.ndarray) -> np.ndarray:
+    """Dilatace čtvercem 3x3."""
+    padded = np.pad(mask, 1)
+    rows = padded[:, :-2] | padded[:, 1:-1] | padded[:, 2:]
+    return rows[:-2] | rows[1:-1] | rows[2:]
+
+
+def room_mask(mask: np.ndarray) -> np.ndarray:
+    """Vrátí masku buněk místností (podlaha pokrytá nějakým čtvercem 3x3 podlahy)."""
+    return _dilate(_erode(mask)) & mask
+
+
+def floor_ratio(dungeon: Union[Sequence[Sequence[str]], np.ndarray]) -> float:
+    """Spočítá podíl podlahových dlaždic na celkové ploše mapy."""
+    mask = floor_mask(dungeon)
+    return float(mask.mean()) if mask.size else 0.0
+
+
+def count_regions(dungeon: Union[Sequence[Sequence[str]], np.ndarray]) -> int:
+    """Spočítá souvislé oblasti podlahy (buňky sousedící hranou)."""
+    return len(region_sizes(floor_mask(dungeon)))
+
+
+def count_dead_ends(dungeon: Union[Sequence[Sequence[str]], np.ndarray]) -> int:
+    """Spočítá slepé konce - podlahové buňky s jediným podlahovým sousedem."""
+    mask = floor_mask(dungeon)
+    return int((mask & (neighbor_count(mask) == 1)).sum())
+
+
+def compute_metrics(dungeon: Union[Sequence[Sequence[str]], np.ndarray]) -> DungeonMetrics:
+    """
+    Spočítá všechny metriky mapy najednou.
+
+    Args:
+        dungeon: Mapa dungeonu (List[List[str]]) nebo booleovská maska podlahy
+
+    Returns:
+        DungeonMetrics: Souhrn metrik
+    """
+    mask = floor_mask(dungeon)
+    floor_cells = int(mask.sum())
+    sizes = region_sizes(mask)
+    dead_ends = int((mask & (neighbor_count(mask) == 1)).sum())
+
+    rooms = room_mask(mask)
+    room_cells = int(rooms.sum())
+    corridor_cells = floor_cells - room_cells
+    if room_cells:
+        corridor_room_ratio = corridor_cells / room_cells
+    else:
+        corridor_room_ratio = float("inf") if corridor_cells else 0.0
+
+    room_sizes = region_sizes(rooms)
+
+    return DungeonMetrics(
+        floor_ratio=floor_cells / mask.size if mask.size else 0.0,
+        regions=len(sizes),
+        dead_ends=dead_ends,
+        corridor_room_ratio=corridor_room_ratio,
+        largest_open_area=int(room_sizes.max()) if len(room_sizes) else 0,
+        rooms=len(room_sizes),
+        connected_ratio=int(sizes.max()) / floor_cells if floor_cells else 0.0,
+    )
@@ -18,27 +18,36 @@ což vede k velmi přirozeně vypadajícím dungeonům.
 
 import random
 import math
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 from perlin_noise import PerlinNoise
 
 
-def generate_perlin_dungeon(width: int, height: int, scale: float = 15.0, octaves: int = 4, threshold: float = 0.5) -> List[List[str]]:
+# Změna mapy v jednom kroku: seznam obdélníků (x, y, šířka, výška, dlaždice)
+Delta = List[Tuple[int, int, int, int, str]]
+
+# Nejvyšší počet vzorků šumu v jednom kroku - vzorek stojí desetinu milisekundy
+# na oktávu, takže dlouhé řádky se při vzorkování dělí na více kroků
+SAMPLE_CHUNK = 256
+
+
+def iter_perlin_steps(dungeon: List[List[str]], width: int, height: int, scale: float = 15.0,
+                      octaves: int = 4, threshold: float = 0.5) -> Iterator[Delta]:
     """
-    Generuje dungeon pomocí Perlinova šumu.
+    Generuje dungeon z Perlinova šumu řádek po řádku nad mapou plnou zdí.
 
     Args:
+        dungeon (List[List[str]]): Mapa plná zdí, která se upravuje na místě
         width (int): Šířka dungeonu
         height (int): Výška dungeonu
         scale (float): Měřítko šumu (vyšší hodnota = více přiblížený)
         octaves (int): Počet oktáv šumu (více = více detailů)
         threshold (float): Hodnota, nad kterou jsou dlaždice podlahou (0.0 až 1.0)
 
-    Returns:
-        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    Yields:
+        Delta: Prázdná změna za každý úsek nejvýše SAMPLE_CHUNK buněk řádku prvního
+            průchodu (vzorkování šumu), poté úseky podlahy vytvořené v každém řádku
+            druhého průchodu
     """
-    # Inicializace dungeonu se zdmi
-    dungeon = [['#' for _ in range(width)] for _ in range(height)]
-
     # Vytvoření vrstveného šumu (pro detaily)
     seed = random.randint(0, 1000)
     noises = [PerlinNoise(octaves=i+1, seed=seed) for i in range(octaves)]
@@ -51,33 +60,60 @@ def generate_perlin_dungeon(width: int, height: int, scale: float = 15.0, octave
     sample_values = []
     for y in range(height):
         for x in range(width):
+            if x and x % SAMPLE_CHUNK == 0:
+                yield []
             nx = x / scale
             ny = y / scale
             value = sum(noise([nx, ny]) * (0.5**i) for i, noise in enumerate(noises))
             sample_values.append(value)
             min_val = min(min_val, value)
             max_val = max(max_val, value)
+        yield []
     
     # Výpočet rozsahu pro normalizaci
     value_range = max_val - min_val if max_val > min_val else 1.0
     
-    # Druhý průchod pro generování dungeonu
+    # Druhý průchod pro generování dungeonu (hodnoty šumu už máme spočítané)
     for y in range(height):
+        delta = []
+        run_start = None
         for x in range(width):
-            # Přeskočíme okraje
-            if x == 0 or y == 0 or x == width-1 or y == height-1:
-                dungeon[y][x] = '#'  # Zajistíme, že okraj je zeď
-                continue
-            
-            nx = x / scale
-            ny = y / scale
-            value = sum(noise([nx, ny]) * (0.5**i) for i, noise in enumerate(noises))
-            
-            # Normalizace hodnoty do rozsahu 0.0-1.0
-            normalized = (value - min_val) / value_range
+            # Okraje zůstávají zdí
+            is_floor = False
+            if not (x == 0 or y == 0 or x == width-1 or y == height-1):
+                # Normalizace hodnoty do rozsahu 0.0-1.0
+                normalized = (sample_values[y * width + x] - min_val) / value_range
+                is_floor = normalized > threshold
             
-            if normalized > threshold:
+            if is_floor:
                 dungeon[y][x] = '.'  # Podlaha
+                if run_start is None:
+                    run_start = x
+            elif run_start is not None:
+                delta.append((run_start, y, x - run_start, 1, '.'))
+                run_start = None
+        yield delta
+
+
+def generate_perlin_dungeon(width: int, height: int, scale: float = 15.0, octaves: int = 4, threshold: float = 0.5) -> List[List[str]]:
+    """
+    Generuje dungeon pomocí Perlinova šumu.
+
+    Args:
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        scale (float): Měřítko šumu (vyšší hodnota = více přiblížený)
+        octaves (int): Počet oktáv šumu (více = více detailů)
+        threshold (float): Hodnota, nad kterou jsou dlaždice podlahou (0.0 až 1.0)
+
+    Returns:
+        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    """
+    # Inicializace dungeonu se zdmi
+    dungeon = [['#' for _ in range(width)] for _ in range(height)]
+
+    for _ in iter_perlin_steps(dungeon, width, height, scale, octaves, threshold):
+        pass
     
     return dungeon
 
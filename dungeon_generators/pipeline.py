@@ -0,0 +1,516 @@
+"""
+Generation Pipeline
+-------------------
+
+Tento modul skládá více algoritmů do jednoho dungeonu. Fáze (stages) běží postupně
+nad jedinou sdílenou mřížkou - žádná fáze nevytváří vlastní mapu, kterou by bylo
+nutné se zbytkem slučovat buňku po buňce.
+
+Základní princip:
+1. Pipeline je popsána daty (slovník nebo JSON), takže ji lze uložit, cachovat
+   (DungeonCache) a spouštět v dávkách pro mnoho seedů
+2. Každá fáze pracuje jen v zadané oblasti (obdélník nebo listy BSP z některé
+   předchozí fáze) a volitelně jen v buňkách masky (zdi, podlaha, Perlinův šum)
+3. Generátory z registru běží přes RegionView - pohled na část mřížky se stejným
+   rozhraním dungeon[y][x], který zápisy mimo masku ignoruje
+4. Vyhlazení celulárním automatem a oprava propojení pracují nad poli numpy
+
+Typy fází:
+- klíč algoritmu z registru (bsp, cellular, drunkard, wfc, perlin, digger) -
+  spustí krokový generátor v oblasti; fáze bsp navíc uloží své listy
+- smooth: kroky celulárního automatu nad existující mapou (bez náhodné inicializace)
+- connect: propojí oddělené oblasti podlahy chodbami s největší oblastí
+
+Příklad konfigurace:
+    {
+        "width": 100, "height": 40, "seed": 7,
+        "stages": [
+            {"type": "bsp", "params": {"max_depth": 4}},
+            {"type": "cellular", "region": "leaves", "fraction": 0.5},
+            {"type": "drunkard", "mask": "wall", "params": {"floor_ratio": 0.1}},
+            {"type": "smooth", "mask": {"perlin": {"threshold": 0.6}}},
+            {"type": "connect", "params": {"min_size": 4}}
+        ]
+    }
+"""
+
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if __name__ == "__main__" and not __package__:
+    # Spuštění jako skript (python dungeon_generators/pipeline.py) - balíček
+    # dungeon_generators leží o adresář výš, než je tento soubor
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dungeon_generators import registry
+from dungeon_generators.batch import cellular_automata_step_batch, layered_noise_batch
+from dungeon_generators.metrics import floor_mask, label_regions
+
+# Změna mapy v jednom kroku: seznam obdélníků (x, y, šířka, výška, dlaždice)
+Delta = List[Tuple[int, int, int, int, str]]
+Rect = Tuple[int, int, int, int]
+
+# Fáze, které nejsou generátory z registru, a výchozí hodnoty jejich parametrů
+BUILTIN_STAGES: Dict[str, Dict[str, Any]] = {
+    "smooth": {"iterations": 2, "birth_limit": 4, "death_limit": 3},
+    "connect": {"min_size": 0},
+}
+
+
+class RegionRow:
+    """
+    Pohled na část jednoho řádku mřížky.
+
+    Indexy jsou relativní k levému okraji oblasti; zápisy do buněk mimo masku
+    se tiše ignorují.
+    """
+
+    def __init__(self, row: Any, x: int, width: int, mask_row: Optional[np.ndarray] = None):
+        self._row = row
+        self._x = x
+        self._width = width
+        self._mask_row = mask_row
+
+    def __len__(self) -> int:
+        return self._width
+
+    def _index(self, i: int) -> int:
+        """Převede index (i záporný) na index v rámci oblasti."""
+        if i < 0:
+            i += self._width
+        if not 0 <= i < self._width:
+            raise IndexError("Index mimo oblast")
+        return i
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._width)
+            if step == 1:
+                return list(self._row[self._x + start:self._x + max(start, stop)])
+            return [self._row[self._x + j] for j in range(start, stop, step)]
+        return self._row[self._x + self._index(i)]
+
+    def __setitem__(self, i: Union[int, slice], value: Any) -> None:
+        if isinstance(i, slice):
+            indices = range(*i.indices(self._width))
+            values = list(value)
+            if self._mask_row is None and indices.step == 1 and len(values) == len(indices):
+                # Celý úsek najednou (rychlé i pro mřížky mimo RAM)
+                self._row[self._x + indices.start:self._x + indices.start + len(values)] = values
+                return
+            for j, tile in zip(indices, values):
+                self[j] = tile
+            return
+        i = self._index(i)
+        if self._mask_row is None or self._mask_row[i]:
+            self._row[self._x + i] = value
+
+
+class RegionView:
+    """
+    Pohled na obdélníkovou oblast sdílené mřížky s rozhraním dungeon[y][x].
+
+    Generátory do pohledu zapisují, jako by to byla celá mapa, a změny se
+    promítají přímo do sdílené mřížky.
+    """
+
+    def __init__(self, grid: Any, x: int, y: int, width: int, height: int,
+                 mask: Optional[np.ndarray] = None):
+        """
+        Inicializace pohledu.
+
+        Args:
+            grid: Sdílená mřížka (List[List[str]], MemmapGrid nebo SparseGrid)
+            x (int): Levý okraj oblasti
+            y (int): Horní okraj oblasti
+            width (int): Šířka oblasti
+            height (int): Výška oblasti
+            mask (Optional[np.ndarray]): Booleovská maska tvaru (height, width) buněk,
+                do kterých lze zapisovat (výchozí jsou všechny)
+        """
+        self._grid = grid
+        self._x, self._y = x, y
+        self._width, self._height = width, height
+        self._mask = mask
+
+    def __len__(self) -> int:
+        return self._height
+
+    def __getitem__(self, y: int) -> RegionRow:
+        if y < 0:
+            y += self._height
+        if not 0 <= y < self._height:
+            raise IndexError("Index mimo oblast")
+        mask_row = self._mask[y] if self._mask is not None else None
+        return RegionRow(self._grid[self._y + y], self._x, self._width, mask_row)
+
+    def __iter__(self) -> Iterator[RegionRow]:
+        for y in range(self._height):
+            yield self[y]
+
+
+def _stage_params(stage: Dict[str, Any]) -> List[Any]:
+    """
+    Ověří typ fáze a převede její parametry na seznam v pořadí podle schématu.
+
+    Args:
+        stage (Dict[str, Any]): Popis fáze
+
+    Returns:
+        List[Any]: Parametry fáze (chybějící mají výchozí hodnoty)
+    """
+    kind = stage.get("type")
+    params = stage.get("params", {})
+    if kind in BUILTIN_STAGES:
+        specs = [(name, type(default), default) for name, default in BUILTIN_STAGES[kind].items()]
+    else:
+        entry = registry.get_generator(kind) if isinstance(kind, str) else None
+        if entry is None:
+            raise ValueError(f"Neznámý typ fáze: {kind}")
+        specs = [(param.name, param.type, param.default) for param in entry.params]
+
+    unknown = set(params) - {name for name, _, _ in specs}
+    if unknown:
+        raise ValueError(f"Fáze {kind} nemá parametry: {', '.join(sorted(unknown))}")
+    return [cast(params.get(name, default)) for name, cast, default in specs]
+
+
+def _stage_regions(stage: Dict[str, Any], width: int, height: int,
+                   leaves: List[Rect]) -> List[Rect]:
+    """Vrátí oblasti, ve kterých fáze poběží (ořezané na rozměry mřížky)."""
+    region = stage.get("region")
+    if region is None:
+        rects = [(0, 0, width, height)]
+    elif region == "leaves":
+        rects = list(leaves)
+        fraction = stage.get("fraction", 1.0)
+        if fraction < 1.0 and rects:
+            rects = random.sample(rects, max(1, round(len(rects) * fraction)))
+    elif isinstance(region, (list, tuple)) and len(region) == 4:
+        rects = [tuple(region)]
+    else:
+        raise ValueError(f"Neplatná oblast fáze: {region}")
+
+    clipped = []
+    for x, y, w, h in rects:
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(width, x + w), min(height, y + h)
+        if x0 < x1 and y0 < y1:
+            clipped.append((x0, y0, x1 - x0, y1 - y0))
+    return clipped
+
+
+def _stage_mask(spec: Any, grid: Any, width: int, height: int) -> Optional[np.ndarray]:
+    """
+    Vyhodnotí masku fáze nad celou mřížkou.
+
+    Args:
+        spec: None, "wall", "floor" nebo {"perlin": {"scale", "octaves", "threshold"}}
+        grid: Sdílená mřížka
+        width (int): Šířka mřížky
+        height (int): Výška mřížky
+
+    Returns:
+        Optional[np.ndarray]: Booleovská maska tvaru (height, width), nebo None (bez masky)
+    """
+    if spec is None:
+        return None
+    if spec == "floor":
+        return floor_mask(grid)
+    if spec == "wall":
+        return ~floor_mask(grid)
+    if isinstance(spec, dict) and "perlin" in spec:
+        options = dict(spec["perlin"])
+        threshold = options.pop("threshold", 0.5)
+        return layered_noise_batch(1, width, height, **options)[0] > threshold
+    raise ValueError(f"Neplatná maska fáze: {spec}")
+
+
+def _masked_delta(delta: Delta, x: int, y: int, mask: Optional[np.ndarray]) -> Delta:
+    """
+    Posune změnu z souřadnic oblasti do souřadnic mřížky a ořízne ji maskou.
+
+    Args:
+        delta (Delta): Změna v souřadnicích oblasti
+        x (int): Levý okraj oblasti
+        y (int): Horní okraj oblasti
+        mask (Optional[np.ndarray]): Maska oblasti
+
+    Returns:
+        Delta: Změna v souřadnicích mřížky, obsahující jen skutečně zapsané buňky
+    """
+    if mask is None:
+        return [(x + dx, y + dy, w, h, tile) for dx, dy, w, h, tile in delta]
+
+    result = []
+    height, width = mask.shape
+    for dx, dy, w, h, tile in delta:
+        x0, x1 = max(0, dx), min(width, dx + w)
+        for row in range(max(0, dy), min(height, dy + h)):
+            # Úseky masky v řádku obdélníku
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], mask[row, x0:x1], [0])).astype(np.int8)))
+            for start, stop in zip(edges[::2], edges[1::2]):
+                result.append((x + x0 + int(start), y + row, int(stop - start), 1, tile))
+    return result
+
+
+def _window(grid: Any, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+    """Vrátí masku zdí výřezu mřížky [x0, x1) x [y0, y1)."""
+    return ~floor_mask([grid[y][x0:x1] for y in range(y0, y1)])
+
+
+def _drunkard_floor_ratio(grid: Any, rect: Rect, floor_ratio: float) -> float:
+    """
+    Omezí cíl Drunkard's Walk na počet zdí, které v oblasti ještě jde vykopat.
+
+    Opilec kope, dokud nevykope floor_ratio plochy oblasti. Pokud už oblast
+    obsahuje podlahu z předchozích fází, nemusel by cíl nikdy dosáhnout.
+    """
+    x, y, w, h = rect
+    if w < 3 or h < 3:
+        return floor_ratio
+    walls = int(_window(grid, x + 1, y + 1, x + w - 1, y + h - 1).sum())
+    return min(floor_ratio, walls / (w * h))
+
+
+def _write_cells(grid: Any, x0: int, y0: int, before: np.ndarray, after: np.ndarray) -> Delta:
+    """Zapíše do mřížky buňky, kde se maska zdí změnila, a vrátí změnu."""
+    delta = []
+    for cy, cx in zip(*np.nonzero(before != after)):
+        tile = "#" if after[cy, cx] else "."
+        grid[y0 + cy][x0 + cx] = tile
+        delta.append((x0 + int(cx), y0 + int(cy), 1, 1, tile))
+    return delta
+
+
+def smooth_region(grid: Any, width: int, height: int, rect: Rect,
+                  mask: Optional[np.ndarray] = None, iterations: int = 2,
+                  birth_limit: int = 4, death_limit: int = 3) -> Delta:
+    """
+    Vyhladí oblast mřížky kroky celulárního automatu.
+
+    Sousedé na hranici oblasti se berou ze skutečné mapy, takže vyhlazená oblast
+    plynule navazuje na okolí.
+
+    Args:
+        grid: Sdílená mřížka
+        width (int): Šířka mřížky
+        height (int): Výška mřížky
+        rect (Rect): Oblast (x, y, šířka, výška)
+        mask (Optional[np.ndarray]): Maska oblasti - měnit se smí jen tyto buňky
+        iterations (int): Počet kroků automatu
+        birth_limit (int): Počet sousedů potřebných pro vytvoření zdi
+        death_limit (int): Počet sousedů potřebných pro zachování zdi
+
+    Returns:
+        Delta: Změněné buňky v souřadnicích mřížky
+    """
+    x, y, w, h = rect
+    x0, y0 = max(0, x - 1), max(0, y - 1)
+    x1, y1 = min(width, x + w + 1), min(height, y + h + 1)
+    before = _window(grid, x0, y0, x1, y1)
+
+    editable = np.zeros(before.shape, dtype=bool)
+    editable[y - y0:y - y0 + h, x - x0:x - x0 + w] = True if mask is None else mask
+
+    walls = before
+    for _ in range(iterations):
+        stepped = cellular_automata_step_batch(walls[np.newaxis], birth_limit, death_limit)[0]
+        walls = np.where(editable, stepped, walls)
+    return _write_cells(grid, x0, y0, before, walls)
+
+
+def connect_region(grid: Any, rect: Rect, mask: Optional[np.ndarray] = None,
+                   min_size: int = 0) -> Delta:
+    """
+    Propojí oddělené oblasti podlahy s největší oblastí chodbami tvaru L.
+
+    Args:
+        grid: Sdílená mřížka
+        rect (Rect): Oblast (x, y, šířka, výška)
+        mask (Optional[np.ndarray]): Maska oblasti - kopat se smí jen do těchto buněk
+        min_size (int): Oblasti menší než tato velikost se místo propojení zasypou
+
+    Returns:
+        Delta: Změněné buňky v souřadnicích mřížky
+    """
+    x, y, w, h = rect
+    before = _window(grid, x, y, x + w, y + h)
+    labels, count = label_regions(~before)
+    if count <= 1:
+        return []
+
+    walls = before.copy()
+    editable = np.ones(before.shape, dtype=bool) if mask is None else mask
+    sizes = np.bincount(labels.ravel())[1:]
+    order = np.argsort(-sizes, kind="stable") + 1
+    connected = labels == order[0]
+
+    for label in order[1:]:
+        region = labels == label
+        if connected[region].any():
+            continue  # Už ji propojila chodba jiné oblasti
+        if sizes[label - 1] < min_size:
+            walls[region & editable] = True
+            continue
+
+        # Náhodná buňka oblasti a nejbližší propojená buňka
+        cells = np.argwhere(region)
+        ay, ax = cells[random.randrange(len(cells))]
+        targets = np.argwhere(connected)
+        by, bx = targets[np.argmin(((targets - (ay, ax)) ** 2).sum(axis=1))]
+
+        path = np.zeros(before.shape, dtype=bool)
+        path[ay, min(ax, bx):max(ax, bx) + 1] = True
+        path[min(ay, by):max(ay, by) + 1, bx] = True
+        walls[path & editable] = False
+
+        # Chodba mohla cestou propojit i další oblasti
+        touched = np.unique(labels[path])
+        connected |= np.isin(labels, touched[touched > 0]) | (path & editable)
+
+    return _write_cells(grid, x, y, before, walls)
+
+
+def iter_pipeline_steps(dungeon: Any, width: int, height: int,
+                        stages: Sequence[Dict[str, Any]]) -> Iterator[Delta]:
+    """
+    Spouští fáze pipeline postupně nad jednou sdílenou mřížkou.
+
+    Args:
+        dungeon: Mapa plná zdí, která se upravuje na místě
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        stages (Sequence[Dict[str, Any]]): Popisy fází (type, params, region, fraction, mask)
+
+    Yields:
+        Delta: Změny jednotlivých kroků v souřadnicích celé mapy
+    """
+    # Chyby v konfiguraci hlásíme dřív, než se začne generovat
+    stage_params = [_stage_params(stage) for stage in stages]
+    leaves: List[Rect] = []
+
+    for stage, params in zip(stages, stage_params):
+        kind = stage["type"]
+        full_mask = _stage_mask(stage.get("mask"), dungeon, width, height)
+        rects = _stage_regions(stage, width, height, leaves)
+        if kind == "bsp":
+            leaves = []
+
+        for rect in rects:
+            x, y, w, h = rect
+            mask = full_mask[y:y + h, x:x + w] if full_mask is not None else None
+
+            if kind == "smooth":
+                yield smooth_region(dungeon, width, height, rect, mask, *params)
+            elif kind == "connect":
+                yield connect_region(dungeon, rect, mask, *params)
+            else:
+                # Omezení podílu podlahy platí jen pro tuto oblast - parametry fáze
+                # musí zůstat pro další oblasti nezměněné
+                leaf_params = params
+                if kind == "drunkard":
+                    leaf_params = [_drunkard_floor_ratio(dungeon, rect, params[0]), *params[1:]]
+                view = RegionView(dungeon, x, y, w, h, mask)
+                entry = registry.get_generator(kind)
+                region_leaves: List[Rect] = []
+                extra = {"leaves": region_leaves} if kind == "bsp" else {}
+                for delta in entry.load_steps()(view, w, h, **entry.keywords(leaf_params), **extra):
+                    yield _masked_delta(delta, x, y, mask)
+                leaves.extend((x + lx, y + ly, lw, lh) for lx, ly, lw, lh in region_leaves)
+
+
+def generate_pipeline_dungeon(width: int, height: int, stages: Sequence[Dict[str, Any]],
+                              grid: Optional[Any] = None) -> List[List[str]]:
+    """
+    Vygeneruje dungeon pipeline fází.
+
+    Signatura odpovídá ostatním generátorům, takže ji lze předat i do
+    DungeonCache.get_or_generate("pipeline", generate_pipeline_dungeon, w, h, [stages], seed).
+
+    Args:
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        stages (Sequence[Dict[str, Any]]): Popisy fází
+        grid (optional): Předalokovaná mřížka plná zdí, do které se generuje
+            (např. MemmapGrid nebo SparseGrid). Výchozí je nový seznam seznamů v paměti.
+
+    Returns:
+        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    """
+    dungeon = grid if grid is not None else [["#" for _ in range(width)] for _ in range(height)]
+    for _ in iter_pipeline_steps(dungeon, width, height, stages):
+        pass
+    return dungeon
+
+
+def load_pipeline(path: str) -> Dict[str, Any]:
+    """Načte konfiguraci pipeline ze souboru JSON."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_pipeline(config: Dict[str, Any], seed: Optional[int] = None,
+                 cache: Optional[Any] = None, grid: Optional[Any] = None) -> List[List[str]]:
+    """
+    Spustí pipeline podle konfigurace.
+
+    Args:
+        config (Dict[str, Any]): Konfigurace (width, height, volitelně seed, stages)
+        seed (Optional[int]): Seed, který přebije seed z konfigurace
+        cache (Optional[DungeonCache]): Cache hotových map (použije se jen se seedem)
+        grid (optional): Předalokovaná mřížka plná zdí
+
+    Returns:
+        List[List[str]]: 2D mapa dungeonu
+    """
+    width, height = config["width"], config["height"]
+    stages = config["stages"]
+    seed = seed if seed is not None else config.get("seed")
+
+    if cache is not None and grid is None:
+        return cache.get_or_generate("pipeline", generate_pipeline_dungeon,
+                                     width, height, [stages], seed)
+    if seed is not None:
+        random.seed(seed)
+    return generate_pipeline_dungeon(width, height, stages, grid)
+
+
+def run_pipeline_batch(config: Dict[str, Any], seeds: Sequence[int],
+                       max_workers: Optional[int] = None) -> List[List[List[str]]]:
+    """
+    Spustí stejnou pipeline pro více seedů paralelně v samostatných procesech.
+
+    Args:
+        config (Dict[str, Any]): Konfigurace pipeline
+        seeds (Sequence[int]): Seedy jednotlivých map
+        max_workers (Optional[int]): Počet procesů (výchozí je počet jader)
+
+    Returns:
+        List[List[List[str]]]: Mapy v pořadí seedů
+    """
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run_pipeline, [config] * len(seeds), seeds))
+
+
+if __name__ == "__main__":
+    # Jednoduché testování - BSP místnosti, jeskyně v části listů a propojení
+    example = {
+        "width": 80, "height": 30, "seed": 7,
+        "stages": [
+            {"type": "bsp", "params": {"max_depth": 3}},
+            {"type": "cellular", "region": "leaves", "fraction": 0.5,
+             "params": {"iterations": 4}},
+            {"type": "drunkard", "mask": "wall", "params": {"floor_ratio": 0.05}},
+            {"type": "smooth", "mask": {"perlin": {"threshold": 0.6}}},
+            {"type": "connect", "params": {"min_size": 4}},
+        ],
+    }
+    for row in run_pipeline(example):
+        print("".join(row))
@@ -0,0 +1,112 @@
+"""
+Dungeon Prefetcher
+------------------
+
+Tento modul implementuje přípravu dalšího dungeonu na pozadí. Zatímco si uživatel
+prohlíží aktuální mapu, vlákno na pozadí už generuje další mapu se stejným
+algoritmem a parametry. Při dalším požadavku je pak výsledek k dispozici okamžitě.
+
+Základní princip:
+1. Po vygenerování mapy spustíme vlákno s krokovým generátorem (iter_*_steps)
+2. Vlákno mezi kroky kontroluje příznak zrušení, takže ho lze kdykoli zastavit
+3. Pokud další požadavek odpovídá připravované mapě, předáme ji bez čekání
+   (případně jen počkáme na dokončení rozpracované mapy)
+4. Pokud uživatel zvolí něco jiného, přípravu zrušíme
+5. Příprava má časový limit; mapa, která se v něm nestihne, se zahodí
+"""
+
+import threading
+from typing import Any, List, Optional, Sequence, Tuple
+
+from dungeon_generators.budget import Budget, run_steps
+
+
+class DungeonPrefetcher:
+    """
+    Příprava jednoho dalšího dungeonu ve vlákně na pozadí.
+    """
+
+    def __init__(self, time_limit: Optional[float] = None):
+        """
+        Inicializace přípravy.
+
+        Args:
+            time_limit (Optional[float]): Časový limit přípravy jedné mapy v sekundách
+        """
+        self.time_limit = time_limit
+        self._key: Optional[Tuple[Any, ...]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self._result: Optional[List[List[str]]] = None
+
+    @staticmethod
+    def _make_key(entry, width: int, height: int, params: Sequence[Any]) -> Tuple[Any, ...]:
+        """Vrátí klíč požadavku (algoritmus, rozměry, parametry)."""
+        return (entry.key, width, height, tuple(params))
+
+    def start(self, entry, width: int, height: int, params: Sequence[Any] = ()) -> None:
+        """
+        Zruší případnou rozpracovanou přípravu a začne připravovat další dungeon.
+
+        Args:
+            entry (GeneratorEntry): Položka registru generátorů
+            width (int): Šířka dungeonu
+            height (int): Výška dungeonu
+            params (Sequence[Any]): Parametry generátoru
+        """
+        self.cancel()
+        self._key = self._make_key(entry, width, height, params)
+        self._cancel = threading.Event()
+        self._result = None
+        self._thread = threading.Thread(target=self._run,
+                                        args=(entry, width, height, list(params), self._cancel),
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self, entry, width: int, height: int, params: List[Any],
+             cancel: threading.Event) -> None:
+        """Tělo vlákna - generuje dungeon po krocích, dokud není zrušeno."""
+        dungeon = [["#" for _ in range(width)] for _ in range(height)]
+        budget = Budget(self.time_limit, cancel=cancel).start()
+        try:
+            if not run_steps(entry.load_steps()(dungeon, width, height, **entry.keywords(params)), budget):
+                return
+        except Exception:
+            # Chybu ohlásí až běžné generování v hlavním vlákně
+            return
+        self._result = dungeon
+
+    def take(self, entry, width: int, height: int,
+             params: Sequence[Any] = ()) -> Optional[List[List[str]]]:
+        """
+        Převezme připravený dungeon, pokud odpovídá požadavku.
+
+        Args:
+            entry (GeneratorEntry): Položka registru generátorů
+            width (int): Šířka dungeonu
+            height (int): Výška dungeonu
+            params (Sequence[Any]): Parametry generátoru
+
+        Returns:
+            Optional[List[List[str]]]: Připravený dungeon, nebo None (příprava se zruší)
+        """
+        if self._thread is None or self._key != self._make_key(entry, width, height, params):
+            self.cancel()
+            return None
+
+        # Rozpracovanou mapu dokončíme - je to rychlejší než začínat znovu
+        self._thread.join()
+        result = self._result
+        self._thread = None
+        self._key = None
+        self._result = None
+        return result
+
+    def cancel(self) -> None:
+        """Zruší rozpracovanou přípravu a počká na ukončení vlákna."""
+        if self._thread is not None:
+            self._cancel.set()
+            self._thread.join()
+        self._thread = None
+        self._key = None
+        self._result = None
@@ -0,0 +1,378 @@
+"""
+Generator Registry
+------------------
+
+Tento modul obsahuje jediný registr všech generátorů dungeonů. Každá položka popisuje
+název algoritmu, modul a funkce generátoru, schéma parametrů (typy, výchozí hodnoty,
+popisy) a informační text.
+
+Moduly generátorů se importují až při prvním použití daného algoritmu, takže start
+menu nemusí načítat všechny generátory ani jejich závislosti (např. perlin_noise).
+Přidání nového algoritmu znamená přidat jednu položku do GENERATORS.
+"""
+
+import importlib
+import os
+import random
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+
+class ParamSpec(NamedTuple):
+    """Popis jednoho parametru generátoru."""
+    name: str
+    type: type
+    default: Any
+    description: str
+
+
+class GeneratorEntry:
+    """
+    Položka registru popisující jeden algoritmus generování dungeonů.
+    """
+
+    def __init__(self, key: str, name: str, module: str, function: str, step_function: str,
+                 params: Sequence[ParamSpec], info: str, steps_per_frame: int = 1):
+        """
+        Inicializace položky registru.
+
+        Args:
+            key (str): Krátký identifikátor algoritmu (např. "bsp")
+            name (str): Zobrazovaný název algoritmu
+            module (str): Cesta k modulu generátoru (např. "dungeon_generators.bsp_generator")
+            function (str): Název funkce generate_*_dungeon v modulu
+            step_function (str): Název krokové funkce iter_*_steps v modulu
+            params (Sequence[ParamSpec]): Schéma parametrů generátoru
+            info (str): Informační text o algoritmu
+            steps_per_frame (int): Počet kroků se změnou mapy na snímek při animaci
+        """
+        self.key = key
+        self.name = name
+        self.module = module
+        self.function = function
+        self.step_function = step_function
+        self.params = list(params)
+        self.info = info
+        self.steps_per_frame = steps_per_frame
+
+    @property
+    def source_path(self) -> str:
+        """Cesta ke zdrojovému souboru generátoru (bez importu modulu)."""
+        return os.path.join(*self.module.split(".")) + ".py"
+
+    def load(self) -> Callable[..., List[List[str]]]:
+        """Importuje modul generátoru (jen poprvé) a vrátí funkci generate_*_dungeon."""
+        return getattr(importlib.import_module(self.module), self.function)
+
+    def load_steps(self) -> Callable[..., Iterator[List[tuple]]]:
+        """Importuje modul generátoru (jen poprvé) a vrátí krokovou funkci iter_*_steps."""
+        return getattr(importlib.import_module(self.module), self.step_function)
+
+    def defaults(self) -> List[Any]:
+        """Vrátí výchozí hodnoty všech parametrů."""
+        return [param.default for param in self.params]
+
+    def parse_params(self, text: str) -> List[Any]:
+        """
+        Převede parametry zadané uživatelem (oddělené čárkami) na správné typy.
+
+        Args:
+            text (str): Vstup uživatele, např. "5,0.45"
+
+        Returns:
+            List[Any]: Seznam parametrů v pořadí podle schématu
+        """
+        values = [value.strip() for value in text.split(",")] if text.strip() else []
+        if len(values) > len(self.params):
+            raise ValueError(f"Algoritmus {self.name} má jen {len(self.params)} parametrů")
+        return [param.type(value) for param, value in zip(self.params, values)]
+
+    def keywords(self, params: Sequence[Any]) -> Dict[str, Any]:
+        """
+        Převede parametry v pořadí podle schématu na pojmenované argumenty generátoru.
+
+        Generátory mají za parametry ze schématu ještě další argumenty (grid, leaves),
+        proto se parametry předávají jménem a ne pozicí.
+
+        Args:
+            params (Sequence[Any]): Parametry v pořadí podle schématu (chybějící mají
+                výchozí hodnoty)
+
+        Returns:
+            Dict[str, Any]: Dvojice název parametru -> hodnota
+        """
+        if len(params) > len(self.params):
+            raise ValueError(f"Algoritmus {self.name} má jen {len(self.params)} parametrů")
+        return {param.name: value for param, value in zip(self.params, params)}
+
+
+class GenerationResult:
+    """
+    Výsledek generování: mapa spolu se vstupy, časem generování a metrikami.
+
+    Metriky se počítají až při prvním přístupu, takže nic nestojí, pokud je
+    volající nepotřebuje. Stejný typ vrací i generování s rozpočtem
+    (budget.BudgetResult je jeho podtřída), takže metriky má každý výsledek.
+    """
+
+    def __init__(self, dungeon: List[List[str]], entry: GeneratorEntry, params: Sequence[Any],
+                 seed: Optional[int], elapsed: float):
+        self.dungeon = dungeon
+        self.entry = entry
+        self.params = list(params)
+        self.seed = seed
+        self.elapsed = elapsed
+        self._metrics = None
+
+    @property
+    def metrics(self):
+        """Metriky kvality mapy (DungeonMetrics), spočítané při prvním přístupu."""
+        if self._metrics is None:
+            from dungeon_generators.metrics import compute_metrics
+            self._metrics = compute_metrics(self.dungeon)
+        return self._metrics
+
+
+# Detailní popisy algoritmů
+ALGO_INFO = {
+    "BSP": """Binary Space Partitioning (BSP)
+-----------------------------
+Jak funguje:
+- Rekurzivně dělí prostor na menší části (binární strom)
+- V každé části vytváří místnost s náhodnou velikostí
+- Propojuje sousední místnosti chodbami
+
+Výhody:
+- Vytváří strukturovaný layout místností a chodeb
+- Dobrá kontrola nad velikostí místností
+- Výsledek vždy obsahuje plně propojené místnosti
+
+Nevýhody:
+- Méně organický vzhled, působí uměle
+- Někdy vytváří příliš přímočaré chodby
+  (parametr routed=1 hledá chodby algoritmem A*, které obcházejí místnosti)
+
+Využití:
+- Klasické dungeony v RPG hrách
+- Interiéry budov a sklepení
+- Základní struktura pro komplexnější dungeony""",
+
+    "Cellular Automata": """Cellular Automata
+----------------
+Jak funguje:
+- Začíná s náhodně generovaným šumem
+- Aplikuje pravidla pro "přežití" a "narození" buněk
+- Opakovaným aplikováním pravidel vznikají organické tvary
+
+Výhody:
+- Vytváří přirozeně vypadající jeskyně
+- Jednoduché na implementaci
+- Možnost generovat různé druhy terénu změnou pravidel
+
+Nevýhody:
+- Výsledek může být nepředvídatelný
+- Někdy vytváří izolované oblasti
+- Může vyžadovat dodatečné zpracování pro herní použití
+
+Využití:
+- Přírodní jeskyně
+- Organické struktury
+- Podzemní komplexy""",
+
+    "Drunkard's Walk": """Drunkard's Walk (Náhodná procházka)
+--------------------------------
+Jak funguje:
+- Začíná v náhodném bodě
+- "Opilý" chodec se náhodně pohybuje po mapě
+- Kde projde, tam vytváří volný prostor
+- Pokračuje, dokud není vygenerován požadovaný poměr volného prostoru
+
+Výhody:
+- Velmi jednoduchý na implementaci
+- Vytváří organické nepravidelné chodby
+- Generuje zajímavé průchozí trasy
+
+Nevýhody:
+- Může vytvářet příliš chaotické struktury
+- Často vznikají slepé uličky
+- Není vhodný pro strukturované dungeony
+
+Využití:
+- Bludiště
+- Tunely mezi místnostmi
+- Organické struktury jako doplněk k jiným algoritmům""",
+
+    "Wave Function Collapse": """Wave Function Collapse (WFC)
+------------------------
+Jak funguje:
+- Inspirováno kvantovou mechanikou
+- Používá předem definované vzory nebo pravidla
+- Iterativně kolapsuje možnosti každé buňky podle okolí
+- Vytváří koherentní vzory respektující lokální omezení
+
+Výhody:
+- Generuje vysoce strukturované výsledky
+- Může vytvářet velmi specifické typy dungeonů
+- Dobře funguje se šablonami a vzory
+
+Nevýhody:
+- Složitější na implementaci
+- Může uvíznout v neřešitelných konfiguracích
+- Vyžaduje dobře definované vzory nebo pravidla
+
+Využití:
+- Komplexní strukturované dungeony
+- Kombinace různých biómů nebo architektonických stylů
+- Procedurální generování s konzistentními vzory""",
+
+    "Perlin Noise": """Perlin Noise
+-----------
+Jak funguje:
+- Generuje souvislý šum s kontrolovatelnou úrovní detailů
+- Využívá matematické funkce pro vytvoření hladkých přechodů
+- Kombinuje více vrstev šumu pro různé úrovně detailů (oktávy)
+
+Výhody:
+- Přirozené a plynulé přechody
+- Dobře se škáluje pro různé velikosti map
+- Vhodný pro generování terénu a krajin
+
+Nevýhody:
+- Není ideální pro strukturované dungeony
+- Vyžaduje dodatečné zpracování pro vytvoření chodeb
+- Může být výpočetně náročnější
+
+Využití:
+- Krajiny a venkovní prostředí
+- Jeskynní systémy
+- Podzemní labyrinty s přirozenými prvky""",
+
+    "Digger Tunnels": """Digger Tunnels
+----------
+Jak funguje:
+- Začíná s centrální místností
+- Vytváří několik "kopáčů", kteří se náhodně pohybují
+- Každý kopáč postupně vytváří chodby a občas místnosti
+- Výsledkem je síť propojených tunelů
+
+Výhody:
+- Vytváří strukturované tunely s občasnými místnostmi
+- Vždy začíná s přístupnou centrální místností
+- Tunely jsou přirozeně propojené
+
+Nevýhody:
+- Může vytvářet příliš klikaté chodby
+- Méně kontroly nad umístěním místností
+- Občas může vznikat příliš hustá síť chodeb
+
+Využití:
+- Důlní komplexy
+- Jeskynní systémy
+- Systémy podzemních tunelů"""
+}
+
+
+GENERATORS: List[GeneratorEntry] = [
+    GeneratorEntry(
+        "bsp", "BSP", "dungeon_generators.bsp_generator",
+        "generate_bsp_dungeon", "iter_bsp_steps",
+        [ParamSpec("max_depth", int, 5, "Maximální hloubka dělení"),
+         ParamSpec("routed", int, 0, "Chodby hledané A* (0 = rovné, 1 = obcházejí místnosti)")],
+        ALGO_INFO["BSP"]),
+    GeneratorEntry(
+        "cellular", "Cellular Automata", "dungeon_generators.cellular_automata",
+        "generate_cellular_automata_dungeon", "iter_cellular_automata_steps",
+        [ParamSpec("iterations", int, 5, "Počet iterací"),
+         ParamSpec("wall_prob", float, 0.45, "Pravděpodobnost zdi")],
+        ALGO_INFO["Cellular Automata"]),
+    GeneratorEntry(
+        "drunkard", "Drunkard's Walk", "dungeon_generators.drunkards_walk",
+        "generate_drunkards_dungeon", "iter_drunkards_steps",
+        [ParamSpec("floor_ratio", float, 0.35, "Poměr podlahy k celkové ploše")],
+        ALGO_INFO["Drunkard's Walk"], steps_per_frame=10),
+    GeneratorEntry(
+        "wfc", "Wave Function Collapse", "dungeon_generators.wave_function_collapse",
+        "generate_wfc_dungeon", "iter_wfc_steps",
+        [ParamSpec("room_attempts", int, 15, "Počet pokusů o místnost"),
+         ParamSpec("room_min_size", int, 5, "Minimální velikost místnosti"),
+         ParamSpec("room_max_size", int, 10, "Maximální velikost místnosti"),
+         ParamSpec("routed", int, 0, "Chodby hledané A* (0 = rovné, 1 = obcházejí místnosti)")],
+        ALGO_INFO["Wave Function Collapse"]),
+    GeneratorEntry(
+        "perlin", "Perlin Noise", "dungeon_generators.perlin_generator",
+        "generate_perlin_dungeon", "iter_perlin_steps",
+        [ParamSpec("scale", float, 15.0, "Měřítko šumu"),
+         ParamSpec("octaves", int, 4, "Počet oktáv"),
+         ParamSpec("threshold", float, 0.5, "Práh pro generování zdí")],
+        ALGO_INFO["Perlin Noise"]),
+    GeneratorEntry(
+        "digger", "Digger Tunnels", "dungeon_generators.digger_generator",
+        "generate_digger_dungeon", "iter_digger_steps",
+        [ParamSpec("num_diggers", int, 3, "Počet kopáčů"),
+         ParamSpec("dig_length", int, 100, "Délka kopání")],
+        ALGO_INFO["Digger Tunnels"], steps_per_frame=3),
+]
+
+
+def get_generator(choice: str) -> Optional[GeneratorEntry]:
+    """
+    Najde položku registru podle čísla v menu ("1", "2", ...) nebo podle klíče ("bsp", ...).
+
+    Args:
+        choice (str): Číslo volby v menu nebo klíč algoritmu
+
+    Returns:
+        Optional[GeneratorEntry]: Položka registru, nebo None pokud neexistuje
+    """
+    if choice.isdigit() and 1 <= int(choice) <= len(GENERATORS):
+        return GENERATORS[int(choice) - 1]
+    for entry in GENERATORS:
+        if entry.key == choice:
+            return entry
+    return None
+
+
+def generate(choice: str, width: int, height: int, params: Sequence[Any] = (),
+             seed: Optional[int] = None) -> List[List[str]]:
+    """
+    Vygeneruje dungeon algoritmem z registru.
+
+    Args:
+        choice (str): Číslo volby v menu nebo klíč algoritmu
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        params (Sequence[Any]): Parametry generátoru (chybějící mají výchozí hodnoty)
+        seed (Optional[int]): Seed generátoru náhodných čísel
+
+    Returns:
+        List[List[str]]: 2D mapa dungeonu
+    """
+    entry = get_generator(choice)
+    if entry is None:
+        raise ValueError("Neplatná volba algoritmu")
+    if seed is not None:
+        random.seed(seed)
+    return entry.load()(width, height, **entry.keywords(params))
+
+
+def generate_result(choice: str, width: int, height: int, params: Sequence[Any] = (),
+                    seed: Optional[int] = None) -> GenerationResult:
+    """
+    Vygeneruje dungeon algoritmem z registru a vrátí ho i s časem a metrikami.
+
+    Args:
+        choice (str): Číslo volby v menu nebo klíč algoritmu
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        params (Sequence[Any]): Parametry generátoru
+        seed (Optional[int]): Seed generátoru náhodných čísel
+
+    Returns:
+        GenerationResult: Mapa, vstupy, čas generování a metriky
+    """
+    entry = get_generator(choice)
+    if entry is None:
+        raise ValueError("Neplatná volba algoritmu")
+    start = time.perf_counter()
+    dungeon = generate(entry.key, width, height, params, seed)
+    return GenerationResult(dungeon, entry, params, seed, time.perf_counter() - start)
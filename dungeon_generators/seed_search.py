@@ -0,0 +1,234 @@
+"""
+Seed Search
+-----------
+
+Tento modul hledá seedy, pro které generátor vytvoří mapu splňující zadaná omezení
+(např. "alespoň 95 % podlahy je propojeno, podlaha 35-45 %, alespoň 8 místností").
+
+Základní princip:
+1. Kandidátní seedy rozdělíme do dávek a rozešleme je do fronty procesů
+2. Každý proces generuje mapu po krocích (iter_*_steps) a průběžně kontroluje,
+   zda už mapa omezení zjevně nesplní - takový běh předčasně ukončí
+   - celulární automat: po druhé iteraci se podíl podlahy už výrazně nemění
+   - algoritmy, které jen kopou: podlahy nikdy neubývá, takže překročení
+     maximálního podílu podlahy je definitivní
+3. Hotové mapy vyhodnotíme metrikami a porovnáme s omezeními
+4. Jakmile najdeme požadovaný počet vyhovujících seedů, seedy nad posledním z nich
+   už nepotřebujeme: sdílená hranice (multiprocessing.Value) je zastaví i uprostřed
+   rozpracované dávky a dávky, které ještě nezačaly, se zruší
+5. Na dávky s menšími seedy se počká - výsledkem je vždy prvních count
+   vyhovujících seedů z rozsahu, nezávisle na pořadí dokončení dávek
+"""
+
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import Value
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from dungeon_generators import registry
+from dungeon_generators.budget import Budget
+from dungeon_generators.cellular_automata import band_rows
+from dungeon_generators.metrics import DungeonMetrics, compute_metrics, floor_mask
+
+# Algoritmy, u kterých podlahy během generování nikdy neubývá
+CARVING_ONLY = {"bsp", "drunkard", "wfc", "digger"}
+
+# Fáze celulárního automatu, po které kontrolujeme podíl podlahy (fáze 0 je
+# náhodná inicializace, fáze 1 a 2 první dvě iterace; u velkých map má každá
+# fáze jeden krok na pás řádků)
+CA_CHECK_STEP = 2
+CA_FLOOR_TOLERANCE = 0.05
+
+# První kontrola algoritmů, které jen kopou; další kontroly po zdvojnásobení počtu kroků
+FIRST_CARVING_CHECK = 256
+
+SEEDS_PER_TASK = 4
+
+# Hranice sdílená s procesy hledání: seedy od této hodnoty výš už nejsou potřeba
+_stop_seed: Optional[Any] = None
+
+
+class Constraints(NamedTuple):
+    """Omezení, která musí vygenerovaná mapa splnit."""
+    min_floor_ratio: float = 0.0
+    max_floor_ratio: float = 1.0
+    min_connected: float = 0.0
+    min_rooms: int = 0
+    max_regions: Optional[int] = None
+
+    def is_satisfied(self, metrics: DungeonMetrics) -> bool:
+        """Zjistí, zda metriky hotové mapy splňují všechna omezení."""
+        return (self.min_floor_ratio <= metrics.floor_ratio <= self.max_floor_ratio
+                and metrics.connected_ratio >= self.min_connected
+                and metrics.rooms >= self.min_rooms
+                and (self.max_regions is None or metrics.regions <= self.max_regions))
+
+
+class SeedSearchResult(NamedTuple):
+    """Výsledek hledání seedů."""
+    seeds: List[int]
+    tested: int
+    aborted: int
+    elapsed: float
+
+    @property
+    def seeds_per_second(self) -> float:
+        """Počet otestovaných seedů za sekundu."""
+        return self.tested / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _should_abort(key: str, dungeon: List[List[str]], step: int,
+                  constraints: Constraints) -> bool:
+    """Rozhodne, zda rozpracovaná mapa už zjevně nemůže omezení splnit."""
+    if key == "cellular":
+        bands = -(-len(dungeon) // band_rows(len(dungeon[0])))
+        if step != (CA_CHECK_STEP + 1) * bands - 1:
+            return False
+        ratio = float(floor_mask(dungeon).mean())
+        return not (constraints.min_floor_ratio - CA_FLOOR_TOLERANCE <= ratio
+                    <= constraints.max_floor_ratio + CA_FLOOR_TOLERANCE)
+
+    if key in CARVING_ONLY and constraints.max_floor_ratio < 1.0:
+        # Kontrolujeme v exponenciálně vzdálených krocích, aby počítání podlahy
+        # nepřevážilo samotné generování
+        if step < FIRST_CARVING_CHECK or step & (step - 1):
+            return False
+        return float(floor_mask(dungeon).mean()) > constraints.max_floor_ratio
+
+    return False
+
+
+def check_seed(key: str, width: int, height: int, params: Sequence[Any], seed: int,
+              constraints: Constraints, cancel: Optional[Any] = None) -> Optional[Tuple[bool, bool]]:
+    """
+    Vygeneruje mapu pro jeden seed a ověří omezení.
+
+    Args:
+        key (str): Klíč algoritmu v registru
+        width (int): Šířka mapy
+        height (int): Výška mapy
+        params (Sequence[Any]): Parametry generátoru
+        seed (int): Testovaný seed
+        constraints (Constraints): Omezení
+        cancel (optional): Příznak zrušení s metodou is_set() (viz budget.Budget)
+
+    Returns:
+        Optional[Tuple[bool, bool]]: (mapa vyhovuje, generování bylo předčasně ukončeno),
+            nebo None, pokud bylo hledání zrušeno
+    """
+    entry = registry.get_generator(key)
+    budget = Budget(cancel=cancel).start()
+    random.seed(seed)
+    dungeon = [["#" for _ in range(width)] for _ in range(height)]
+    for step, _ in enumerate(entry.load_steps()(dungeon, width, height, **entry.keywords(params))):
+        if not budget.spend():
+            return None
+        if _should_abort(entry.key, dungeon, step, constraints):
+            return False, True
+    return constraints.is_satisfied(compute_metrics(dungeon)), False
+
+
+class _SeedNotNeeded:
+    """Příznak zrušení pro jeden seed - nastaví se, když hranice klesne na seed nebo pod něj."""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+
+    def is_set(self) -> bool:
+        return _stop_seed is not None and self.seed >= _stop_seed.value
+
+
+def _init_worker(stop_seed: Any) -> None:
+    """Předá procesu hledání sdílenou hranici seedů."""
+    global _stop_seed
+    _stop_seed = stop_seed
+
+
+def _check_seeds(key: str, width: int, height: int, params: Sequence[Any],
+                seeds: Sequence[int], constraints: Constraints) -> List[Tuple[int, bool, bool]]:
+    """Otestuje dávku seedů (spouští se v procesu na pozadí); nepotřebné seedy vynechá."""
+    results = []
+    for seed in seeds:
+        cancel = _SeedNotNeeded(seed)
+        if cancel.is_set():
+            break
+        result = check_seed(key, width, height, params, seed, constraints, cancel)
+        if result is None:
+            break
+        results.append((seed,) + result)
+    return results
+
+
+def search_seeds(key: str, width: int, height: int, constraints: Constraints,
+                 count: int = 1, params: Sequence[Any] = (), start_seed: int = 0,
+                 max_seeds: int = 10000, max_workers: Optional[int] = None) -> SeedSearchResult:
+    """
+    Paralelně hledá seedy, pro které mapa splňuje omezení.
+
+    Args:
+        key (str): Klíč nebo číslo algoritmu v registru
+        width (int): Šířka mapy
+        height (int): Výška mapy
+        constraints (Constraints): Omezení, která musí mapa splnit
+        count (int): Počet hledaných vyhovujících seedů
+        params (Sequence[Any]): Parametry generátoru
+        start_seed (int): První testovaný seed
+        max_seeds (int): Maximální počet testovaných seedů
+        max_workers (Optional[int]): Počet procesů (výchozí je počet jader)
+
+    Returns:
+        SeedSearchResult: Nalezené seedy (vzestupně) a statistiky hledání
+    """
+    entry = registry.get_generator(key)
+    if entry is None:
+        raise ValueError("Neplatná volba algoritmu")
+
+    start = time.perf_counter()
+    found: List[int] = []
+    tested = 0
+    aborted = 0
+    next_seed = start_seed
+    end_seed = start_seed + max_seeds
+
+    # Seedy od hranice výš nejsou potřeba; hranice klesá, jakmile je nalezeno
+    # count seedů, na seed za posledním z nich
+    stop_seed = Value("q", end_seed if count > 0 else start_seed, lock=False)
+    workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(stop_seed,))
+    try:
+        in_flight_limit = workers * 2
+        pending: Dict[Future, int] = {}
+        while True:
+            # Udržujeme frontu plnou, dokud mohou být potřeba další seedy
+            while len(pending) < in_flight_limit and next_seed < stop_seed.value:
+                seeds = list(range(next_seed, min(next_seed + SEEDS_PER_TASK, end_seed)))
+                next_seed += len(seeds)
+                future = pool.submit(_check_seeds, entry.key, width, height, list(params),
+                                     seeds, constraints)
+                pending[future] = seeds[0]
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                for seed, satisfied, was_aborted in future.result():
+                    tested += 1
+                    aborted += was_aborted
+                    if satisfied:
+                        found.append(seed)
+
+            if count > 0 and len(found) >= count:
+                found = sorted(found)[:count]
+                stop_seed.value = found[-1] + 1
+                # Dávky, které ještě nezačaly a obsahují jen nepotřebné seedy, zrušíme
+                for future, first_seed in list(pending.items()):
+                    if first_seed >= stop_seed.value and future.cancel():
+                        del pending[future]
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return SeedSearchResult(sorted(found)[:count], tested, aborted, time.perf_counter() - start)
@@ -0,0 +1,400 @@
+"""
+Dungeon Server
+--------------
+
+Tento modul implementuje malý lokální server, který generuje dungeony pro více
+klientů (např. herních serverů) najednou. Klienti tak nemusí importovat generátory
+a soupeřit o procesor - generování běží v jedné omezené frontě procesů.
+
+Základní princip:
+1. Server (asyncio) poslouchá na unixovém socketu nebo na TCP portu
+2. Požadavek je jeden řádek JSON: {"algorithm", "width", "height", "params", "seed"}
+   nebo {"stats": true} pro statistiky
+3. Generování běží v ProcessPoolExecutor s omezeným počtem procesů; počet
+   rozpracovaných výpočtů je omezený a při přetížení server požadavek odmítne
+4. Stejné požadavky se seedem, které dorazí během rozpracovaného výpočtu, se
+   připojí k tomuto výpočtu místo spuštění nového
+5. Každý výpočet má rozpočet (budget) s časovým limitem; mapa, která nedoběhne,
+   se vrátí rozpracovaná a hlavička to uvádí (completed, reason)
+6. Když se odpojí všichni klienti čekající na výpočet, výpočet se zruší (ještě
+   nespuštěný se vůbec nespustí, běžící skončí po nejbližším kroku)
+7. Odpověď je řádek JSON s hlavičkou ({"ok", "size", ...}) následovaný mapou
+   v binárním formátu (dungeon_format), posílanou po blocích
+
+Na jednom spojení může klient poslat libovolný počet požadavků za sebou.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from dungeon_generators import registry
+from dungeon_generators.budget import Budget, generate_within_budget
+from dungeon_generators.dungeon_cache import dungeon_key
+from dungeon_generators.dungeon_format import dumps, loads
+
+# Velikost bloku při odesílání mapy
+CHUNK_SIZE = 64 * 1024
+
+# Výchozí maximální počet rozpracovaných výpočtů (ve frontě i v procesech)
+DEFAULT_MAX_PENDING = 64
+
+# Výchozí největší povolená mapa v buňkách (jeden požadavek nesmí zahltit paměť procesu)
+DEFAULT_MAX_CELLS = 2000 * 2000
+
+# Výchozí časový limit jednoho výpočtu v sekundách
+DEFAULT_TIME_LIMIT = 10.0
+
+# Jak často (v sekundách) se při čekání na výpočet kontroluje, zda je klient připojen
+DISCONNECT_POLL = 0.1
+
+# Počet posledních požadavků, ze kterých se počítá latence
+LATENCY_WINDOW = 1000
+
+
+def _generate_encoded(key: str, width: int, height: int, params: List[Any],
+                      seed: Optional[int], time_limit: Optional[float],
+                      cancel: Any) -> Tuple[bytes, bool, Optional[str]]:
+    """Vygeneruje a zakóduje dungeon v mezích rozpočtu (spouští se v procesu na pozadí)."""
+    if seed is None:
+        # Proces mohl předtím obsloužit požadavek se seedem - bez nového seedu
+        # ze systémové entropie by další mapy "bez seedu" byly předvídatelné
+        random.seed()
+    result = generate_within_budget(key, width, height, params, seed,
+                                    Budget(time_limit, cancel=cancel))
+    return dumps(result.dungeon, key, params, seed), result.completed, result.reason
+
+
+class GeneratedDungeon(NamedTuple):
+    """Výsledek požadavku na server."""
+    data: bytes
+    completed: bool
+    reason: Optional[str]
+    coalesced: bool
+
+
+class _Computation:
+    """Rozpracovaný výpočet - future, příznak zrušení a počet čekajících klientů."""
+
+    def __init__(self, future: asyncio.Future, cancel: Any):
+        self.future = future
+        self.cancel = cancel
+        self.waiters = 0
+
+
+class ServerOverloaded(RuntimeError):
+    """Požadavek odmítnutý kvůli přetížení serveru (počítá se jen mezi odmítnuté)."""
+
+
+class ServerStats:
+    """Statistiky serveru - počty požadavků, hloubka fronty a latence."""
+
+    def __init__(self):
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.errors = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self._latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def record_latency(self, seconds: float) -> None:
+        """Zaznamená dobu vyřízení jednoho požadavku."""
+        self._latencies.append(seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Vrátí statistiky jako slovník (latence v milisekundách)."""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        return {
+            "requests": self.requests,
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "latency_mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+        }
+
+
+class DungeonServer:
+    """
+    Asyncio server generující dungeony ve sdílené frontě procesů.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 max_pending: int = DEFAULT_MAX_PENDING, max_cells: int = DEFAULT_MAX_CELLS,
+                 time_limit: Optional[float] = DEFAULT_TIME_LIMIT):
+        """
+        Inicializace serveru.
+
+        Args:
+            max_workers (Optional[int]): Počet procesů generátorů (výchozí je počet jader)
+            max_pending (int): Maximální počet rozpracovaných výpočtů
+            max_cells (int): Největší povolená mapa (šířka * výška)
+            time_limit (Optional[float]): Časový limit jednoho výpočtu v sekundách
+        """
+        self.max_pending = max_pending
+        self.max_cells = max_cells
+        self.time_limit = time_limit
+        self.stats = ServerStats()
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        # Příznaky zrušení musí být sdílené s procesy generátorů
+        self._manager = Manager()
+        self._in_flight: Dict[str, _Computation] = {}
+        self._active: Set[_Computation] = set()
+
+    def _parse_request(self, request: Dict[str, Any]) -> Tuple[str, int, int, List[Any], Optional[int]]:
+        """Ověří požadavek a doplní výchozí parametry generátoru."""
+        if not isinstance(request, dict):
+            raise ValueError("Požadavek musí být objekt JSON")
+        entry = registry.get_generator(str(request.get("algorithm", "")))
+        if entry is None:
+            raise ValueError("Neplatná volba algoritmu")
+        try:
+            width, height = int(request["width"]), int(request["height"])
+        except KeyError as e:
+            raise ValueError(f"Požadavek neobsahuje pole {e.args[0]}") from e
+        if width < 3 or height < 3:
+            raise ValueError("Mapa musí mít alespoň 3x3 buňky")
+        if width * height > self.max_cells:
+            raise ValueError(f"Mapa {width}x{height} je větší než povolených {self.max_cells} buněk")
+
+        params = list(request.get("params", []))
+        if len(params) > len(entry.params):
+            raise ValueError(f"Algoritmus {entry.name} má jen {len(entry.params)} parametrů")
+        params = [spec.type(value) for spec, value in zip(entry.params, params)]
+        params += entry.defaults()[len(params):]
+
+        seed = request.get("seed")
+        return entry.key, width, height, params, None if seed is None else int(seed)
+
+    async def generate(self, request: Dict[str, Any],
+                       connected: Optional[Callable[[], bool]] = None) -> GeneratedDungeon:
+        """
+        Vygeneruje dungeon podle požadavku, případně se připojí ke stejnému výpočtu.
+
+        Args:
+            request (Dict[str, Any]): Požadavek (algorithm, width, height, params, seed)
+            connected (optional): Funkce vracející False, jakmile se klient odpojí
+
+        Returns:
+            GeneratedDungeon: Zakódovaná mapa, příznak dokončení, důvod přerušení
+                a příznak, zda šlo o sloučený požadavek
+
+        Raises:
+            ConnectionError: Klient se odpojil dřív, než výpočet skončil
+        """
+        key, width, height, params, seed = self._parse_request(request)
+
+        # Bez seedu je každý výsledek jiný, takže takové požadavky neslučujeme
+        request_key = dungeon_key(key, width, height, params, seed) if seed is not None else None
+        computation = self._in_flight.get(request_key) if request_key is not None else None
+        coalesced = computation is not None
+        if coalesced:
+            self.stats.coalesced += 1
+        else:
+            if self.stats.queue_depth >= self.max_pending:
+                self.stats.rejected += 1
+                raise ServerOverloaded("Server je přetížen, zkuste to později")
+            computation = self._start(request_key, key, width, height, params, seed)
+
+        computation.waiters += 1
+        try:
+            while not computation.future.done():
+                if connected is not None and not connected():
+                    raise ConnectionError("Klient se odpojil")
+                await asyncio.wait({computation.future}, timeout=DISCONNECT_POLL)
+            data, completed, reason = computation.future.result()
+        finally:
+            self._release(request_key, computation)
+        return GeneratedDungeon(data, completed, reason, coalesced)
+
+    def _start(self, request_key: Optional[str], key: str, width: int, height: int,
+               params: List[Any], seed: Optional[int]) -> _Computation:
+        """Spustí nový výpočet v procesu na pozadí a zapíše ho mezi rozpracované."""
+        cancel = self._manager.Event()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._pool, _generate_encoded, key, width, height, params, seed,
+            self.time_limit, cancel)
+        computation = _Computation(future, cancel)
+        if request_key is not None:
+            self._in_flight[request_key] = computation
+        self._active.add(computation)
+        self.stats.queue_depth += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self.stats.queue_depth)
+
+        def finished(done: asyncio.Future) -> None:
+            self.stats.queue_depth -= 1
+            self._active.discard(computation)
+            if self._in_flight.get(request_key) is computation:
+                del self._in_flight[request_key]
+            if not done.cancelled() and done.exception() is None:
+                self.stats.computed += 1
+
+        future.add_done_callback(finished)
+        return computation
+
+    def _release(self, request_key: Optional[str], computation: _Computation) -> None:
+        """Odhlásí čekajícího klienta; bez čekajících se výpočet zruší."""
+        computation.waiters -= 1
+        if computation.waiters or computation.future.done():
+            return
+        # Nový stejný požadavek už se k rušenému výpočtu nesmí připojit
+        if self._in_flight.get(request_key) is computation:
+            del self._in_flight[request_key]
+        computation.future.cancel()
+        computation.cancel.set()
+
+    async def _send(self, writer: asyncio.StreamWriter, header: Dict[str, Any],
+                    payload: bytes = b"") -> None:
+        """Pošle hlavičku a data po blocích (s čekáním na vyprázdnění bufferu)."""
+        writer.write(json.dumps(header).encode("utf-8") + b"\n")
+        for offset in range(0, len(payload), CHUNK_SIZE):
+            writer.write(payload[offset:offset + CHUNK_SIZE])
+            await writer.drain()
+        await writer.drain()
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Obslouží jedno spojení - požadavky se zpracovávají jeden po druhém."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                try:
+                    request = json.loads(line)
+                    if isinstance(request, dict) and request.get("stats"):
+                        await self._send(writer, {"ok": True, "size": 0,
+                                                  "stats": self.stats.as_dict()})
+                        continue
+                    self.stats.requests += 1
+                    result = await self.generate(
+                        request, lambda: not reader.at_eof() and not writer.is_closing())
+                except ServerOverloaded as e:
+                    await self._send(writer, {"ok": False, "error": str(e)})
+                    continue
+                except ConnectionError:
+                    raise
+                except Exception as e:
+                    self.stats.errors += 1
+                    await self._send(writer, {"ok": False, "error": str(e)})
+                    continue
+
+                elapsed = time.perf_counter() - start
+                self.stats.record_latency(elapsed)
+                await self._send(writer, {"ok": True, "size": len(result.data),
+                                          "completed": result.completed, "reason": result.reason,
+                                          "coalesced": result.coalesced, "elapsed": elapsed},
+                                 result.data)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path: Optional[str] = None, host: str = "127.0.0.1",
+                    port: int = 8765) -> None:
+        """
+        Spustí server a obsluhuje klienty, dokud není ukončen.
+
+        Args:
+            socket_path (Optional[str]): Cesta k unixovému socketu (jinak se použije TCP)
+            host (str): Adresa pro TCP
+            port (int): Port pro TCP
+        """
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_client, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        """Zruší rozpracované výpočty a ukončí procesy generátorů."""
+        for computation in list(self._active):
+            computation.cancel.set()
+        self._pool.shutdown(cancel_futures=True)
+        self._manager.shutdown()
+
+
+async def _open(socket_path: Optional[str], host: str, port: int):
+    """Otevře spojení se serverem."""
+    if socket_path:
+        return await asyncio.open_unix_connection(socket_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def request_async(request: Dict[str, Any], socket_path: Optional[str] = None,
+                        host: str = "127.0.0.1", port: int = 8765) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Pošle jeden požadavek serveru a přečte odpověď.
+
+    Args:
+        request (Dict[str, Any]): Požadavek
+        socket_path (Optional[str]): Cesta k unixovému socketu (jinak TCP)
+        host (str): Adresa serveru pro TCP
+        port (int): Port serveru pro TCP
+
+    Returns:
+        Tuple[Dict[str, Any], bytes]: Hlavička odpovědi a data
+    """
+    reader, writer = await _open(socket_path, host, port)
+    try:
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+        header = json.loads(await reader.readline())
+        data = await reader.readexactly(header.get("size", 0))
+        return header, data
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def fetch_dungeon(algorithm: str, width: int, height: int, params: Sequence[Any] = (),
+                  seed: Optional[int] = None, socket_path: Optional[str] = None,
+                  host: str = "127.0.0.1", port: int = 8765) -> List[List[str]]:
+    """
+    Klient: vyžádá si dungeon od serveru a dekóduje ho.
+
+    Args:
+        algorithm (str): Číslo nebo klíč algoritmu
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        params (Sequence[Any]): Parametry generátoru
+        seed (Optional[int]): Seed generátoru
+        socket_path (Optional[str]): Cesta k unixovému socketu (jinak TCP)
+        host (str): Adresa serveru pro TCP
+        port (int): Port serveru pro TCP
+
+    Returns:
+        List[List[str]]: 2D mapa dungeonu
+    """
+    request = {"algorithm": algorithm, "width": width, "height": height,
+               "params": list(params), "seed": seed}
+    header, data = asyncio.run(request_async(request, socket_path, host, port))
+    if not header.get("ok"):
+        raise RuntimeError(header.get("error", "Neznámá chyba serveru"))
+    return loads(data)
+
+
+def fetch_stats(socket_path: Optional[str] = None, host: str = "127.0.0.1",
+                port: int = 8765) -> Dict[str, Any]:
+    """Klient: vrátí statistiky serveru."""
+    header, _ = asyncio.run(request_async({"stats": True}, socket_path, host, port))
+    return header["stats"]
@@ -0,0 +1,131 @@
+"""
+Sparse Dungeon Grid
+-------------------
+
+Tento modul implementuje řídkou mřížku dungeonu, která ukládá pouze vykopané
+(nezděné) buňky. Mapy z diggeru nebo z drunkard's walk s nízkým floor_ratio jsou
+převážně zeď, takže hustá mřížka width * height většinou uchovává jen znaky '#'.
+
+Základní princip:
+1. Každá buňka, která není v mřížce uložena, je zeď
+2. Vykopané buňky ukládáme po řádcích do slovníku {x: dlaždice}
+3. Mřížka se navenek chová jako List[List[str]] - dungeon[y][x] vrací i nastavuje znak,
+   takže do ní generátory a funkce pro kopání chodeb mohou zapisovat přímo
+4. Převod na hustou podobu provádíme až na vyžádání
+
+Paměť i cena kopání tak rostou s počtem vykopaných buněk, ne s plochou mapy.
+"""
+
+from typing import Dict, Iterator, List, Tuple, Union
+
+WALL = "#"
+
+
+def _normalize(index: int, size: int) -> int:
+    """Převede index (i záporný) na pozici v rozsahu 0..size-1 jako u seznamu."""
+    if index < 0:
+        index += size
+    if not 0 <= index < size:
+        raise IndexError("Index mřížky mimo rozsah")
+    return index
+
+
+class SparseRow:
+    """Jeden řádek řídké mřížky s rozhraním seznamu znaků."""
+
+    def __init__(self, grid: "SparseGrid", y: int):
+        self._grid = grid
+        self._y = y
+
+    def __len__(self) -> int:
+        return self._grid.width
+
+    def __getitem__(self, x: Union[int, slice]) -> Union[str, List[str]]:
+        cells = self._grid._rows.get(self._y)
+        if isinstance(x, slice):
+            return [cells.get(i, WALL) if cells else WALL
+                    for i in range(*x.indices(self._grid.width))]
+        x = _normalize(x, self._grid.width)
+        return cells.get(x, WALL) if cells else WALL
+
+    def __setitem__(self, x: Union[int, slice], tile: Union[str, List[str]]) -> None:
+        if isinstance(x, slice):
+            for i, value in zip(range(*x.indices(self._grid.width)), tile):
+                self._grid._set(i, self._y, value)
+        else:
+            self._grid._set(_normalize(x, self._grid.width), self._y, tile)
+
+    def __iter__(self) -> Iterator[str]:
+        cells = self._grid._rows.get(self._y, {})
+        return (cells.get(x, WALL) for x in range(self._grid.width))
+
+
+class SparseGrid:
+    """
+    Řídká mřížka dungeonu, ve které je každá neuložená buňka zeď.
+    """
+
+    def __init__(self, width: int, height: int):
+        """
+        Inicializace prázdné mřížky (plné zdí).
+
+        Args:
+            width (int): Šířka mřížky
+            height (int): Výška mřížky
+        """
+        self.width = width
+        self.height = height
+        self._rows: Dict[int, Dict[int, str]] = {}
+        self.floor_count = 0
+
+    def _set(self, x: int, y: int, tile: str) -> None:
+        """Nastaví dlaždici na souřadnicích, které už jsou v rozsahu mřížky."""
+        cells = self._rows.get(y)
+        if tile == WALL:
+            if cells and cells.pop(x, None) is not None:
+                self.floor_count -= 1
+                if not cells:
+                    del self._rows[y]
+            return
+        if cells is None:
+            cells = self._rows[y] = {}
+        if x not in cells:
+            self.floor_count += 1
+        cells[x] = tile
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> SparseRow:
+        return SparseRow(self, _normalize(y, self.height))
+
+    def __iter__(self) -> Iterator[SparseRow]:
+        for y in range(self.height):
+            yield SparseRow(self, y)
+
+    def carved_cells(self) -> Iterator[Tuple[int, int, str]]:
+        """Vrátí všechny vykopané buňky jako trojice (x, y, dlaždice) seřazené po řádcích."""
+        for y in sorted(self._rows):
+            cells = self._rows[y]
+            for x in sorted(cells):
+                yield x, y, cells[x]
+
+    def to_dense(self) -> List[List[str]]:
+        """Převede mřížku na hustou podobu List[List[str]]."""
+        dungeon = [[WALL] * self.width for _ in range(self.height)]
+        for y, cells in self._rows.items():
+            row = dungeon[y]
+            for x, tile in cells.items():
+                row[x] = tile
+        return dungeon
+
+    @classmethod
+    def from_dense(cls, dungeon: List[List[str]]) -> "SparseGrid":
+        """Vytvoří řídkou mřížku z husté mapy dungeonu."""
+        height = len(dungeon)
+        grid = cls(len(dungeon[0]) if height else 0, height)
+        for y, row in enumerate(dungeon):
+            for x, tile in enumerate(row):
+                if tile != WALL:
+                    grid._set(x, y, tile)
+        return grid
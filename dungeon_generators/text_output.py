@@ -0,0 +1,284 @@
+"""
+Text Output
+-----------
+
+Tento modul převádí mapu dungeonu na text pro terminál, soubor nebo pager
+v několika velkých blocích místo jednoho print() na každý řádek.
+
+Základní princip:
+1. Mapu jako seznam seznamů spojíme po řádcích jediným join a zakódujeme do
+   UTF-8 - každý znak se zkopíruje jen jednou, bez mezikroku přes numpy
+2. Pole kódů dlaždic uint8 tvaru (H, W) (např. z memmap_grid) zapíšeme do
+   bufferu tvaru (H, W + 1), jehož poslední sloupec jsou konce řádků
+3. Dlaždice lze při výstupu převést vyhledávací tabulkou (256 hodnot); tabulka
+   platí jen pro dlaždice v ASCII, mapa s jinými znaky ji odmítne (ValueError)
+4. Velké mapy se kódují a zapisují po pásech řádků pevné velikosti, takže se
+   celý text nikdy nedrží v paměti; stejně po pásech se skládá mapa s textem
+   vedle ní (info o algoritmu)
+"""
+
+import io
+import sys
+from typing import Any, BinaryIO, Iterator, List, Optional, Sequence, TextIO, Union
+
+import numpy as np
+
+# Velikost bloku při zápisu na výstup (v bajtech)
+CHUNK_SIZE = 256 * 1024
+
+NEWLINE = ord("\n")
+SPACE = ord(" ")
+
+Grid = Union[Sequence[Sequence[str]], np.ndarray]
+
+
+def identity_lut() -> np.ndarray:
+    """Vrátí tabulku, která každý kód dlaždice převede na stejný znak."""
+    return np.arange(256, dtype=np.uint8)
+
+
+def tile_lut(mapping: dict) -> np.ndarray:
+    """
+    Vytvoří tabulku převodu dlaždic na znaky výstupu.
+
+    Args:
+        mapping (dict): Dvojice dlaždice -> jednobajtový znak (např. {"#": "%"}),
+            ostatní dlaždice se nemění
+
+    Returns:
+        np.ndarray: Tabulka uint8 o 256 hodnotách
+    """
+    lut = identity_lut()
+    for tile, char in mapping.items():
+        lut[ord(tile)] = ord(char)
+    return lut
+
+
+def _encode_text(text: str, lut: Optional[np.ndarray] = None) -> bytes:
+    """Zakóduje text mapy do UTF-8, případně převede dlaždice tabulkou (jen ASCII)."""
+    if lut is None:
+        return text.encode("utf-8")
+    if not text.isascii():
+        raise ValueError("Tabulka dlaždic platí jen pro mapy v ASCII")
+    return text.encode("ascii").translate(lut.tobytes())
+
+
+def grid_codes(dungeon: Grid, top: int = 0, bottom: Optional[int] = None) -> np.ndarray:
+    """
+    Převede řádky mapy na pole kódů dlaždic (mapa z dlaždic mimo ASCII vyvolá
+    UnicodeEncodeError).
+
+    Args:
+        dungeon: Mapa dungeonu (List[List[str]]) nebo pole kódů uint8 tvaru (H, W)
+        top (int): První řádek
+        bottom (Optional[int]): Řádek za posledním (výchozí je konec mapy)
+
+    Returns:
+        np.ndarray: Pole uint8 tvaru (bottom - top, W)
+    """
+    if isinstance(dungeon, np.ndarray):
+        return dungeon[top:bottom].astype(np.uint8, copy=False)
+    rows = dungeon[top:bottom]
+    width = len(rows[0]) if len(rows) else 0
+    cells = "".join(map("".join, rows)).encode("ascii")
+    return np.frombuffer(cells, dtype=np.uint8).reshape(len(rows), width)
+
+
+def encode_grid(dungeon: Grid, lut: Optional[np.ndarray] = None, top: int = 0,
+                bottom: Optional[int] = None) -> bytes:
+    """
+    Převede mapu (nebo pás jejích řádků) na text v jednom bufferu.
+
+    Args:
+        dungeon: Mapa dungeonu nebo pole kódů uint8 tvaru (H, W)
+        lut (Optional[np.ndarray]): Tabulka kód dlaždice -> znak výstupu
+        top (int): První řádek
+        bottom (Optional[int]): Řádek za posledním
+
+    Returns:
+        bytes: Řádky mapy, každý zakončený '\\n'
+
+    Raises:
+        ValueError: Tabulka lut u mapy s dlaždicemi mimo ASCII
+    """
+    if not isinstance(dungeon, np.ndarray):
+        rows = dungeon[top:bottom]
+        if not len(rows):
+            return b""
+        return _encode_text("\n".join(map("".join, rows)) + "\n", lut)
+
+    codes = grid_codes(dungeon, top, bottom)
+    height, width = codes.shape
+    buffer = np.empty((height, width + 1), dtype=np.uint8)
+    buffer[:, :width] = codes if lut is None else lut[codes]
+    buffer[:, width] = NEWLINE
+    return buffer.tobytes()
+
+
+def iter_encoded(dungeon: Grid, lut: Optional[np.ndarray] = None,
+                 chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Kóduje mapu po pásech řádků o velikosti nejvýše chunk_size bajtů (alespoň jeden řádek).
+
+    Args:
+        dungeon: Mapa dungeonu nebo pole kódů uint8 tvaru (H, W)
+        lut (Optional[np.ndarray]): Tabulka kód dlaždice -> znak výstupu
+        chunk_size (int): Velikost bloku v bajtech
+
+    Yields:
+        bytes: Text jednoho pásu řádků
+    """
+    height = len(dungeon)
+    width = len(dungeon[0]) if height else 0
+    rows = max(1, chunk_size // (width + 1))
+    for top in range(0, height, rows):
+        yield encode_grid(dungeon, lut, top, min(height, top + rows))
+
+
+def iter_side_by_side(dungeon: Grid, text: str, column: int, gap: int = 1,
+                      lut: Optional[np.ndarray] = None,
+                      chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Skládá mapu a text vedle ní po blocích (pro zápis velkých map bez jednoho velkého bufferu).
+
+    Řádky mapy se doplní mezerami na šířku column a za mezeru gap následuje řádek
+    textu; pokud je text delší než mapa, pokračuje odsazený pod ní.
+
+    Args:
+        dungeon: Mapa dungeonu nebo pole kódů uint8 tvaru (H, W)
+        text (str): Text vpravo od mapy (může obsahovat libovolné znaky UTF-8)
+        column (int): Šířka sloupce s mapou
+        gap (int): Počet mezer mezi mapou a textem
+        lut (Optional[np.ndarray]): Tabulka kód dlaždice -> znak výstupu
+        chunk_size (int): Velikost bloku v bajtech pro zbytek mapy pod textem
+
+    Yields:
+        bytes: Text v kódování UTF-8
+
+    Raises:
+        ValueError: Tabulka lut u mapy s dlaždicemi mimo ASCII
+    """
+    lines = [line.encode("utf-8") for line in text.split("\n")]
+    height = len(dungeon)
+    width = len(dungeon[0]) if height else 0
+    beside = min(height, len(lines))
+
+    # Řádky s textem: mapa doplněná mezerami na šířku sloupce, mezera a řádek textu
+    left_width = max(width, column) + gap
+    if isinstance(dungeon, np.ndarray):
+        codes = grid_codes(dungeon, 0, beside)
+        left = np.full((beside, left_width), SPACE, dtype=np.uint8)
+        left[:, :width] = codes if lut is None else lut[codes]
+        left_rows = [row.tobytes() for row in left]
+    else:
+        # Doplňujeme podle počtu dlaždic, ne bajtů (znaky mimo ASCII mají víc bajtů)
+        left_rows = [_encode_text("".join(row), lut) + b" " * (left_width - len(row))
+                     for row in dungeon[:beside]]
+    yield b"".join(row + line + b"\n" for row, line in zip(left_rows, lines))
+
+    # Zbytek mapy bez textu, případně zbytek textu pod mapou
+    if height > beside:
+        rows = max(1, chunk_size // (width + 1))
+        for top in range(beside, height, rows):
+            yield encode_grid(dungeon, lut, top, min(height, top + rows))
+    indent = b" " * (column + gap)
+    if len(lines) > beside:
+        yield b"".join(indent + line + b"\n" for line in lines[beside:])
+
+
+def compose_side_by_side(dungeon: Grid, text: str, column: int, gap: int = 1,
+                         lut: Optional[np.ndarray] = None) -> bytes:
+    """
+    Složí mapu a text vedle ní do jednoho bufferu (viz iter_side_by_side).
+
+    Args:
+        dungeon: Mapa dungeonu nebo pole kódů uint8 tvaru (H, W)
+        text (str): Text vpravo od mapy
+        column (int): Šířka sloupce s mapou
+        gap (int): Počet mezer mezi mapou a textem
+        lut (Optional[np.ndarray]): Tabulka kód dlaždice -> znak výstupu
+
+    Returns:
+        bytes: Text v kódování UTF-8
+    """
+    return b"".join(iter_side_by_side(dungeon, text, column, gap, lut))
+
+
+def _binary_stream(stream: Union[TextIO, BinaryIO]) -> Optional[BinaryIO]:
+    """Vrátí binární vrstvu proudu (textovou vrstvu nejdřív vyprázdní), nebo None."""
+    buffer = getattr(stream, "buffer", None)
+    if buffer is not None:
+        stream.flush()
+        return buffer
+    return None if isinstance(stream, io.TextIOBase) else stream
+
+
+def write_chunks(chunks: Union[bytes, Iterator[bytes]], stream: Optional[Any] = None,
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Zapíše data na výstup po blocích pevné velikosti.
+
+    Args:
+        chunks: Buffer nebo posloupnost bufferů
+        stream (optional): Cílový proud - textový (sys.stdout), binární nebo soubor
+            otevřený v režimu "wb" (výchozí je sys.stdout)
+        chunk_size (int): Velikost bloku v bajtech
+
+    Returns:
+        int: Počet zapsaných bajtů
+    """
+    stream = stream if stream is not None else sys.stdout
+    binary = _binary_stream(stream)
+    if isinstance(chunks, (bytes, bytearray)):
+        chunks = [chunks]
+
+    written = 0
+    for data in chunks:
+        if binary is None:
+            # Textový proud bez binární vrstvy (např. io.StringIO) - blok by mohl
+            # rozdělit vícebajtový znak, takže data dekódujeme najednou
+            stream.write(bytes(data).decode("utf-8"))
+            written += len(data)
+            continue
+        view = memoryview(data)
+        for offset in range(0, len(view), chunk_size):
+            written += binary.write(view[offset:offset + chunk_size])
+    if binary is not None:
+        binary.flush()
+    return written
+
+
+def write_grid(dungeon: Grid, stream: Optional[Any] = None, lut: Optional[np.ndarray] = None,
+               chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Vypíše mapu na výstup; velké mapy se kódují a zapisují po pásech.
+
+    Args:
+        dungeon: Mapa dungeonu nebo pole kódů uint8 tvaru (H, W)
+        stream (optional): Cílový proud (výchozí je sys.stdout)
+        lut (Optional[np.ndarray]): Tabulka kód dlaždice -> znak výstupu
+        chunk_size (int): Velikost bloku v bajtech
+
+    Returns:
+        int: Počet zapsaných bajtů
+    """
+    return write_chunks(iter_encoded(dungeon, lut, chunk_size), stream, chunk_size)
+
+
+if __name__ == "__main__":
+    # Jednoduché testování - porovnání s výpisem po řádcích
+    import time
+
+    dungeon = [["#" if (x * y) % 7 else "." for x in range(4000)] for y in range(4000)]
+
+    start = time.perf_counter()
+    expected = "".join("".join(row) + "\n" for row in dungeon).encode("ascii")
+    joined = time.perf_counter() - start
+
+    start = time.perf_counter()
+    output = io.BytesIO()
+    write_grid(dungeon, output)
+    encoded = time.perf_counter() - start
+
+    assert output.getvalue() == expected
+    print(f"Po řádcích: {joined * 1000:.0f} ms, po pásech: {encoded * 1000:.0f} ms")
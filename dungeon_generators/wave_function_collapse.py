@@ -16,27 +16,34 @@ demonstruje základní princip jeho fungování pro generování dungeonů.
 """
 
 import random
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 
-def generate_wfc_dungeon(width: int, height: int, room_attempts: int = 15, 
-                        room_min_size: int = 5, room_max_size: int = 10) -> List[List[str]]:
+# Změna mapy v jednom kroku: seznam obdélníků (x, y, šířka, výška, dlaždice)
+Delta = List[Tuple[int, int, int, int, str]]
+
+
+def iter_wfc_steps(dungeon: List[List[str]], width: int, height: int, room_attempts: int = 15,
+                   room_min_size: int = 5, room_max_size: int = 10, *,
+                   routed: bool = False) -> Iterator[Delta]:
     """
-    Generuje dungeon pomocí zjednodušené verze algoritmu Wave Function Collapse.
+    Generuje místnosti a chodby krok po kroku nad mapou plnou zdí.
     
     Args:
+        dungeon (List[List[str]]): Mapa plná zdí, která se upravuje na místě
         width (int): Šířka dungeonu
         height (int): Výška dungeonu
         room_attempts (int): Počet pokusů o vytvoření místnosti
         room_min_size (int): Minimální velikost místnosti
         room_max_size (int): Maximální velikost místnosti
+        routed (bool): Hledat chodby algoritmem A* (modul corridors), které obcházejí
+            ostatní místnosti, místo rovných chodeb tvaru L
     
-    Returns:
-        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    Yields:
+        Delta: Změny po každém pokusu o místnost a po každé chodbě
     """
-    # Vytvoříme základní mapu plnou zdí
-    dungeon = [["#" for _ in range(width)] for _ in range(height)]
     rooms = []
+    rects = []
 
     # Náhodné generování místností
     for _ in range(room_attempts):
@@ -47,6 +54,7 @@ def generate_wfc_dungeon(width: int, height: int, room_attempts: int = 15,
 
         # Kontrola kolize s jinou místností
         if any(dungeon[yy][xx] == "." for yy in range(y, y+h) for xx in range(x, x+w)):
+            yield []
             continue
 
         # Přidání místnosti
@@ -54,9 +62,16 @@ def generate_wfc_dungeon(width: int, height: int, room_attempts: int = 15,
             for xx in range(x, x + w):
                 dungeon[yy][xx] = "." 
         rooms.append((x + w // 2, y + h // 2))  # Uložíme střed místnosti
+        rects.append((x, y, w, h))
+        yield [(x, y, w, h, ".")]
 
     # Spojení místností pomocí chodeb
     random.shuffle(rooms)
+    if routed:
+        from dungeon_generators.corridors import iter_route_rooms
+
+        yield from iter_route_rooms(dungeon, list(zip(rooms, rooms[1:])), rects)
+        return
     for i in range(len(rooms) - 1):
         x1, y1 = rooms[i]
         x2, y2 = rooms[i + 1]
@@ -65,9 +80,41 @@ def generate_wfc_dungeon(width: int, height: int, room_attempts: int = 15,
         if random.choice([True, False]):
             connect_horizontal(dungeon, x1, x2, y1)
             connect_vertical(dungeon, y1, y2, x2)
+            corner_x, corner_y = x2, y1
         else:
             connect_vertical(dungeon, y1, y2, x1)
             connect_horizontal(dungeon, x1, x2, y2)
+            corner_x, corner_y = x1, y2
+        yield [(min(x1, x2), corner_y, abs(x2 - x1) + 1, 1, "."),
+               (corner_x, min(y1, y2), 1, abs(y2 - y1) + 1, ".")]
+
+
+def generate_wfc_dungeon(width: int, height: int, room_attempts: int = 15, 
+                        room_min_size: int = 5, room_max_size: int = 10,
+                        grid: Optional[List[List[str]]] = None, *,
+                        routed: bool = False) -> List[List[str]]:
+    """
+    Generuje dungeon pomocí zjednodušené verze algoritmu Wave Function Collapse.
+    
+    Args:
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        room_attempts (int): Počet pokusů o vytvoření místnosti
+        room_min_size (int): Minimální velikost místnosti
+        room_max_size (int): Maximální velikost místnosti
+        grid (optional): Předalokovaná mřížka plná zdí, do které se generuje
+            (např. SparseGrid). Výchozí je nový seznam seznamů v paměti.
+        routed (bool): Hledat chodby algoritmem A* místo rovných chodeb tvaru L
+    
+    Returns:
+        List[List[str]]: 2D mapa dungeonu, kde '#' představuje stěnu a '.' podlahu
+    """
+    # Vytvoříme základní mapu plnou zdí (pokud ji nedodal volající)
+    dungeon = grid if grid is not None else [["#" for _ in range(width)] for _ in range(height)]
+
+    for _ in iter_wfc_steps(dungeon, width, height, room_attempts, room_min_size, room_max_size,
+                            routed=routed):
+        pass
 
     return dungeon
 
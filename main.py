@@ -6,162 +6,39 @@ Projekt TermDungeon umožňuje generovat a vizualizovat procedurálně generovan
 s využitím různých algoritmů.
 """
 
+import argparse
 import sys
 import shutil
 import os
-from typing import List, Dict, Tuple, Callable
+import time
+from typing import Any, List, Optional, Sequence, Tuple
 
-# Importy generátorů dungeonů
-from dungeon_generators.bsp_generator import generate_bsp_dungeon
-from dungeon_generators.cellular_automata import generate_cellular_automata_dungeon
-from dungeon_generators.drunkards_walk import generate_drunkards_dungeon
-from dungeon_generators.wave_function_collapse import generate_wfc_dungeon
-from dungeon_generators.perlin_generator import generate_perlin_dungeon
-from dungeon_generators.digger_generator import generate_digger_dungeon
+# Registr generátorů (moduly generátorů se importují až při prvním použití)
+from dungeon_generators.registry import GENERATORS, GeneratorEntry, get_generator
+from dungeon_generators.budget import Budget, generate_within_budget
+from dungeon_generators.dungeon_cache import DungeonCache, dungeon_key
+from dungeon_generators.prefetch import DungeonPrefetcher
 
 # Konstanty
 DEFAULT_WIDTH = 75
 DEFAULT_HEIGHT = 25
 
-# Detailní popisy algoritmů
-ALGO_INFO = {
-    "BSP": """Binary Space Partitioning (BSP)
------------------------------
-Jak funguje:
-- Rekurzivně dělí prostor na menší části (binární strom)
-- V každé části vytváří místnost s náhodnou velikostí
-- Propojuje sousední místnosti chodbami
-
-Výhody:
-- Vytváří strukturovaný layout místností a chodeb
-- Dobrá kontrola nad velikostí místností
-- Výsledek vždy obsahuje plně propojené místnosti
-
-Nevýhody:
-- Méně organický vzhled, působí uměle
-- Někdy vytváří příliš přímočaré chodby
-
-Využití:
-- Klasické dungeony v RPG hrách
-- Interiéry budov a sklepení
-- Základní struktura pro komplexnější dungeony""",
-
-    "Cellular Automata": """Cellular Automata
-----------------
-Jak funguje:
-- Začíná s náhodně generovaným šumem
-- Aplikuje pravidla pro "přežití" a "narození" buněk
-- Opakovaným aplikováním pravidel vznikají organické tvary
-
-Výhody:
-- Vytváří přirozeně vypadající jeskyně
-- Jednoduché na implementaci
-- Možnost generovat různé druhy terénu změnou pravidel
-
-Nevýhody:
-- Výsledek může být nepředvídatelný
-- Někdy vytváří izolované oblasti
-- Může vyžadovat dodatečné zpracování pro herní použití
-
-Využití:
-- Přírodní jeskyně
-- Organické struktury
-- Podzemní komplexy""",
-
-    "Drunkard's Walk": """Drunkard's Walk (Náhodná procházka)
---------------------------------
-Jak funguje:
-- Začíná v náhodném bodě
-- "Opilý" chodec se náhodně pohybuje po mapě
-- Kde projde, tam vytváří volný prostor
-- Pokračuje, dokud není vygenerován požadovaný poměr volného prostoru
-
-Výhody:
-- Velmi jednoduchý na implementaci
-- Vytváří organické nepravidelné chodby
-- Generuje zajímavé průchozí trasy
-
-Nevýhody:
-- Může vytvářet příliš chaotické struktury
-- Často vznikají slepé uličky
-- Není vhodný pro strukturované dungeony
-
-Využití:
-- Bludiště
-- Tunely mezi místnostmi
-- Organické struktury jako doplněk k jiným algoritmům""",
-
-    "Wave Function Collapse": """Wave Function Collapse (WFC)
-------------------------
-Jak funguje:
-- Inspirováno kvantovou mechanikou
-- Používá předem definované vzory nebo pravidla
-- Iterativně kolapsuje možnosti každé buňky podle okolí
-- Vytváří koherentní vzory respektující lokální omezení
-
-Výhody:
-- Generuje vysoce strukturované výsledky
-- Může vytvářet velmi specifické typy dungeonů
-- Dobře funguje se šablonami a vzory
-
-Nevýhody:
-- Složitější na implementaci
-- Může uvíznout v neřešitelných konfiguracích
-- Vyžaduje dobře definované vzory nebo pravidla
-
-Využití:
-- Komplexní strukturované dungeony
-- Kombinace různých biómů nebo architektonických stylů
-- Procedurální generování s konzistentními vzory""",
-
-    "Perlin Noise": """Perlin Noise
------------
-Jak funguje:
-- Generuje souvislý šum s kontrolovatelnou úrovní detailů
-- Využívá matematické funkce pro vytvoření hladkých přechodů
-- Kombinuje více vrstev šumu pro různé úrovně detailů (oktávy)
-
-Výhody:
-- Přirozené a plynulé přechody
-- Dobře se škáluje pro různé velikosti map
-- Vhodný pro generování terénu a krajin
-
-Nevýhody:
-- Není ideální pro strukturované dungeony
-- Vyžaduje dodatečné zpracování pro vytvoření chodeb
-- Může být výpočetně náročnější
-
-Využití:
-- Krajiny a venkovní prostředí
-- Jeskynní systémy
-- Podzemní labyrinty s přirozenými prvky""",
-
-    "Digger Tunnels": """Digger Tunnels
-----------
-Jak funguje:
-- Začíná s centrální místností
-- Vytváří několik "kopáčů", kteří se náhodně pohybují
-- Každý kopáč postupně vytváří chodby a občas místnosti
-- Výsledkem je síť propojených tunelů
-
-Výhody:
-- Vytváří strukturované tunely s občasnými místnostmi
-- Vždy začíná s přístupnou centrální místností
-- Tunely jsou přirozeně propojené
-
-Nevýhody:
-- Může vytvářet příliš klikaté chodby
-- Méně kontroly nad umístěním místností
-- Občas může vznikat příliš hustá síť chodeb
-
-Využití:
-- Důlní komplexy
-- Jeskynní systémy
-- Systémy podzemních tunelů"""
-}
+ANIMATION_FPS = 30
+COMPARE_COLUMNS = 3
+
+# Časový limit generování jedné mapy v menu (s)
+GENERATION_TIME_LIMIT = 10.0
+
+# Cache dungeonů se seedem (paměť + disk)
+DUNGEON_CACHE = DungeonCache()
+
+# Příprava dalšího dungeonu na pozadí
+PREFETCHER = DungeonPrefetcher(GENERATION_TIME_LIMIT)
 
 def main() -> None:
     """Hlavní funkce programu."""
+    exit_choice = str(len(GENERATORS) + 1)
+    
     while True:
         term_width, _ = shutil.get_terminal_size()
         divider = "─" * term_width
@@ -169,190 +46,217 @@ def main() -> None:
         print("\n╔" + "═" * (term_width - 2) + "╗")
         print("║" + " TermDungeon Generator ".center(term_width - 2) + "║")
         print("╠" + "═" * (term_width - 2) + "╣")
-        print("║ 1) BSP Dungeon".ljust(term_width - 2) + "║")
-        print("║ 2) Cellular Automata".ljust(term_width - 2) + "║")
-        print("║ 3) Drunkard's Walk".ljust(term_width - 2) + "║")
-        print("║ 4) Wave Function Collapse".ljust(term_width - 2) + "║")
-        print("║ 5) Perlin Noise".ljust(term_width - 2) + "║")
-        print("║ 6) Digger Tunnels".ljust(term_width - 2) + "║")
-        print("║ 7) Exit".ljust(term_width - 2) + "║")
+        for number, entry in enumerate(GENERATORS, 1):
+            print(f"║ {number}) {entry.name}".ljust(term_width - 2) + "║")
+        print("║ c) Porovnání všech algoritmů".ljust(term_width - 2) + "║")
+        print(f"║ {exit_choice}) Exit".ljust(term_width - 2) + "║")
         print("╚" + "═" * (term_width - 2) + "╝")
 
-        prompt = "Vyber algoritmus (1-7), 'číslo_i' pro info, 'číslo_s' pro zdrojový kód, 'číslo_p' pro parametry: "
+        prompt = (f"Vyber algoritmus (1-{exit_choice}), 'číslo_i' pro info, 'číslo_s' pro zdrojový kód, "
+                  "'číslo_p' pro parametry, 'číslo_a' pro animaci: ")
         choice = input(prompt).strip()
         
         # Defaultní rozměry dungeonu
         width = DEFAULT_WIDTH
         height = DEFAULT_HEIGHT
         
-        # Zpracování informací o algoritmu
-        if choice.endswith('i'):
-            algo_num = choice[:-1]
-            if algo_num in ["1", "2", "3", "4", "5", "6"]:
-                algo_name = get_algo_name(algo_num)
-                show_algorithm_info(algo_name)
-            else:
-                print("Neplatná volba, zkus to znovu.")
+        # Ukončení programu
+        if choice == exit_choice:
+            PREFETCHER.cancel()
+            print("Ukončuji program. Na shledanou!")
+            sys.exit(0)
+        
+        # Porovnání všech algoritmů vedle sebe
+        if choice.lower() == "c":
+            PREFETCHER.cancel()
+            compare_algorithms()
             continue
         
-        # Zobrazení zdrojového kódu algoritmu
-        elif choice.endswith('s'):
-            algo_num = choice[:-1]
-            show_source_code(algo_num)
+        # Volba algoritmu podle čísla (případně s příponou akce)
+        action = choice[-1] if choice[-1:] in ("i", "s", "p", "a") else ""
+        entry = get_generator(choice[:-1] if action else choice)
+        if entry is None or not choice[:1].isdigit():
+            print("Neplatná volba, zkus to znovu.")
             continue
+        
+        # Jiná volba než generování ruší přípravu dalšího dungeonu
+        if action not in ("", "p"):
+            PREFETCHER.cancel()
+        
+        # Zpracování informací o algoritmu
+        if action == 'i':
+            show_algorithm_info(entry)
+        
+        # Zobrazení zdrojového kódu algoritmu
+        elif action == 's':
+            show_source_code(entry)
             
         # Zadání specifických parametrů
-        elif choice.endswith('p'):
-            algo_num = choice[:-1]
-            if algo_num in ["1", "2", "3", "4", "5", "6"]:
-                algo_name = get_algo_name(algo_num)
-                dungeon = generate_with_params(algo_num, width, height)
-                if dungeon:
-                    show_dungeon(dungeon, algo_name)
-            else:
-                print("Neplatná volba, zkus to znovu.")
-            continue
+        elif action == 'p':
+            dungeon = generate_with_params(entry, width, height)
+            if dungeon:
+                show_dungeon(dungeon, entry.name)
+            
+        # Animované přehrání generování
+        elif action == 'a':
+            animate_generation(entry, width, height)
             
         # Generování dungeonu s výchozími parametry
-        elif choice in ["1", "2", "3", "4", "5", "6"]:
-            algo_name = get_algo_name(choice)
+        else:
             try:
-                dungeon = generate_dungeon(choice, width, height)
+                dungeon = generate_dungeon(entry, width, height)
                 print(divider)
-                show_dungeon_with_info(dungeon, ALGO_INFO[algo_name])
+                show_dungeon_with_info(dungeon, entry.info)
             except Exception as e:
                 print(f"Chyba při generování dungeonu: {e}")
-                
-        # Ukončení programu
-        elif choice == "7":
-            print("Ukončuji program. Na shledanou!")
-            sys.exit(0)
-            
-        # Neplatná volba
-        else:
-            print("Neplatná volba, zkus to znovu.")
-            continue
 
-def get_algo_name(choice: str) -> str:
-    """Vrátí název algoritmu podle čísla volby."""
-    algorithms = {
-        "1": "BSP",
-        "2": "Cellular Automata", 
-        "3": "Drunkard's Walk",
-        "4": "Wave Function Collapse",
-        "5": "Perlin Noise",
-        "6": "Digger Tunnels"
-    }
-    return algorithms.get(choice, "")
-
-def show_algorithm_info(algo_name: str) -> None:
+def show_algorithm_info(entry: GeneratorEntry) -> None:
     """Zobrazí detailní informace o algoritmu."""
-    if algo_name in ALGO_INFO:
-        term_width, _ = shutil.get_terminal_size()
-        divider = "─" * term_width
-        
-        print(divider)
-        print(ALGO_INFO[algo_name])
-        print(divider)
-        input("Stiskni Enter pro pokračování...")
-    else:
-        print("Neplatná volba algoritmu.")
+    term_width, _ = shutil.get_terminal_size()
+    divider = "─" * term_width
+    
+    print(divider)
+    print(entry.info)
+    print(divider)
+    input("Stiskni Enter pro pokračování...")
 
-def show_source_code(algo_num: str) -> None:
+def show_source_code(entry: GeneratorEntry) -> None:
     """Zobrazí zdrojový kód vybraného algoritmu."""
-    file_paths = {
-        "1": "dungeon_generators/bsp_generator.py",
-        "2": "dungeon_generators/cellular_automata.py",
-        "3": "dungeon_generators/drunkards_walk.py",
-        "4": "dungeon_generators/wave_function_collapse.py",
-        "5": "dungeon_generators/perlin_generator.py",
-        "6": "dungeon_generators/digger_generator.py",
-    }
-    
-    if algo_num in file_paths:
-        file_path = file_paths[algo_num]
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                print("\n" + "─" * 80)
-                print(f"Zdrojový kód: {file_path}")
-                print("─" * 80)
-                print(file.read())
-                print("─" * 80)
-                input("Stiskni Enter pro pokračování...")
-        except FileNotFoundError:
-            print(f"Soubor {file_path} nebyl nalezen.")
-    else:
-        print("Neplatná volba algoritmu.")
-
-def generate_with_params(algo_num: str, width: int, height: int) -> List[List[str]]:
+    file_path = entry.source_path
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            print("\n" + "─" * 80)
+            print(f"Zdrojový kód: {file_path}")
+            print("─" * 80)
+            print(file.read())
+            print("─" * 80)
+            input("Stiskni Enter pro pokračování...")
+    except FileNotFoundError:
+        print(f"Soubor {file_path} nebyl nalezen.")
+
+def generate_with_params(entry: GeneratorEntry, width: int, height: int) -> Optional[List[List[str]]]:
     """Generuje dungeon se specifickými parametry od uživatele."""
-    generators = {
-        "1": (generate_bsp_dungeon, "BSP", ["max_depth (int): Maximální hloubka dělení"]),
-        "2": (generate_cellular_automata_dungeon, "Cellular Automata", 
-              ["iterations (int): Počet iterací", "wall_prob (float): Pravděpodobnost zdi"]),
-        "3": (generate_drunkards_dungeon, "Drunkard's Walk", 
-              ["floor_ratio (float): Poměr podlahy k celkové ploše"]),
-        "4": (generate_wfc_dungeon, "Wave Function Collapse", 
-              ["room_attempts (int): Počet pokusů o místnost", 
-               "room_min_size (int): Minimální velikost místnosti", 
-               "room_max_size (int): Maximální velikost místnosti"]),
-        "5": (generate_perlin_dungeon, "Perlin Noise", 
-              ["scale (float): Měřítko šumu", "octaves (int): Počet oktáv", 
-               "threshold (float): Práh pro generování zdí"]),
-        "6": (generate_digger_dungeon, "Digger Tunnels",
-              ["num_diggers (int): Počet kopáčů", "dig_length (int): Délka kopání"])
-    }
-    
-    if algo_num in generators:
-        generator_func, algo_name, param_descriptions = generators[algo_num]
+    print(f"\nParametry pro {entry.name}:")
+    for param in entry.params:
+        print(f"- {param.name} ({param.type.__name__}): {param.description} [výchozí {param.default}]")
         
-        print(f"\nParametry pro {algo_name}:")
-        for desc in param_descriptions:
-            print(f"- {desc}")
-            
-        params_input = input("\nZadejte parametry oddělené čárkami (např. 5,0.45): ").strip()
+    params_input = input("\nZadejte parametry oddělené čárkami (např. 5,0.45): ").strip()
+    seed_input = input("Seed (Enter = náhodný): ").strip()
+    
+    try:
+        # Převod vstupních parametrů na správné typy podle schématu
+        params = entry.parse_params(params_input)
         
-        try:
-            # Převod vstupních parametrů na správné typy
-            params = []
-            if params_input:
-                for i, param in enumerate(params_input.split(',')):
-                    # Detekce typu parametru podle popisu
-                    if "int" in param_descriptions[min(i, len(param_descriptions)-1)]:
-                        params.append(int(param))
-                    elif "float" in param_descriptions[min(i, len(param_descriptions)-1)]:
-                        params.append(float(param))
-                    else:
-                        params.append(param)
-            
-            # Generování dungeonu s parametry
-            return generator_func(width, height, *params)
-        except Exception as e:
-            print(f"Chyba při zpracování parametrů: {e}")
-            return None
-    else:
-        print("Neplatná volba algoritmu.")
+        # Generování dungeonu s parametry (se seedem přes cache)
+        seed = int(seed_input) if seed_input else None
+        return generate_prefetched(entry, width, height, params, seed)
+    except Exception as e:
+        print(f"Chyba při zpracování parametrů: {e}")
         return None
 
-def generate_dungeon(choice: str, width: int, height: int) -> List[List[str]]:
-    """Generuje dungeon podle vybrané metody s výchozími parametry."""
-    generators = {
-        "1": generate_bsp_dungeon,
-        "2": generate_cellular_automata_dungeon,
-        "3": generate_drunkards_dungeon,
-        "4": generate_wfc_dungeon,
-        "5": generate_perlin_dungeon,
-        "6": generate_digger_dungeon
-    }
-    
-    generator = generators.get(choice)
-    if generator:
-        return generator(width, height)
-    else:
-        raise ValueError("Neplatná volba algoritmu")
+def generate_dungeon(entry: GeneratorEntry, width: int, height: int, seed: Optional[int] = None) -> List[List[str]]:
+    """Generuje dungeon podle vybrané metody s výchozími parametry (se seedem přes cache)."""
+    return generate_prefetched(entry, width, height, (), seed)
+
+def generate_prefetched(entry: GeneratorEntry, width: int, height: int,
+                        params: Sequence[Any] = (), seed: Optional[int] = None) -> List[List[str]]:
+    """Vrátí dungeon připravený na pozadí (nebo ho vygeneruje) a začne připravovat další."""
+    # Dungeon se seedem je vždy stejný - místo přípravy na pozadí ho obslouží cache
+    if seed is not None:
+        PREFETCHER.cancel()
+        key = dungeon_key(entry.name, width, height, params, seed)
+        dungeon = DUNGEON_CACHE.get(key)
+        if dungeon is None:
+            dungeon, completed = generate_limited(entry, width, height, params, seed)
+            if completed:
+                DUNGEON_CACHE.put(key, dungeon)
+        return dungeon
+    
+    dungeon = PREFETCHER.take(entry, width, height, params)
+    if dungeon is None:
+        dungeon, _ = generate_limited(entry, width, height, params)
+    PREFETCHER.start(entry, width, height, params)
+    return dungeon
+
+def generate_limited(entry: GeneratorEntry, width: int, height: int, params: Sequence[Any] = (),
+                     seed: Optional[int] = None) -> Tuple[List[List[str]], bool]:
+    """Generuje dungeon s časovým limitem; nedokončenou mapu vrátí s upozorněním."""
+    result = generate_within_budget(entry.key, width, height, params, seed,
+                                    Budget(GENERATION_TIME_LIMIT))
+    if not result.completed:
+        print(f"Generování nedoběhlo do {GENERATION_TIME_LIMIT:g} s - zobrazuji rozpracovanou mapu "
+              f"({result.steps} kroků)")
+    return result.dungeon, result.completed
+
+def animate_generation(entry: GeneratorEntry, width: int, height: int) -> None:
+    """Přehraje postupné generování dungeonu s výchozími parametry jako animaci."""
+    dungeon = [["#" for _ in range(width)] for _ in range(height)]
+    
+    from viewer import play_steps
+    play_steps(entry.load_steps()(dungeon, width, height), width, height,
+               entry.name, ANIMATION_FPS, entry.steps_per_frame)
+
+def compare_algorithms(columns: int = COMPARE_COLUMNS) -> None:
+    """Vygeneruje všechny algoritmy paralelně se stejným seedem a zobrazí je v mřížce."""
+    from dungeon_generators.compare import compare_generators
+    
+    term_width, _ = shutil.get_terminal_size()
+    gap = 2
+    map_width = max(20, (term_width - gap * (columns - 1)) // columns)
+    map_height = DEFAULT_HEIGHT
+    
+    start = time.perf_counter()
+    results = compare_generators(map_width, map_height)
+    total = time.perf_counter() - start
+    
+    for i in range(0, len(results), columns):
+        group = results[i:i + columns]
+        print("─" * term_width)
+        print((" " * gap).join(result.name[:map_width].ljust(map_width) for result in group))
+        print((" " * gap).join(
+            (f"chyba: {result.error}" if result.error else
+             f"{result.elapsed:.3f} s, podlaha {result.metrics.floor_ratio:.0%}, "
+             f"oblasti {result.metrics.regions}, slepé konce {result.metrics.dead_ends}"
+             )[:map_width].ljust(map_width) for result in group))
+        for y in range(map_height):
+            print((" " * gap).join(
+                ("".join(result.dungeon[y]) if result.dungeon else "").ljust(map_width)
+                for result in group))
+    
+    print("─" * term_width)
+    print(f"Celkový čas: {total:.3f} s (součet jednotlivých algoritmů: "
+          f"{sum(result.elapsed for result in results):.3f} s)")
+    input("Stiskni Enter pro pokračování...")
+
+def fits_terminal(dungeon: List[List[str]], extra_width: int = 0, extra_lines: int = 1) -> bool:
+    """
+    Zjistí, zda se dungeon (a případný text vedle něj) vejde do terminálu.
+    
+    Args:
+        dungeon (List[List[str]]): Mapa dungeonu
+        extra_width (int): Počet sloupců vypsaných vedle mapy
+        extra_lines (int): Počet řádků vypsaných nad a pod mapou (včetně výzvy k Enter)
+    
+    Returns:
+        bool: True, pokud se celý výpis vejde na obrazovku bez posouvání
+    """
+    term_width, term_height = shutil.get_terminal_size()
+    width = len(dungeon[0]) if dungeon else 0
+    return width + extra_width <= term_width and len(dungeon) + extra_lines <= term_height
+
+def view_large_dungeon(dungeon: List[List[str]], title: str) -> None:
+    """Zobrazí dungeon v celoobrazovkovém prohlížeči s posunem výřezu."""
+    from viewer import view_dungeon
+    view_dungeon(dungeon, title)
 
 def show_dungeon(dungeon: List[List[str]], algo_name: str) -> None:
     """Zobrazí vygenerovaný dungeon."""
+    # Velké mapy se nevejdou na obrazovku (s nadpisem, oddělovači a výzvou) - zobrazíme je v prohlížeči
+    if sys.stdout.isatty() and not fits_terminal(dungeon, extra_lines=5):
+        view_large_dungeon(dungeon, algo_name)
+        return
+    from dungeon_generators.text_output import write_grid
+
     term_width, _ = shutil.get_terminal_size()
     divider = "─" * term_width
     
@@ -360,37 +264,224 @@ def show_dungeon(dungeon: List[List[str]], algo_name: str) -> None:
     print(f"Algoritmus: {algo_name}")
     print(divider)
     
-    for row in dungeon:
-        print("".join(row))
+    # Celá mapa jedním zápisem (velké mapy po blocích)
+    write_grid(dungeon)
     
     print(divider)
     input("Stiskni Enter pro pokračování...")
 
 def show_dungeon_with_info(dungeon: List[List[str]], info: str) -> None:
     """Zobrazí dungeon vlevo a vysvětlení vpravo."""
+    from dungeon_generators.text_output import iter_side_by_side, write_chunks, write_grid
+
     term_width, _ = shutil.get_terminal_size()
     split_pos = max(30, term_width // 2)  # Pozice oddělení dungeonu a textu
+    
+    # Rozměry výpisu vedle sebe: sloupec mapy, mezera a nejdelší řádek textu;
+    # text delší než mapa pokračuje pod ní, pak prázdný řádek a výzva
+    lines = info.split("\n")
+    width = len(dungeon[0]) if dungeon else 0
+    extra_width = max(0, split_pos - width) + 1 + max(map(len, lines))
+    extra_lines = max(0, len(lines) - len(dungeon)) + 2
+
+    if not sys.stdout.isatty() or fits_terminal(dungeon, extra_width, extra_lines):
+        # Zobrazení dungeonu a info vedle sebe
+        write_chunks(iter_side_by_side(dungeon, info, split_pos))
+    else:
+        # Text se vedle mapy nevejde - vypíšeme ho nad mapu, velkou mapu zobrazíme v prohlížeči
+        print(info)
+        if fits_terminal(dungeon, extra_lines=2):
+            print()
+            write_grid(dungeon)
+        else:
+            view_large_dungeon(dungeon, lines[0])
+    
+    input("\nStiskni Enter pro pokračování...")
 
-    # Rozdělení info textu na řádky
-    info_lines = info.split("\n")
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Vytvoří parser argumentů příkazové řádky (bez argumentů se spustí menu)."""
+    parser = argparse.ArgumentParser(description="TermDungeon - Terminálový generátor dungeonů")
+    commands = parser.add_subparsers(dest="command")
     
-    # Zobrazení dungeonu a info vedle sebe
-    for i, row in enumerate(dungeon):
-        row_str = "".join(row)
-        info_line = info_lines[i] if i < len(info_lines) else ""
-        print(f"{row_str.ljust(split_pos)} {info_line}")
+    search = commands.add_parser("seed-search", help="Hledání seedů splňujících omezení")
+    search.add_argument("algorithm", help="Číslo nebo klíč algoritmu (např. 2 nebo cellular)")
+    search.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="Šířka mapy")
+    search.add_argument("--height", type=int, default=DEFAULT_HEIGHT, help="Výška mapy")
+    search.add_argument("--params", default="", help="Parametry generátoru oddělené čárkami")
+    search.add_argument("--count", type=int, default=1, help="Počet hledaných seedů")
+    search.add_argument("--start-seed", type=int, default=0, help="První testovaný seed")
+    search.add_argument("--max-seeds", type=int, default=10000, help="Maximální počet testovaných seedů")
+    search.add_argument("--workers", type=int, default=None, help="Počet procesů")
+    search.add_argument("--min-floor", type=float, default=0.0, help="Minimální podíl podlahy")
+    search.add_argument("--max-floor", type=float, default=1.0, help="Maximální podíl podlahy")
+    search.add_argument("--min-connected", type=float, default=0.0,
+                        help="Minimální podíl podlahy v největší souvislé oblasti")
+    search.add_argument("--min-rooms", type=int, default=0, help="Minimální počet místností")
+    search.add_argument("--max-regions", type=int, default=None, help="Maximální počet oblastí")
     
-    # Pokud je info delší než dungeon, zobrazí se zbývající řádky
-    if len(info_lines) > len(dungeon):
-        for i in range(len(dungeon), len(info_lines)):
-            print(" " * split_pos + " " + info_lines[i])
+    pipeline = commands.add_parser("pipeline", help="Generování podle konfigurace pipeline (JSON)")
+    pipeline.add_argument("config", help="Cesta ke konfiguraci pipeline")
+    pipeline.add_argument("--seed", type=int, default=None, help="Seed (přebije seed z konfigurace)")
+    pipeline.add_argument("--output", default=None, help="Uložení mapy do souboru ve formátu TDNG")
+    pipeline.add_argument("--fov", type=int, default=None, metavar="RADIUS",
+                          help="Předpočítat index viditelnosti s tímto poloměrem a uložit ho vedle mapy")
     
-    input("\nStiskni Enter pro pokračování...")
+    levels = commands.add_parser("levels", help="Paralelní generování vícepatrového dungeonu")
+    levels.add_argument("algorithm", help="Číslo nebo klíč algoritmu (např. 2 nebo cellular)")
+    levels.add_argument("--levels", type=int, default=20, help="Počet pater")
+    levels.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="Šířka pater")
+    levels.add_argument("--height", type=int, default=DEFAULT_HEIGHT, help="Výška pater")
+    levels.add_argument("--params", default="", help="Parametry generátoru oddělené čárkami")
+    levels.add_argument("--seed", type=int, default=None, help="Seed celého dungeonu")
+    levels.add_argument("--workers", type=int, default=None, help="Počet procesů")
+    levels.add_argument("--show", type=int, default=None, help="Vypsat patro s tímto číslem")
+    levels.add_argument("--time-limit", type=float, default=None,
+                        help="Časový limit celého svazku v sekundách (nedokončená patra zůstanou rozpracovaná)")
+    
+    serve = commands.add_parser("serve", help="Server generující dungeony pro více klientů")
+    client = commands.add_parser("request", help="Klient serveru (vyžádání dungeonu nebo statistik)")
+    client.add_argument("algorithm", nargs="?", default=None,
+                        help="Číslo nebo klíč algoritmu (bez něj se vypíšou statistiky)")
+    client.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="Šířka mapy")
+    client.add_argument("--height", type=int, default=DEFAULT_HEIGHT, help="Výška mapy")
+    client.add_argument("--params", default="", help="Parametry generátoru oddělené čárkami")
+    client.add_argument("--seed", type=int, default=None, help="Seed generátoru")
+    for command in (serve, client):
+        command.add_argument("--socket", default=None, help="Cesta k unixovému socketu (jinak TCP)")
+        command.add_argument("--host", default="127.0.0.1", help="Adresa pro TCP")
+        command.add_argument("--port", type=int, default=8765, help="Port pro TCP")
+    serve.add_argument("--workers", type=int, default=None, help="Počet procesů generátorů")
+    serve.add_argument("--max-pending", type=int, default=64,
+                       help="Maximální počet rozpracovaných výpočtů")
+    serve.add_argument("--max-cells", type=int, default=2000 * 2000,
+                       help="Největší povolená mapa v buňkách (šířka * výška)")
+    serve.add_argument("--time-limit", type=float, default=10.0,
+                       help="Časový limit jednoho výpočtu v sekundách (mapa zůstane rozpracovaná)")
+    return parser
+
+def run_seed_search(args: argparse.Namespace) -> int:
+    """Spustí hledání seedů z příkazové řádky a vypíše výsledek."""
+    from dungeon_generators.seed_search import Constraints, search_seeds
+    
+    entry = get_generator(args.algorithm)
+    if entry is None:
+        print("Neplatná volba algoritmu.")
+        return 1
+    
+    constraints = Constraints(args.min_floor, args.max_floor, args.min_connected,
+                              args.min_rooms, args.max_regions)
+    result = search_seeds(entry.key, args.width, args.height, constraints, args.count,
+                          entry.parse_params(args.params), args.start_seed,
+                          args.max_seeds, args.workers)
+    
+    print(f"Algoritmus: {entry.name}")
+    print(f"Nalezené seedy: {', '.join(map(str, result.seeds)) or 'žádné'}")
+    print(f"Otestováno {result.tested} seedů ({result.aborted} předčasně ukončeno) "
+          f"za {result.elapsed:.2f} s, {result.seeds_per_second:.1f} seedů/s")
+    return 0 if len(result.seeds) >= args.count else 1
+
+def run_pipeline_command(args: argparse.Namespace) -> int:
+    """Vygeneruje dungeon podle konfigurace pipeline a vypíše ho nebo uloží."""
+    from dungeon_generators.pipeline import load_pipeline, run_pipeline
+    
+    if args.fov is not None and not args.output:
+        print("Volba --fov vyžaduje --output (index viditelnosti se ukládá vedle mapy).")
+        return 1
+    
+    config = load_pipeline(args.config)
+    seed = args.seed if args.seed is not None else config.get("seed")
+    dungeon = run_pipeline(config, seed, DUNGEON_CACHE)
+    
+    if args.output:
+        from dungeon_generators.dungeon_format import write_dungeon
+        size = write_dungeon(args.output, dungeon, "pipeline", [config["stages"]], seed)
+        print(f"Mapa uložena do {args.output} ({size} B)")
+        if args.fov is not None:
+            from dungeon_generators.fov import build_visibility_index, index_path
+            build_visibility_index(dungeon, args.fov).save(index_path(args.output))
+            print(f"Index viditelnosti uložen do {index_path(args.output)}")
+    else:
+        from dungeon_generators.text_output import write_grid
+        write_grid(dungeon)
+    return 0
+
+def run_levels(args: argparse.Namespace) -> int:
+    """Vygeneruje vícepatrový dungeon z příkazové řádky a vypíše souhrn."""
+    from dungeon_generators.levels import generate_level_stack
+    
+    entry = get_generator(args.algorithm)
+    if entry is None:
+        print("Neplatná volba algoritmu.")
+        return 1
+    
+    stack = generate_level_stack(entry.key, args.levels, args.width, args.height,
+                                 entry.parse_params(args.params), args.seed, args.workers,
+                                 time_limit=args.time_limit)
+    
+    print(f"Algoritmus: {entry.name}, {args.levels} pater {args.width}x{args.height} "
+          f"za {stack.elapsed:.2f} s")
+    unfinished = [level for level, done in enumerate(stack.completed) if not done]
+    if unfinished:
+        print(f"  nedokončená patra (časový limit): {', '.join(map(str, unfinished))}")
+    for level, (x, y) in enumerate(stack.stairs):
+        print(f"  schodiště {level} -> {level + 1}: ({x}, {y})")
+    if args.show is not None:
+        from dungeon_generators.text_output import write_grid
+        print()
+        write_grid(stack.tiles[args.show])
+    return 0
+
+def run_server(args: argparse.Namespace) -> int:
+    """Spustí server generující dungeony (ukončí se pomocí Ctrl+C)."""
+    import asyncio
+    from dungeon_generators.server import DungeonServer
+    
+    server = DungeonServer(args.workers, args.max_pending, args.max_cells, args.time_limit)
+    where = args.socket or f"{args.host}:{args.port}"
+    print(f"Server TermDungeon naslouchá na {where} (Ctrl+C pro ukončení)")
+    try:
+        asyncio.run(server.serve(args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nServer byl ukončen.")
+    finally:
+        server.close()
+    return 0
+
+def run_client(args: argparse.Namespace) -> int:
+    """Vyžádá si dungeon (nebo statistiky) od běžícího serveru a vypíše ho."""
+    from dungeon_generators.server import fetch_dungeon, fetch_stats
+    from dungeon_generators.text_output import write_grid
+    
+    if args.algorithm is None:
+        for name, value in fetch_stats(args.socket, args.host, args.port).items():
+            print(f"{name}: {value:.1f}" if isinstance(value, float) else f"{name}: {value}")
+        return 0
+    
+    entry = get_generator(args.algorithm)
+    if entry is None:
+        print("Neplatná volba algoritmu.")
+        return 1
+    dungeon = fetch_dungeon(entry.key, args.width, args.height, entry.parse_params(args.params),
+                            args.seed, args.socket, args.host, args.port)
+    write_grid(dungeon)
+    return 0
 
 if __name__ == "__main__":
     # Vytvoření adresářové struktury, pokud neexistuje
     os.makedirs("dungeon_generators", exist_ok=True)
     
+    args = build_arg_parser().parse_args()
+    if args.command == "seed-search":
+        sys.exit(run_seed_search(args))
+    if args.command == "pipeline":
+        sys.exit(run_pipeline_command(args))
+    if args.command == "levels":
+        sys.exit(run_levels(args))
+    if args.command == "serve":
+        sys.exit(run_server(args))
+    if args.command == "request":
+        sys.exit(run_client(args))
+    
     try:
         main()
     except KeyboardInterrupt:
@@ -0,0 +1,7 @@
+"""
+Společná nastavení testů - balíček dungeon_generators se importuje z kořene repozitáře.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,77 @@
+"""
+Testy determinismu generování se seedem: registr, rozpočet a generování do
+předalokovaných mřížek musí pro stejný seed dát stejnou mapu.
+"""
+import importlib
+import random
+
+import pytest
+
+from dungeon_generators import registry
+from dungeon_generators.budget import REASON_STEPS, Budget, generate_within_budget
+from dungeon_generators.memmap_grid import MemmapGrid
+from dungeon_generators.sparse_grid import SparseGrid
+
+WIDTH, HEIGHT = 60, 30
+
+
+def available_keys():
+    """Klíče generátorů, jejichž volitelné závislosti jsou nainstalované."""
+    keys = []
+    for entry in registry.GENERATORS:
+        try:
+            importlib.import_module(entry.module)
+        except ImportError:
+            continue
+        keys.append(entry.key)
+    return keys
+
+
+KEYS = available_keys()
+GRID_KEYS = [key for key in ("bsp", "drunkard", "digger") if key in KEYS]
+
+
+@pytest.mark.parametrize("key", KEYS)
+def test_registry_is_deterministic(key):
+    first = registry.generate(key, WIDTH, HEIGHT, seed=123)
+    second = registry.generate(key, WIDTH, HEIGHT, seed=123)
+    assert first == second
+    assert len(first) == HEIGHT and all(len(row) == WIDTH for row in first)
+
+
+@pytest.mark.parametrize("key", KEYS)
+def test_budget_matches_registry(key):
+    expected = registry.generate(key, WIDTH, HEIGHT, seed=7)
+    result = generate_within_budget(key, WIDTH, HEIGHT, seed=7, budget=Budget())
+    assert result.completed
+    assert result.reason is None
+    assert result.dungeon == expected
+
+
+def test_exhausted_budget_reports_reason():
+    result = generate_within_budget("drunkard", WIDTH, HEIGHT, [1.0], seed=1,
+                                    budget=Budget(max_steps=5))
+    assert not result.completed
+    assert result.reason == REASON_STEPS
+
+
+@pytest.mark.parametrize("key", GRID_KEYS)
+def test_memmap_grid_matches_list(key, tmp_path):
+    expected = registry.generate(key, WIDTH, HEIGHT, seed=99)
+    entry = registry.get_generator(key)
+    grid = MemmapGrid(str(tmp_path / "grid.bin"), WIDTH, HEIGHT)
+    try:
+        random.seed(99)
+        entry.load()(WIDTH, HEIGHT, grid=grid)
+        assert grid.to_list() == expected
+    finally:
+        grid.close()
+
+
+@pytest.mark.parametrize("key", GRID_KEYS)
+def test_sparse_grid_matches_list(key):
+    expected = registry.generate(key, WIDTH, HEIGHT, seed=5)
+    grid = SparseGrid(WIDTH, HEIGHT)
+    result = generate_within_budget(key, WIDTH, HEIGHT, seed=5, grid=grid)
+    assert result.completed
+    assert grid.to_dense() == expected
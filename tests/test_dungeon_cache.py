@@ -0,0 +1,62 @@
+"""
+Testy klíče a kódování cache dungeonů.
+"""
+from dungeon_generators import dungeon_cache
+from dungeon_generators.dungeon_cache import DungeonCache, dungeon_key
+
+
+def test_key_is_stable():
+    assert dungeon_key("bsp", 80, 40, [5, 0], 7) == dungeon_key("bsp", 80, 40, (5, 0), 7)
+    # Klíč nesmí záviset na procesu ani na verzi Pythonu (žádný hash() s náhodnou solí)
+    assert dungeon_key("bsp", 80, 40, [5, 0], 7) == (
+        "dae461bd8f89553e0a60a27e4921cfb31bcc9c2001d5054d3d0947d178ab2f00")
+
+
+def test_key_depends_on_every_input():
+    base = ("bsp", 80, 40, [5, 0], 7)
+    variants = [
+        ("cellular", 80, 40, [5, 0], 7),
+        ("bsp", 81, 40, [5, 0], 7),
+        ("bsp", 80, 41, [5, 0], 7),
+        ("bsp", 80, 40, [5, 1], 7),
+        ("bsp", 80, 40, [5, 0], 8),
+        ("bsp", 80, 40, [5, 0], None),
+        ("bsp", 40, 80, [5, 0], 7),
+    ]
+    keys = {dungeon_key(*base)} | {dungeon_key(*variant) for variant in variants}
+    assert len(keys) == len(variants) + 1
+
+
+def test_encode_decode_round_trip():
+    dungeon = [list("#..+#"), list("#.~.#"), list("#####")]
+    assert dungeon_cache.decode_dungeon(dungeon_cache.encode_dungeon(dungeon)) == dungeon
+
+
+def test_disk_round_trip_and_eviction(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    dungeons = {f"key{i}": [list("#.#"), list(f"#{i}#")] for i in range(5)}
+
+    cache = DungeonCache(max_entries=1, cache_dir=cache_dir, max_disk_entries=3)
+    assert not (tmp_path / "cache").exists()
+    for key, dungeon in dungeons.items():
+        cache.put(key, dungeon)
+    assert len(list((tmp_path / "cache").iterdir())) == 3
+
+    # Nová instance čte jen z disku - nejstarší položky byly odstraněny
+    fresh = DungeonCache(cache_dir=cache_dir)
+    assert fresh.get("key4") == dungeons["key4"]
+    assert fresh.get("key0") is None
+
+
+def test_get_or_generate_calls_generator_once(tmp_path):
+    calls = []
+
+    def generator(width, height):
+        calls.append((width, height))
+        return [["."] * width for _ in range(height)]
+
+    cache = DungeonCache(cache_dir=str(tmp_path))
+    first = cache.get_or_generate("test", generator, 4, 3, seed=1)
+    second = cache.get_or_generate("test", generator, 4, 3, seed=1)
+    assert first == second
+    assert len(calls) == 1
@@ -0,0 +1,58 @@
+"""
+Testy binárního formátu TermDungeon (TDNG).
+"""
+import random
+
+import pytest
+
+from dungeon_generators import dungeon_format
+
+
+def random_dungeon(width, height, tiles="#.", seed=0):
+    """Náhodná mapa ze zadaných dlaždic (RLE i bitově zhuštěné řádky)."""
+    rng = random.Random(seed)
+    dungeon = [[rng.choice(tiles) for _ in range(width)] for _ in range(height)]
+    # Několik řádků s dlouhými úseky stejných dlaždic, aby se použilo RLE
+    for y in range(0, height, 3):
+        dungeon[y] = ["#"] * width
+    return dungeon
+
+
+@pytest.mark.parametrize("tiles", ["#.", "#.+", "#.+~<>", "#.+~<>@$%&*=-"])
+def test_dumps_loads_round_trip(tiles):
+    dungeon = random_dungeon(37, 23, tiles)
+    assert dungeon_format.loads(dungeon_format.dumps(dungeon)) == dungeon
+
+
+def test_round_trip_of_empty_dungeon():
+    assert dungeon_format.loads(dungeon_format.dumps([])) == []
+
+
+def test_write_read_round_trip_with_metadata(tmp_path):
+    dungeon = random_dungeon(50, 20, "#.+")
+    path = str(tmp_path / "dungeon.tdng")
+    size = dungeon_format.write_dungeon(path, dungeon, "bsp", [5, 1], seed=42)
+
+    assert size == (tmp_path / "dungeon.tdng").stat().st_size
+    loaded, meta = dungeon_format.read_dungeon(path)
+    assert loaded == dungeon
+    assert meta["algorithm"] == "bsp"
+    assert meta["params"] == [5, 1]
+    assert meta["seed"] == 42
+
+
+def test_read_window_matches_slice(tmp_path):
+    dungeon = random_dungeon(40, 30, "#.+~")
+    path = str(tmp_path / "dungeon.tdng")
+    dungeon_format.write_dungeon(path, dungeon)
+
+    with dungeon_format.DungeonFile(path) as reader:
+        assert reader.read_window(7, 5, 13, 9) == [row[7:20] for row in dungeon[5:14]]
+        # Výřez přesahující okraje mapy je oříznutý
+        assert reader.read_window(35, 25, 10, 10) == [row[35:] for row in dungeon[25:]]
+        assert reader.read_row(11) == dungeon[11]
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        dungeon_format.loads(b"XXXX" + bytes(64))
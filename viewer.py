@@ -0,0 +1,202 @@
+"""
+TermDungeon - Celoobrazovkový prohlížeč dungeonů
+-----------------------------------------------
+Prohlížeč postavený na knihovně blessed. Vykresluje jen výřez mapy, který se vejde
+do terminálu, každý snímek skládá do jednoho zápisu na výstup a překresluje pouze
+řádky, které se od minulého snímku změnily. Díky tomu zůstává plynulý i u map
+o velikosti tisíců řádků a sloupců.
+
+Kromě prohlížení umí modul přehrát postupné generování dungeonu jako animaci
+s omezeným počtem snímků za sekundu.
+
+Ovládání:
+- šipky: posun o jednu buňku
+- PgUp / PgDn: posun o výšku obrazovky
+- Home / End: posun o šířku obrazovky doleva / doprava
+- q nebo Esc: návrat do menu
+"""
+
+import sys
+import time
+from typing import Any, Iterable, List, Optional, Tuple
+
+from blessed import Terminal
+
+# Změna mapy v jednom kroku generátoru: seznam obdélníků (x, y, šířka, výška, dlaždice)
+Delta = List[Tuple[int, int, int, int, str]]
+
+
+def _map_size(source: Any) -> tuple:
+    """Vrátí rozměry mapy (šířka, výška) pro seznam řádků i DungeonFile."""
+    if hasattr(source, "read_window"):
+        return source.width, source.height
+    return (len(source[0]) if len(source) else 0), len(source)
+
+
+def _visible_lines(source: Any, left: int, top: int, width: int, height: int) -> List[str]:
+    """Vrátí textové řádky výřezu mapy začínajícího na (left, top)."""
+    if hasattr(source, "read_window"):
+        # Soubor v binárním formátu - dekódujeme jen viditelný výřez
+        return ["".join(row) for row in source.read_window(left, top, width, height)]
+    return ["".join(source[y][left:left + width])
+            for y in range(top, min(top + height, len(source)))]
+
+
+def render_frame(term: Terminal, source: Any, left: int, top: int,
+                 previous: List[Optional[str]], status: str) -> str:
+    """
+    Sestaví jeden snímek jako jediný řetězec pro zápis na výstup.
+
+    Args:
+        term (Terminal): Terminál blessed
+        source: Mapa dungeonu (List[List[str]], MemmapGrid, SparseGrid nebo DungeonFile)
+        left (int): První viditelný sloupec mapy
+        top (int): První viditelný řádek mapy
+        previous (List[Optional[str]]): Řádky minulého snímku; aktualizují se na místě
+        status (str): Text stavového řádku
+
+    Returns:
+        str: Escape sekvence a text, které překreslí změněné řádky
+    """
+    view_height = term.height - 1
+    lines = _visible_lines(source, left, top, term.width, view_height)
+    lines += [""] * (view_height - len(lines))
+    lines.append(term.reverse(status[:term.width].ljust(term.width)))
+
+    buffer = []
+    for y, line in enumerate(lines):
+        if previous[y] != line:
+            buffer.append(term.move_xy(0, y) + line + term.clear_eol)
+            previous[y] = line
+    return "".join(buffer)
+
+
+def view_dungeon(source: Any, title: str = "") -> None:
+    """
+    Zobrazí dungeon v celoobrazovkovém prohlížeči s možností posunu.
+
+    Args:
+        source: Mapa dungeonu (List[List[str]], MemmapGrid, SparseGrid nebo DungeonFile)
+        title (str): Název zobrazený ve stavovém řádku
+    """
+    term = Terminal()
+    map_width, map_height = _map_size(source)
+    left, top = 0, 0
+    size = None
+    previous: List[Optional[str]] = []
+
+    with term.fullscreen(), term.cbreak(), term.hidden_cursor():
+        while True:
+            # Při změně velikosti terminálu překreslíme všechno
+            if size != (term.width, term.height):
+                size = (term.width, term.height)
+                previous = [None] * term.height
+                sys.stdout.write(term.clear)
+
+            view_width, view_height = term.width, term.height - 1
+            left = max(0, min(left, map_width - view_width))
+            top = max(0, min(top, map_height - view_height))
+
+            status = (f" {title}  {map_width}x{map_height}  pozice {left},{top}"
+                      "  [šipky/PgUp/PgDn/Home/End posun, q konec]")
+            sys.stdout.write(render_frame(term, source, left, top, previous, status))
+            sys.stdout.flush()
+
+            key = term.inkey()
+            if key == "q" or key.code == term.KEY_ESCAPE:
+                break
+            elif key.code == term.KEY_UP:
+                top -= 1
+            elif key.code == term.KEY_DOWN:
+                top += 1
+            elif key.code == term.KEY_LEFT:
+                left -= 1
+            elif key.code == term.KEY_RIGHT:
+                left += 1
+            elif key.code == term.KEY_PGUP:
+                top -= view_height
+            elif key.code == term.KEY_PGDOWN:
+                top += view_height
+            elif key.code == term.KEY_HOME:
+                left -= view_width
+            elif key.code == term.KEY_END:
+                left += view_width
+
+
+def play_steps(steps: Iterable[Delta], width: int, height: int, title: str = "",
+               fps: float = 30.0, steps_per_frame: int = 1) -> None:
+    """
+    Přehraje postupné generování dungeonu jako animaci.
+
+    Na obrazovku se zapisují jen změny z jednotlivých kroků, takže cena animace
+    roste s celkovým počtem změn, ne s počtem snímků krát plocha mapy.
+
+    Args:
+        steps (Iterable[Delta]): Kroky generátoru (funkce iter_*_steps)
+        width (int): Šířka dungeonu
+        height (int): Výška dungeonu
+        title (str): Název zobrazený ve stavovém řádku
+        fps (float): Maximální počet snímků za sekundu
+        steps_per_frame (int): Počet neprázdných kroků generátoru sloučených do jednoho
+            snímku (prázdné kroky se nepočítají a na snímek se u nich nečeká)
+    """
+    term = Terminal()
+    view_width = min(width, term.width)
+    view_height = min(height, term.height - 1)
+    frame_time = 1.0 / fps
+
+    with term.fullscreen(), term.cbreak(), term.hidden_cursor():
+        # Výchozí stav je mapa plná zdí
+        sys.stdout.write(term.clear + "".join(term.move_xy(0, y) + "#" * view_width
+                                              for y in range(view_height)))
+        buffer = []
+        step = 0
+        changed = 0
+        next_frame = time.perf_counter()
+
+        for step, delta in enumerate(steps, 1):
+            if not delta:
+                # Prázdné kroky (např. opakovaná návštěva buňky) snímky nezabírají;
+                # jen jednou za snímek obnovíme stavový řádek a zkontrolujeme klávesu
+                if time.perf_counter() < next_frame + frame_time:
+                    continue
+                sys.stdout.write("".join(buffer) + term.move_xy(0, view_height) + term.reverse(
+                    f" {title}  krok {step}  [q přeruší]"[:term.width]) + term.clear_eol)
+                sys.stdout.flush()
+                buffer = []
+                if term.inkey(timeout=0) == "q":
+                    return
+                next_frame = time.perf_counter()
+                continue
+
+            for x, y, w, h, tile in delta:
+                # Ořežeme obdélník na viditelnou část mapy
+                x0, x1 = max(0, x), min(view_width, x + w)
+                if x0 >= x1:
+                    continue
+                for row in range(max(0, y), min(view_height, y + h)):
+                    buffer.append(term.move_xy(x0, row) + tile * (x1 - x0))
+
+            changed += 1
+            if changed % steps_per_frame:
+                continue
+
+            buffer.append(term.move_xy(0, view_height) + term.reverse(
+                f" {title}  krok {step}  [q přeruší]"[:term.width]) + term.clear_eol)
+            sys.stdout.write("".join(buffer))
+            sys.stdout.flush()
+            buffer = []
+
+            # Čekání na další snímek zároveň kontroluje stisk klávesy
+            next_frame += frame_time
+            key = term.inkey(timeout=max(0.0, next_frame - time.perf_counter()))
+            if key == "q":
+                return
+            next_frame = max(next_frame, time.perf_counter())
+
+        buffer.append(term.move_xy(0, view_height) + term.reverse(
+            f" {title}  hotovo po {step} krocích  [libovolná klávesa pro návrat]"[:term.width])
+            + term.clear_eol)
+        sys.stdout.write("".join(buffer))
+        sys.stdout.flush()
+        term.inkey()